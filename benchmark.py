@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the Screen Reading Computer Vision Model.
+Compares EasyOCR CPU inference modes for latency and accuracy on a synthetic image.
+"""
+
+import argparse
+import difflib
+import json
+import time
+from screenreader import ScreenReader, EASYOCR_MODES, EASYOCR_AVAILABLE
+from screenreader.capture import create_test_image
+
+# Text drawn by create_test_image, used as ground truth
+EXPECTED_TEXT = " ".join([
+    "Screen Reading Computer Vision Model",
+    "This is a test image for OCR testing",
+    "The quick brown fox jumps over the lazy dog",
+    "1234567890 !@#$%^&*()",
+    "Testing different font sizes and styles"
+])
+
+
+def text_accuracy(text: str, expected: str = EXPECTED_TEXT) -> float:
+    """Character-level similarity (0-1) between extracted and expected text."""
+    return difflib.SequenceMatcher(None, " ".join(text.split()), expected).ratio()
+
+
+def benchmark_easyocr_mode(mode: str, runs: int, threads: int = None, interop_threads: int = None):
+    """Benchmark a single EasyOCR inference mode."""
+    print(f"\n🔍 EasyOCR mode: {mode}")
+
+    start_time = time.time()
+    reader = ScreenReader(use_easyocr=True, use_tesseract=False, easyocr_mode=mode,
+                          easyocr_threads=threads, easyocr_interop_threads=interop_threads)
+    init_time = time.time() - start_time
+
+    image = create_test_image()
+
+    # First call pays for lazy initialization; keep it out of the averages
+    start_time = time.time()
+    reader.extract_text_easyocr(image)
+    first_call_time = time.time() - start_time
+
+    times = []
+    result = None
+    for _ in range(runs):
+        start_time = time.time()
+        result = reader.extract_text_easyocr(image)
+        times.append(time.time() - start_time)
+
+    stats = {
+        "mode": mode,
+        "init_time": init_time,
+        "first_call_time": first_call_time,
+        "avg_time": sum(times) / len(times),
+        "min_time": min(times),
+        "accuracy": text_accuracy(result["text"]),
+        "confidence": float(result["confidence"]),
+        "text": result["text"]
+    }
+
+    print(f"   Init: {init_time:.2f}s, first call: {first_call_time:.2f}s")
+    print(f"   Avg: {stats['avg_time']:.3f}s, min: {stats['min_time']:.3f}s")
+    print(f"   Accuracy: {stats['accuracy']:.3f}, confidence: {stats['confidence']:.3f}")
+    return stats
+
+
+def save_benchmark_results(results, filename="benchmark_results.json"):
+    """Save benchmark results to file."""
+    try:
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"\n💾 Benchmark results saved to {filename}")
+    except Exception as e:
+        print(f"⚠ Could not save benchmark results: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare EasyOCR CPU inference modes")
+    parser.add_argument("--modes", nargs="+", default=list(EASYOCR_MODES), choices=EASYOCR_MODES)
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per mode")
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads")
+    parser.add_argument("--interop-threads", type=int, default=None, help="Inter-op threads")
+    args = parser.parse_args()
+
+    print("🖥️  Screen Reading Computer Vision Model - BENCHMARK")
+    print("=" * 60)
+
+    if not EASYOCR_AVAILABLE:
+        print("EasyOCR is not installed; nothing to benchmark.")
+        return False
+
+    results = []
+    for mode in args.modes:
+        try:
+            results.append(benchmark_easyocr_mode(mode, args.runs, args.threads, args.interop_threads))
+        except Exception as e:
+            print(f"   ✗ Mode {mode} failed: {e}")
+            results.append({"mode": mode, "error": str(e)})
+
+    print("\n" + "=" * 60)
+    print(f"{'Mode':<10}{'Avg (s)':>10}{'Min (s)':>10}{'Accuracy':>10}")
+    print("-" * 40)
+    for stats in results:
+        if "error" in stats:
+            print(f"{stats['mode']:<10}{'failed':>10}")
+        else:
+            print(f"{stats['mode']:<10}{stats['avg_time']:>10.3f}{stats['min_time']:>10.3f}{stats['accuracy']:>10.3f}")
+
+    save_benchmark_results(results)
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Shows practical usage examples and real-time screen reading.
 
 import time
 import json
-from screen_reader import ScreenReader
+from screenreader import ScreenReader
 
 def demo_full_screen_reading():
     """Demonstrate full screen reading."""
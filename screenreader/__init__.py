@@ -0,0 +1,67 @@
+"""
+Screen Reading Computer Vision Model.
+
+Screen capture, image preprocessing and OCR (Tesseract and EasyOCR) behind a
+single ScreenReader class. Submodules are imported on first attribute access,
+so ``import screenreader`` stays cheap and never pulls in torch by itself.
+"""
+
+import importlib
+
+__version__ = "1.0.0"
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ScreenReader": "reader",
+    "PREPROCESSING_PROFILES": "preprocess",
+    "PREPROCESSING_STEPS": "preprocess",
+    "AUTO_PROFILE": "preprocess",
+    "DARK_BACKGROUND_THRESHOLD": "preprocess",
+    "compile_preprocessing_pipeline": "preprocess",
+    "register_profile": "preprocess",
+    "register_step": "preprocess",
+    "EASYOCR_AVAILABLE": "engines",
+    "ONNXRUNTIME_AVAILABLE": "engines",
+    "EASYOCR_MODES": "engines",
+    "ONNX_MODEL_DIR": "engines",
+    "ENGINES": "engines",
+    "TesseractEngine": "engines",
+    "EasyOCREngine": "engines",
+    "register_engine": "engines",
+    "CAPTURE_BACKENDS": "capture",
+    "ScrotCapture": "capture",
+    "register_capture_backend": "capture",
+    "LAYOUT_LEVELS": "layout",
+    "LayoutCache": "layout",
+    "group_boxes_into_lines": "layout",
+    "group_lines_into_blocks": "layout",
+    "reconstruct_layout": "layout",
+    "ScreenIndex": "video",
+    "VideoSampler": "video",
+    "ReadingPipeline": "pipeline",
+    "FIELD_TYPES": "fields",
+    "register_field_type": "fields",
+    "RegionHub": "regions",
+    "Watcher": "watch",
+    "PYMUPDF_AVAILABLE": "documents",
+    "iter_pages": "documents",
+    "propose_text_regions": "search",
+    "fuse_boxes": "fusion",
+    "combine_results": "fusion",
+    "json_default": "serialization",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
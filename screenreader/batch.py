@@ -0,0 +1,418 @@
+"""
+Bulk OCR of screenshot archives.
+
+Reads a directory, glob pattern or zip archive of images, runs them through
+ScreenReader on a process pool and writes one record per file to JSONL or
+Parquet. Progress is checkpointed next to the output, so an interrupted run
+resumes where it stopped, and files whose content was already processed (in
+this run or an earlier one) are recorded as duplicates without being OCR'd.
+
+Usage:
+    python -m screenreader.batch screenshots/ --output results.jsonl
+    python -m screenreader.batch "exports/**/*.png" --output results.parquet --workers 8
+    python -m screenreader.batch archive.zip --output results.jsonl --engine both
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .layout import LAYOUT_LEVELS
+from .serialization import json_default
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+ENGINE_CHOICES = {
+    "tesseract": {"use_tesseract": True, "use_easyocr": False},
+    "easyocr": {"use_tesseract": False, "use_easyocr": True},
+    "both": {"use_tesseract": True, "use_easyocr": True},
+}
+
+
+def iter_sources(source: str,
+                 extensions: Tuple[str, ...] = IMAGE_EXTENSIONS) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """
+    Enumerate the images of a directory, glob pattern or zip archive lazily.
+
+    Directories are walked in sorted order so that runs are reproducible and
+    resumed runs revisit files in the same sequence.
+
+    Args:
+        source: Directory, glob pattern or .zip file
+        extensions: File extensions to include (lower case)
+
+    Yields:
+        (name, read) tuples, where read() returns the file contents
+    """
+    def wanted(name):
+        return name.lower().endswith(extensions)
+
+    def file_reader(path):
+        def read():
+            with open(path, "rb") as f:
+                return f.read()
+        return read
+
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if wanted(name):
+                    path = os.path.join(root, name)
+                    yield path, file_reader(path)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and wanted(info.filename):
+                    yield f"{source}:{info.filename}", (lambda info=info: archive.read(info))
+    else:
+        paths = glob.iglob(source, recursive=True)
+        for path in paths:
+            if os.path.isfile(path) and wanted(path):
+                yield path, file_reader(path)
+
+
+class Checkpoint:
+    """
+    Append-only record of processed files (content hash and name, one per line).
+
+    Entries are only appended after the corresponding output records have been
+    flushed, so a crash can at worst re-process the last unflushed batch. Files
+    that failed are recorded without a hash, so a later copy of the same
+    content is OCR'd again rather than reported as a duplicate.
+    """
+
+    def __init__(self, path: str, resume: bool = True):
+        self.path = path
+        self.names: Set[str] = set()
+        self.hashes: Set[str] = set()
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    digest, _, name = line.rstrip("\n").partition("\t")
+                    if name:
+                        self.names.add(name)
+                        if digest:
+                            self.hashes.add(digest)
+        elif os.path.exists(path):
+            os.remove(path)
+
+        self._file = open(path, "a", encoding="utf-8")
+
+    def commit(self, entries: List[Tuple[str, str]]):
+        for digest, name in entries:
+            self._file.write(f"{digest}\t{name}\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlWriter:
+    """Appends records as JSON lines, flushing every flush_every records."""
+
+    def __init__(self, path: str, resume: bool = True, flush_every: int = 100):
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def write(self, record: Dict) -> bool:
+        """Write a record. Returns True when all records so far are durable."""
+        self._file.write(json.dumps(record, default=json_default) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes records to a directory of Parquet part files.
+
+    Parquet files can't be appended to, so each flush writes a new part;
+    resumed runs add parts after the existing ones.
+    """
+
+    COLUMNS = ("path", "sha256", "status", "text", "confidence", "processing_time",
+               "preprocessing_profile", "image_shape", "bounding_boxes", "error")
+
+    def __init__(self, path: str, resume: bool = True, rows_per_file: int = 10000):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow. Install with: pip install pyarrow")
+
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self._rows: List[Dict] = []
+        os.makedirs(path, exist_ok=True)
+        existing = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+        if not resume:
+            for name in existing:
+                os.remove(os.path.join(path, name))
+            existing = []
+        self._part = len(existing)
+
+    def write(self, record: Dict) -> bool:
+        row = {column: record.get(column) for column in self.COLUMNS}
+        # Nested values are stored as JSON strings to keep a flat, stable schema
+        row["bounding_boxes"] = json.dumps(record.get("bounding_boxes", []), default=json_default)
+        row["image_shape"] = json.dumps(record.get("image_shape"), default=json_default)
+        if row["confidence"] is not None:
+            row["confidence"] = float(row["confidence"])
+        self._rows.append(row)
+        if len(self._rows) >= self.rows_per_file:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Explicit types so parts with only duplicates or errors match the others
+        schema = pa.schema([(column, pa.float64() if column in ("confidence", "processing_time") else pa.string())
+                            for column in self.COLUMNS])
+        table = pa.Table.from_pylist(self._rows, schema=schema)
+        part_path = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+        pq.write_table(table, part_path + ".tmp")
+        # Rename so readers never see a half-written part
+        os.replace(part_path + ".tmp", part_path)
+        self._part += 1
+        self._rows = []
+
+    def close(self):
+        self.flush()
+
+
+def create_writer(output: str, output_format: Optional[str], resume: bool):
+    output_format = output_format or ("parquet" if output.endswith(".parquet") else "jsonl")
+    if output_format == "parquet":
+        return ParquetWriter(output, resume)
+    return JsonlWriter(output, resume)
+
+
+@contextlib.contextmanager
+def _quiet(name: Optional[str]):
+    """
+    Silence ScreenReader's per-image progress output in a worker.
+
+    The parent prints progress instead. Warnings and failures (such as an OCR
+    engine error that left an empty result) are passed on to stderr.
+    """
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            yield
+    finally:
+        for line in log.getvalue().splitlines():
+            if line.startswith("Warning") or "failed" in line.lower():
+                print(f"{name}: {line}" if name else line, file=sys.stderr)
+
+
+# Per-process ScreenReader, created by the pool initializer
+_reader = None
+
+
+def _init_worker(reader_options: Dict):
+    global _reader
+    import cv2
+
+    # Parallelism comes from the process pool; keep each worker single-threaded
+    cv2.setNumThreads(1)
+    from .reader import ScreenReader
+
+    with _quiet(None):
+        _reader = ScreenReader(**reader_options)
+
+
+def _ocr_file(name: str, digest: str, data: bytes, profile: Optional[str], layout: Optional[str]) -> Dict:
+    import cv2
+    import numpy as np
+
+    record = {"path": name, "sha256": digest}
+    try:
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("could not decode image")
+        with _quiet(name):
+            result = _reader.process_uploaded_image(image, profile=profile, layout=layout)
+        record.update({
+            "status": "ok",
+            "text": result["text"],
+            "confidence": result["confidence"],
+            "processing_time": result["processing_time"],
+            "preprocessing_profile": result["preprocessing_profile"],
+            "image_shape": result["image_shape"],
+            "bounding_boxes": result["bounding_boxes"],
+        })
+    except Exception as e:
+        record.update({"status": "error", "error": str(e)})
+    return record
+
+
+def run_batch(source: str, output: str, output_format: Optional[str] = None, workers: Optional[int] = None,
+              engine: str = "tesseract", profile: Optional[str] = None, layout: Optional[str] = None,
+              checkpoint_path: Optional[str] = None, resume: bool = True,
+              extensions: Tuple[str, ...] = IMAGE_EXTENSIONS) -> Dict:
+    """
+    OCR every image of a directory, glob or zip archive.
+
+    Args:
+        source: Directory, glob pattern or .zip file
+        output: Output .jsonl file or Parquet directory
+        output_format: "jsonl" or "parquet" (inferred from the output name by default)
+        workers: Worker processes (defaults to the CPU count)
+        engine: "tesseract", "easyocr" or "both"
+        profile: Preprocessing profile name or "auto"
+        layout: Optional layout output level
+        checkpoint_path: Checkpoint file (defaults to <output>.checkpoint)
+        resume: Continue from an existing checkpoint instead of starting over
+        extensions: Image file extensions to include
+
+    Returns:
+        Run statistics
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint = Checkpoint(checkpoint_path or output.rstrip("/") + ".checkpoint", resume)
+    writer = create_writer(output, output_format, resume)
+    reader_options = dict(ENGINE_CHOICES[engine], easyocr_threads=1)
+    if profile:
+        reader_options["preprocessing_profile"] = profile
+
+    stats = {"processed": 0, "duplicates": 0, "errors": 0, "skipped": 0}
+    uncommitted: List[Tuple[str, str]] = []
+    # Hash -> later copies of content whose OCR is still running
+    in_flight: Dict[str, List[str]] = {}
+    start_time = time.time()
+
+    def record_done(record):
+        # Failed content keeps no hash so it isn't treated as done
+        uncommitted.append(("" if record["status"] == "error" else record["sha256"], record["path"]))
+        if writer.write(record):
+            checkpoint.commit(uncommitted)
+            uncommitted.clear()
+
+    def collect(futures):
+        for future in futures:
+            record = future.result()
+            copies = in_flight.pop(record["sha256"], [])
+            if record["status"] == "error":
+                print(f"   ⚠️  {record['path']}: {record['error']}", file=sys.stderr)
+                # Copies have the same bytes, so they would fail the same way
+                stats["errors"] += 1 + len(copies)
+                record_done(record)
+                for name in copies:
+                    record_done(dict(record, path=name))
+                continue
+            checkpoint.hashes.add(record["sha256"])
+            stats["processed"] += 1
+            stats["duplicates"] += len(copies)
+            record_done(record)
+            for name in copies:
+                record_done({"path": name, "sha256": record["sha256"], "status": "duplicate"})
+        done = stats["processed"] + stats["errors"]
+        if done and done % 100 == 0:
+            rate = done / (time.time() - start_time)
+            print(f"   {done} files OCR'd ({rate:.1f}/s), {stats['duplicates']} duplicates")
+
+    print(f"🗂️  Batch OCR: {source} -> {output} ({workers} workers, engine: {engine})")
+    if checkpoint.names:
+        print(f"   Resuming: {len(checkpoint.names)} files already processed")
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(reader_options,))
+    pending = set()
+    try:
+        for name, read in iter_sources(source, extensions):
+            if name in checkpoint.names:
+                stats["skipped"] += 1
+                continue
+
+            data = read()
+            digest = hashlib.sha256(data).hexdigest()
+            if digest in checkpoint.hashes:
+                stats["duplicates"] += 1
+                record_done({"path": name, "sha256": digest, "status": "duplicate"})
+                continue
+            if digest in in_flight:
+                # Recorded once the first copy's result is in
+                in_flight[digest].append(name)
+                continue
+            in_flight[digest] = []
+
+            # Keep the queue short so only a few images are held in memory
+            if len(pending) >= 4 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_ocr_file, name, digest, data, profile, layout))
+
+        collect(pending)
+        pending = set()
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted - saving progress")
+        executor.shutdown(wait=False, cancel_futures=True)
+        collect(f for f in pending if f.done() and not f.cancelled() and f.exception() is None)
+    finally:
+        executor.shutdown(wait=True)
+        writer.close()
+        checkpoint.commit(uncommitted)
+        checkpoint.close()
+
+    stats["elapsed"] = time.time() - start_time
+    print(f"✅ {stats['processed']} processed, {stats['duplicates']} duplicates, "
+          f"{stats['errors']} errors, {stats['skipped']} already done in {stats['elapsed']:.1f}s")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="OCR a directory, glob or zip archive of screenshots")
+    parser.add_argument("source", help="Directory, glob pattern (quote it) or .zip archive")
+    parser.add_argument("--output", "-o", required=True, help="Output .jsonl file or .parquet directory")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default=None,
+                        help="Output format (default: from the output name)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--engine", choices=list(ENGINE_CHOICES), default="tesseract",
+                        help="OCR engines; EasyOCR loads one model copy per worker")
+    parser.add_argument("--profile", default=None, help="Preprocessing profile or 'auto'")
+    parser.add_argument("--layout", choices=LAYOUT_LEVELS, default=None, help="Layout output level")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing progress and start over")
+    parser.add_argument("--extensions", nargs="+", default=list(IMAGE_EXTENSIONS),
+                        help="Image extensions to include")
+    args = parser.parse_args(argv)
+
+    try:
+        run_batch(args.source, args.output, args.format, args.workers, args.engine, args.profile,
+                  args.layout, args.checkpoint, resume=not args.restart,
+                  extensions=tuple(e.lower() if e.startswith(".") else f".{e.lower()}" for e in args.extensions))
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Screen capture backends.
+
+A capture backend provides capture(region) returning a BGR image. Backends are
+looked up by name in CAPTURE_BACKENDS; "scrot" is the headless-compatible
+default and falls back to a generated test image when no display is available.
+"pyautogui" grabs regions in-process, which avoids scrot's process start-up and
+PNG round trip for small, latency-sensitive captures. "record" and "replay"
+write captures to and play them back from a frame file (see recording.py).
+"""
+
+import importlib.util
+import os
+import subprocess
+import tempfile
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Region = Tuple[int, int, int, int]
+
+PYAUTOGUI_AVAILABLE = importlib.util.find_spec("pyautogui") is not None
+
+
+def create_test_image() -> np.ndarray:
+    """
+    Create a test image with sample text for testing purposes.
+
+    Returns:
+        Test image as numpy array
+    """
+    img = np.ones((400, 800, 3), dtype=np.uint8) * 255
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    texts = [
+        "Screen Reading Computer Vision Model",
+        "This is a test image for OCR testing",
+        "The quick brown fox jumps over the lazy dog",
+        "1234567890 !@#$%^&*()",
+        "Testing different font sizes and styles"
+    ]
+
+    y_positions = [50, 100, 150, 200, 250]
+    font_scales = [1.2, 0.8, 0.6, 0.5, 0.7]
+
+    for i, (text, y_pos, scale) in enumerate(zip(texts, y_positions, font_scales)):
+        cv2.putText(img, text, (20, y_pos), font, scale, (0, 0, 0), 2)
+
+    return img
+
+
+class ScrotCapture:
+    """Captures the screen by shelling out to scrot."""
+
+    name = "scrot"
+
+    def capture(self, region: Optional[Region] = None) -> np.ndarray:
+        """
+        Capture screen or specific region using scrot (headless-compatible).
+
+        Args:
+            region: Tuple of (x, y, width, height) for specific region capture
+
+        Returns:
+            Captured image as numpy array
+        """
+        # A per-call directory so concurrent captures don't overwrite each other
+        with tempfile.TemporaryDirectory(prefix="screenreader_") as temp_dir:
+            temp_file = os.path.join(temp_dir, "screenshot.png")
+
+            try:
+                if region:
+                    x, y, width, height = region
+                    cmd = ["scrot", "-a", f"{x},{y},{width},{height}", temp_file]
+                else:
+                    cmd = ["scrot", temp_file]
+
+                result = subprocess.run(cmd, capture_output=True, text=True)
+
+                if result.returncode != 0:
+                    print("Warning: scrot failed, creating test image")
+                    return create_test_image()
+
+                img = cv2.imread(temp_file)
+
+                if img is None:
+                    print("Warning: Could not load screenshot, creating test image")
+                    return create_test_image()
+
+                return img
+
+            except Exception as e:
+                print(f"Screenshot capture failed: {e}, creating test image")
+                return create_test_image()
+
+
+class PyAutoGUICapture:
+    """Captures the screen in-process with pyautogui (needs a display)."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        if not PYAUTOGUI_AVAILABLE:
+            raise RuntimeError("The pyautogui capture backend requires pyautogui. Install with: pip install pyautogui")
+        import pyautogui
+
+        self._pyautogui = pyautogui
+
+    def capture(self, region: Optional[Region] = None) -> np.ndarray:
+        """
+        Capture screen or specific region with pyautogui.
+
+        Args:
+            region: Tuple of (x, y, width, height) for specific region capture
+
+        Returns:
+            Captured image as numpy array
+        """
+        try:
+            screenshot = self._pyautogui.screenshot(region=tuple(region) if region else None)
+        except Exception as e:
+            print(f"Screenshot capture failed: {e}, creating test image")
+            return create_test_image()
+        return cv2.cvtColor(np.asarray(screenshot.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def pointer_position() -> Tuple[int, int]:
+    """
+    Current mouse pointer position in screen coordinates.
+
+    Returns:
+        (x, y) tuple
+    """
+    if not PYAUTOGUI_AVAILABLE:
+        raise RuntimeError("Reading the pointer position requires pyautogui. Install with: pip install pyautogui")
+    import pyautogui
+
+    x, y = pyautogui.position()
+    return int(x), int(y)
+
+
+def _recording_capture(**options):
+    from .recording import RecordingCapture
+
+    return RecordingCapture(**options)
+
+
+def _replay_capture(**options):
+    from .recording import ReplayCapture
+
+    return ReplayCapture(**options)
+
+
+# Backend name -> factory. Register a replacement to swap capture everywhere.
+CAPTURE_BACKENDS: Dict[str, Callable[..., object]] = {
+    "scrot": ScrotCapture,
+    "pyautogui": PyAutoGUICapture,
+    "record": _recording_capture,
+    "replay": _replay_capture,
+}
+
+
+def register_capture_backend(name: str, factory: Callable[..., object]):
+    """
+    Register a screen capture backend.
+
+    Args:
+        name: Backend name passed to ScreenReader(capture_backend=...)
+        factory: Callable returning an object with capture(region) -> BGR image
+    """
+    CAPTURE_BACKENDS[name] = factory
+
+
+def create_capture_backend(name: str, **options):
+    """
+    Instantiate a registered capture backend.
+
+    Args:
+        name: Registered backend name
+        **options: Passed to the backend factory
+
+    Returns:
+        Capture backend instance
+    """
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend '{name}'. Available: {', '.join(CAPTURE_BACKENDS)}")
+    return CAPTURE_BACKENDS[name](**options)
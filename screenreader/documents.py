@@ -0,0 +1,107 @@
+"""
+Multi-page document decoding.
+
+Pages of TIFF and PDF files are decoded one at a time, so callers only hold
+the pages they are currently working on. PDF rendering uses PyMuPDF, which is
+imported only when a PDF is opened.
+"""
+
+import importlib.util
+import os
+from typing import Iterator, Tuple
+
+import cv2
+import numpy as np
+
+PYMUPDF_AVAILABLE = importlib.util.find_spec("pymupdf") is not None
+
+# Resolution PDF pages are rendered at; 200 DPI keeps body text well above
+# the glyph height Tesseract needs without producing huge rasters.
+DEFAULT_PDF_DPI = 200
+
+PDF_EXTENSIONS = (".pdf",)
+MULTIPAGE_IMAGE_EXTENSIONS = (".tif", ".tiff")
+
+
+def is_pdf(path: str) -> bool:
+    if path.lower().endswith(PDF_EXTENSIONS):
+        return True
+    with open(path, "rb") as f:
+        return f.read(5) == b"%PDF-"
+
+
+def count_pages(path: str) -> int:
+    """
+    Count the pages of a document without decoding them.
+
+    Args:
+        path: PDF, TIFF or single-page image file
+
+    Returns:
+        Number of pages
+
+    Raises:
+        RuntimeError: The file is a PDF and PyMuPDF is not installed
+        ValueError: The PDF can't be opened
+    """
+    if is_pdf(path):
+        if not PYMUPDF_AVAILABLE:
+            raise RuntimeError("PDF support requires PyMuPDF. Install with: pip install pymupdf")
+
+        import pymupdf
+
+        try:
+            document = pymupdf.open(path)
+        except Exception as e:
+            raise ValueError(f"Could not open PDF {path}: {e}")
+        with document:
+            return document.page_count
+    return cv2.imcount(path)
+
+
+def iter_pages(path: str, dpi: int = DEFAULT_PDF_DPI) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode the pages of a document lazily.
+
+    Args:
+        path: PDF, TIFF or single-page image file
+        dpi: Rendering resolution for PDF pages
+
+    Yields:
+        (page number starting at 1, BGR image) tuples
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"Document not found: {path}")
+
+    if is_pdf(path):
+        yield from _iter_pdf_pages(path, dpi)
+        return
+
+    pages = cv2.imcount(path)
+    if pages == 0:
+        raise ValueError(f"Could not decode document: {path}")
+
+    for index in range(pages):
+        ok, mats = cv2.imreadmulti(path, index, 1, flags=cv2.IMREAD_COLOR)
+        if not ok or not mats:
+            raise ValueError(f"Could not decode page {index + 1} of {path}")
+        yield index + 1, mats[0]
+
+
+def _iter_pdf_pages(path: str, dpi: int) -> Iterator[Tuple[int, np.ndarray]]:
+    if not PYMUPDF_AVAILABLE:
+        raise RuntimeError("PDF support requires PyMuPDF. Install with: pip install pymupdf")
+
+    import pymupdf
+
+    try:
+        document = pymupdf.open(path)
+    except Exception as e:
+        raise ValueError(f"Could not open PDF {path}: {e}")
+
+    with document:
+        for index in range(document.page_count):
+            pixmap = document.load_page(index).get_pixmap(dpi=dpi, colorspace=pymupdf.csRGB, alpha=False)
+            rgb = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.stride)
+            rgb = rgb[:, :pixmap.width * 3].reshape(pixmap.height, pixmap.width, 3)
+            yield index + 1, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
@@ -0,0 +1,433 @@
+"""
+OCR engines.
+
+Each engine turns an image into the common result dictionary (text, confidence,
+bounding_boxes, engine), with confidences on Tesseract's 0-100 scale. Engines
+are looked up by name in ENGINES, so an optimized implementation registered
+under "tesseract" or "easyocr" is picked up by every ScreenReader - CLI, demo
+and API alike.
+
+EasyOCR and torch are imported only when an EasyOCR engine is created.
+"""
+
+import importlib.util
+import inspect
+import os
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+import pytesseract
+
+EASYOCR_AVAILABLE = importlib.util.find_spec("easyocr") is not None
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+# EasyOCR CPU inference modes:
+#   default - easyocr.Reader defaults (unchanged behaviour)
+#   fp32    - CPU-only, no quantization
+#   int8    - CPU-only, recognizer dynamically quantized to int8 (LSTM/Linear layers)
+#   onnx    - detector and recognizer exported once to ONNX and run with ONNX Runtime
+EASYOCR_MODES = ("default", "fp32", "int8", "onnx")
+
+ONNX_MODEL_DIR = os.path.join(os.path.expanduser("~"), ".EasyOCR", "onnx")
+
+
+def empty_result(engine: Optional[str] = None) -> Dict:
+    result = {"text": "", "confidence": 0, "bounding_boxes": []}
+    if engine:
+        result["engine"] = engine
+    return result
+
+
+class TesseractEngine:
+    """Tesseract OCR via pytesseract."""
+
+    name = "tesseract"
+
+    def __init__(self, config: str = '--oem 3 --psm 6', min_confidence: int = 30):
+        self.config = config
+        self.min_confidence = min_confidence
+
+    def extract(self, image: np.ndarray) -> Dict:
+        """
+        Extract text using Tesseract OCR.
+
+        Args:
+            image: Input image as numpy array
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        try:
+            data = pytesseract.image_to_data(image, config=self.config, output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            print(f"Tesseract OCR failed: {e}")
+            print("Falling back to empty result - EasyOCR will be used if available")
+            return {"text": "", "confidence": 0, "bounding_boxes": [], "engine": self.name, "error": str(e)}
+
+        texts = []
+        confidences = []
+        bounding_boxes = []
+
+        for i in range(len(data['text'])):
+            if int(data['conf'][i]) > self.min_confidence:
+                text = data['text'][i].strip()
+                if text:
+                    texts.append(text)
+                    confidences.append(int(data['conf'][i]))
+                    bounding_boxes.append({
+                        'x': data['left'][i],
+                        'y': data['top'][i],
+                        'width': data['width'][i],
+                        'height': data['height'][i],
+                        'text': text,
+                        'confidence': int(data['conf'][i])
+                    })
+
+        full_text = ' '.join(texts)
+        avg_confidence = np.mean(confidences) if confidences else 0
+
+        return {
+            "text": full_text,
+            "confidence": avg_confidence,
+            "bounding_boxes": bounding_boxes,
+            "engine": self.name
+        }
+
+    def recognize_lines(self, processed_image: np.ndarray, lines: List[Dict]) -> List[List[Dict]]:
+        """
+        Recognize known line boxes with a single Tesseract call by stacking the
+        line crops into one mosaic image.
+
+        Args:
+            processed_image: Preprocessed frame
+            lines: Line dictionaries to recognize
+
+        Returns:
+            Word boxes (in frame coordinates) for each line
+        """
+        if not lines:
+            return []
+
+        padding = 8
+        crops = [processed_image[l['y']:l['y'] + l['height'], l['x']:l['x'] + l['width']] for l in lines]
+        mosaic_width = max(c.shape[1] for c in crops) + 2 * padding
+        mosaic_height = sum(c.shape[0] + padding for c in crops) + padding
+        mosaic = np.full((mosaic_height, mosaic_width), 255, dtype=np.uint8)
+
+        offsets = []
+        y = padding
+        for crop in crops:
+            mosaic[y:y + crop.shape[0], padding:padding + crop.shape[1]] = crop
+            offsets.append(y)
+            y += crop.shape[0] + padding
+
+        result = self.extract(mosaic)
+
+        words_per_line = [[] for _ in lines]
+        for box in result["bounding_boxes"]:
+            center = box['y'] + box['height'] / 2
+            index = int(np.searchsorted(offsets, center, side='right')) - 1
+            if index < 0:
+                continue
+            line = lines[index]
+            word = dict(box)
+            word['x'] = box['x'] - padding + line['x']
+            word['y'] = box['y'] - offsets[index] + line['y']
+            words_per_line[index].append(word)
+
+        return words_per_line
+
+
+class OnnxRuntimeModule:
+    """
+    Stand-in for an EasyOCR torch module that runs an exported ONNX graph.
+
+    EasyOCR only calls eval() and the module itself, passing and expecting torch
+    tensors, so that is all this adapter implements.
+    """
+
+    ONNX_INPUTS = ()
+
+    def __init__(self, session):
+        self.session = session
+        self.input_names = [i.name for i in session.get_inputs()]
+
+    def eval(self):
+        return self
+
+    def __call__(self, *args):
+        import torch
+
+        # Exported graphs may drop inputs the model ignores (e.g. the recognizer's text input)
+        named = dict(zip(self.ONNX_INPUTS, args))
+        feeds = {name: named[name].cpu().numpy() for name in self.input_names}
+        outputs = [torch.from_numpy(o) for o in self.session.run(None, feeds)]
+        return outputs[0] if len(outputs) == 1 else tuple(outputs)
+
+
+class OnnxDetector(OnnxRuntimeModule):
+    ONNX_INPUTS = ("image",)
+
+
+class OnnxRecognizer(OnnxRuntimeModule):
+    ONNX_INPUTS = ("image", "text")
+
+
+class EasyOCREngine:
+    """EasyOCR with selectable CPU inference mode."""
+
+    name = "easyocr"
+
+    def __init__(self, mode: str = "default", threads: Optional[int] = None,
+                 interop_threads: Optional[int] = None, languages: Optional[List[str]] = None,
+                 min_confidence: float = 0.3):
+        """
+        Args:
+            mode: One of EASYOCR_MODES
+            threads: Intra-op thread count, or None for the library default
+            interop_threads: Inter-op thread count, or None for the library default
+            languages: EasyOCR language codes (defaults to English)
+            min_confidence: Minimum EasyOCR score (0-1) for a detection to be kept
+        """
+        if mode not in EASYOCR_MODES:
+            raise ValueError(f"Unknown EasyOCR mode '{mode}'. Available: {', '.join(EASYOCR_MODES)}")
+        if not EASYOCR_AVAILABLE:
+            raise RuntimeError("EasyOCR not available. Install with: pip install easyocr")
+
+        self.mode = mode
+        self.languages = languages or ['en']
+        self.min_confidence = min_confidence
+        self.reader = self._create_reader(mode, threads, interop_threads)
+
+    def _create_reader(self, mode: str, threads: Optional[int], interop_threads: Optional[int]):
+        """
+        Create the EasyOCR reader for the requested CPU inference mode.
+
+        Returns:
+            Configured easyocr.Reader
+        """
+        import easyocr
+        import torch
+
+        if threads:
+            torch.set_num_threads(threads)
+        if interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as e:
+                # Can only be set once per process, before any inter-op work has started
+                print(f"Warning: could not set EasyOCR inter-op threads: {e}")
+
+        if mode == "default":
+            return easyocr.Reader(self.languages)
+
+        # Quantization is applied explicitly below so fp32 really is fp32
+        reader = easyocr.Reader(self.languages, gpu=False, quantize=False, verbose=False)
+
+        if mode == "int8":
+            print("Quantizing EasyOCR recognizer to int8...")
+            torch.quantization.quantize_dynamic(
+                reader.recognizer, {torch.nn.LSTM, torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        elif mode == "onnx":
+            if not ONNXRUNTIME_AVAILABLE:
+                raise RuntimeError("EasyOCR onnx mode requires onnxruntime. Install with: pip install onnxruntime")
+            use_onnx_runtime(reader, threads, interop_threads)
+
+        return reader
+
+    def extract(self, image: np.ndarray) -> Dict:
+        """
+        Extract text using EasyOCR.
+
+        Args:
+            image: Input image as numpy array
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        results = self.reader.readtext(rgb_image)
+
+        texts = []
+        confidences = []
+        bounding_boxes = []
+
+        for (bbox, text, score) in results:
+            if score > self.min_confidence:
+                # EasyOCR scores are 0-1; results use Tesseract's 0-100 scale
+                confidence = float(score) * 100
+                texts.append(text)
+                confidences.append(confidence)
+
+                x_coords = [point[0] for point in bbox]
+                y_coords = [point[1] for point in bbox]
+                x = int(min(x_coords))
+                y = int(min(y_coords))
+                width = int(max(x_coords) - min(x_coords))
+                height = int(max(y_coords) - min(y_coords))
+
+                bounding_boxes.append({
+                    'x': x,
+                    'y': y,
+                    'width': width,
+                    'height': height,
+                    'text': text,
+                    'confidence': confidence
+                })
+
+        full_text = ' '.join(texts)
+        avg_confidence = np.mean(confidences) if confidences else 0
+
+        return {
+            "text": full_text,
+            "confidence": avg_confidence,
+            "bounding_boxes": bounding_boxes,
+            "engine": self.name
+        }
+
+    def recognize_lines(self, gray: np.ndarray, lines: List[Dict],
+                        allowlist: Optional[str] = None) -> List[List[Dict]]:
+        """
+        Recognize known line boxes with EasyOCR's recognizer, skipping its detector.
+
+        Args:
+            gray: Grayscale frame
+            lines: Line dictionaries to recognize
+            allowlist: Optional characters the recognizer may output
+
+        Returns:
+            Word boxes (in frame coordinates) for each line
+        """
+        if not lines:
+            return []
+
+        horizontal_list = [[l['x'], l['x'] + l['width'], l['y'], l['y'] + l['height']] for l in lines]
+        results = self.reader.recognize(gray, horizontal_list=horizontal_list, free_list=[], allowlist=allowlist)
+
+        words_per_line = [[] for _ in lines]
+        for (bbox, text, score) in results:
+            if score <= self.min_confidence or not text.strip():
+                continue
+            confidence = float(score) * 100
+            x0 = int(min(p[0] for p in bbox))
+            y0 = int(min(p[1] for p in bbox))
+            x1 = int(max(p[0] for p in bbox))
+            y1 = int(max(p[1] for p in bbox))
+            center = (x0 + x1) / 2, (y0 + y1) / 2
+            for index, line in enumerate(lines):
+                if (line['x'] <= center[0] <= line['x'] + line['width'] and
+                        line['y'] <= center[1] <= line['y'] + line['height']):
+                    words_per_line[index].append({
+                        'x': x0,
+                        'y': y0,
+                        'width': x1 - x0,
+                        'height': y1 - y0,
+                        'text': text,
+                        'confidence': confidence
+                    })
+                    break
+
+        return words_per_line
+
+
+def use_onnx_runtime(reader, threads: Optional[int] = None, interop_threads: Optional[int] = None):
+    """
+    Swap an EasyOCR reader's detector and recognizer for ONNX Runtime sessions,
+    exporting the models on first use.
+
+    Args:
+        reader: easyocr.Reader created on CPU without quantization
+        threads: Intra-op thread count for ONNX Runtime
+        interop_threads: Inter-op thread count for ONNX Runtime
+    """
+    import onnxruntime
+    import torch
+
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    detector_path = os.path.join(ONNX_MODEL_DIR, "craft_detector.onnx")
+    recognizer_path = os.path.join(ONNX_MODEL_DIR, f"recognizer_{'_'.join(reader.lang_list)}.onnx")
+
+    export_options = {"opset_version": 14}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # Newer torch defaults to the dynamo exporter; the TorchScript exporter
+        # handles EasyOCR's LSTM recognizer with dynamic widths
+        export_options["dynamo"] = False
+
+    if not os.path.exists(detector_path):
+        print(f"Exporting EasyOCR detector to {detector_path}...")
+        torch.onnx.export(
+            reader.detector, (torch.zeros(1, 3, 320, 320),), detector_path,
+            input_names=["image"], output_names=["y", "feature"],
+            dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"},
+                          "y": {0: "batch", 1: "out_height", 2: "out_width"},
+                          "feature": {0: "batch", 2: "out_height", 3: "out_width"}},
+            **export_options
+        )
+
+    if not os.path.exists(recognizer_path):
+        print(f"Exporting EasyOCR recognizer to {recognizer_path}...")
+        pool = getattr(reader.recognizer, "AdaptiveAvgPool", None)
+        if isinstance(pool, torch.nn.AdaptiveAvgPool2d) and tuple(pool.output_size) == (None, 1):
+            # AdaptiveAvgPool2d((None, 1)) can't be exported with a dynamic width;
+            # it is just a mean over the last axis
+            class MeanOverLastAxis(torch.nn.Module):
+                def forward(self, x):
+                    return x.mean(dim=3, keepdim=True)
+
+            reader.recognizer.AdaptiveAvgPool = MeanOverLastAxis()
+        torch.onnx.export(
+            reader.recognizer, (torch.zeros(1, 1, 64, 256), torch.zeros(1, 26, dtype=torch.long)),
+            recognizer_path,
+            input_names=["image", "text"], output_names=["preds"],
+            dynamic_axes={"image": {0: "batch", 3: "width"}, "text": {0: "batch"},
+                          "preds": {0: "batch", 1: "steps"}},
+            **export_options
+        )
+
+    options = onnxruntime.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+    if interop_threads:
+        options.inter_op_num_threads = interop_threads
+    providers = ["CPUExecutionProvider"]
+
+    reader.detector = OnnxDetector(onnxruntime.InferenceSession(detector_path, options, providers=providers))
+    reader.recognizer = OnnxRecognizer(onnxruntime.InferenceSession(recognizer_path, options, providers=providers))
+
+
+# Engine name -> factory. Register a replacement to swap implementations everywhere.
+ENGINES: Dict[str, Callable[..., object]] = {
+    "tesseract": TesseractEngine,
+    "easyocr": EasyOCREngine,
+}
+
+
+def register_engine(name: str, factory: Callable[..., object]):
+    """
+    Register an OCR engine factory. The engine must provide name and
+    extract(image) -> result dictionary; recognize_lines is optional.
+
+    Args:
+        name: Engine name ("tesseract" and "easyocr" are used by ScreenReader)
+        factory: Callable returning an engine instance
+    """
+    ENGINES[name] = factory
+
+
+def create_engine(name: str, **options):
+    """
+    Instantiate a registered engine.
+
+    Args:
+        name: Registered engine name
+        **options: Passed to the engine factory
+
+    Returns:
+        Engine instance
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown OCR engine '{name}'. Available: {', '.join(ENGINES)}")
+    return ENGINES[name](**options)
@@ -0,0 +1,121 @@
+"""
+Constrained recognition for small fields of a known type.
+
+A dashboard value, a clock or an order code doesn't need page segmentation, a
+text detector or the full character set. Field types describe what a field can
+contain - a Tesseract page segmentation mode, an optional character allowlist
+(passed to Tesseract as tessedit_char_whitelist and to EasyOCR as allowlist)
+and a pattern the recognized text should match. Constraining the decoder makes
+recognition both faster and less error-prone (no O/0 or l/1 confusion in a
+numeric field).
+"""
+
+import re
+from typing import Dict, Optional
+
+# Tesseract page segmentation modes
+TESSERACT_PSM_MODES = range(14)
+
+# pytesseract splits the config string with shlex, so quotes and backslashes in
+# an allowlist would break (or inject into) the Tesseract command line
+_UNSAFE_ALLOWLIST_CHARACTERS = frozenset("'\"\\")
+
+# name -> psm, allowlist, pattern
+FIELD_TYPES: Dict[str, Dict] = {
+    # One line of unconstrained text
+    "line": {"psm": 7, "allowlist": None, "pattern": None},
+    # A single word, no spaces
+    "word": {"psm": 8, "allowlist": None, "pattern": r"\S+"},
+    # Unsigned integer
+    "digits": {"psm": 7, "allowlist": "0123456789", "pattern": r"\d+"},
+    # Signed decimal number, optionally with thousands separators or a percent sign
+    "number": {"psm": 7, "allowlist": "0123456789-+.,%", "pattern": r"[-+]?[\d.,]*\d%?"},
+    # Clock time or date/time stamp
+    "time": {"psm": 7, "allowlist": "0123456789:-/.", "pattern": r"[\d:/.\-]+"},
+    # Upper-case alphanumeric code (order numbers, IDs)
+    "code": {"psm": 8, "allowlist": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_", "pattern": r"[A-Z0-9\-_]+"},
+}
+
+
+def check_field_options(allowlist: Optional[str] = None, psm: Optional[int] = None):
+    """
+    Validate a field's allowlist and page segmentation mode.
+
+    Args:
+        allowlist: Characters the recognizer may output
+        psm: Tesseract page segmentation mode
+
+    Raises:
+        ValueError: The psm is not an integer Tesseract mode (0-13), or the allowlist
+            contains whitespace, quotes, backslashes or control characters
+    """
+    if psm is not None and (not isinstance(psm, int) or isinstance(psm, bool) or psm not in TESSERACT_PSM_MODES):
+        raise ValueError(f"psm must be an integer between {TESSERACT_PSM_MODES.start} and "
+                         f"{TESSERACT_PSM_MODES.stop - 1}")
+    if allowlist is not None and any(c.isspace() or not c.isprintable() or c in _UNSAFE_ALLOWLIST_CHARACTERS
+                                     for c in allowlist):
+        raise ValueError("Allowlists can't contain whitespace, quotes or backslashes")
+
+
+def register_field_type(name: str, psm: int = 7, allowlist: Optional[str] = None,
+                        pattern: Optional[str] = None):
+    """
+    Register a field type for read_field and read_fields.
+
+    Args:
+        name: Type name
+        psm: Tesseract page segmentation mode (7 = single line, 8 = single word)
+        allowlist: Characters the recognizer may output (no whitespace, quotes or backslashes)
+        pattern: Regular expression the whole recognized text should match
+    """
+    check_field_options(allowlist, psm)
+    FIELD_TYPES[name] = {"psm": psm, "allowlist": allowlist, "pattern": pattern}
+
+
+def resolve_field(field_type: str = "line", allowlist: Optional[str] = None,
+                  psm: Optional[int] = None) -> Dict:
+    """
+    Look up a field type, with optional per-field overrides.
+
+    Args:
+        field_type: Name from FIELD_TYPES
+        allowlist: Overrides the type's allowlist
+        psm: Overrides the type's page segmentation mode
+
+    Returns:
+        Field specification with psm, allowlist and pattern
+
+    Raises:
+        ValueError: Unknown field type or invalid overrides (see check_field_options)
+    """
+    if field_type not in FIELD_TYPES:
+        raise ValueError(f"Unknown field type '{field_type}'. Available: {', '.join(sorted(FIELD_TYPES))}")
+    check_field_options(allowlist, psm)
+    spec = dict(FIELD_TYPES[field_type], type=field_type)
+    if allowlist is not None:
+        # A custom character set invalidates the type's pattern
+        spec.update(allowlist=allowlist, pattern=None)
+    if psm is not None:
+        spec["psm"] = psm
+    return spec
+
+
+def tesseract_config(spec: Dict) -> str:
+    """Tesseract command-line config for a field specification."""
+    config = f"--oem 3 --psm {spec['psm']}"
+    if spec["allowlist"]:
+        config += f" -c tessedit_char_whitelist={spec['allowlist']}"
+    return config
+
+
+def field_text(words, spec: Dict) -> str:
+    """Join a field's words; fields that can't contain spaces are joined without them."""
+    separator = " " if spec["psm"] == 7 and spec["allowlist"] is None else ""
+    return separator.join(w['text'] for w in sorted(words, key=lambda w: w['x']))
+
+
+def is_valid(text: str, spec: Dict) -> bool:
+    """Whether recognized text matches the field's pattern (always true without one)."""
+    if spec["pattern"] is None:
+        return bool(text)
+    return re.fullmatch(spec["pattern"], text) is not None
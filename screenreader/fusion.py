@@ -0,0 +1,198 @@
+"""
+Combining results from multiple OCR engines.
+
+fuse_boxes aligns Tesseract word boxes with EasyOCR phrase boxes and picks a
+reading per group; the overlap-based duplicate removal is kept for callers
+that merge flat box lists.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .layout import group_boxes_into_lines
+
+
+def normalize_text(text: str) -> str:
+    return ''.join(text.lower().split())
+
+
+def fuse_boxes(tesseract_boxes: List[Dict], easyocr_boxes: List[Dict]) -> Tuple[List[Dict], Dict]:
+    """
+    Align Tesseract word boxes with EasyOCR boxes and pick a reading for each.
+
+    Tesseract words are bucketed into a uniform grid by centre point, so each
+    EasyOCR box only inspects the cells it covers. An EasyOCR box and the
+    Tesseract words centred inside it form a group; if both engines read the
+    same text it is kept with the higher confidence, otherwise the engine
+    with the higher mean confidence wins. Unmatched boxes from
+    either engine are kept as-is.
+
+    Args:
+        tesseract_boxes: Word boxes from Tesseract
+        easyocr_boxes: Word/phrase boxes from EasyOCR
+
+    Returns:
+        Tuple of (fused boxes, fusion statistics)
+    """
+    # Both engines report confidences on a 0-100 scale
+    tesseract_words = [dict(box, engine='tesseract', confidence=float(box['confidence']))
+                       for box in tesseract_boxes]
+    easyocr_words = [dict(box, engine='easyocr', confidence=float(box['confidence']))
+                     for box in easyocr_boxes]
+
+    stats = {"matched": 0, "agreed": 0, "from_tesseract": 0, "from_easyocr": 0}
+
+    if not tesseract_words or not easyocr_words:
+        stats["from_tesseract"] = len(tesseract_words)
+        stats["from_easyocr"] = len(easyocr_words)
+        return tesseract_words + easyocr_words, stats
+
+    heights = [w['height'] for w in tesseract_words if w['height'] > 0]
+    cell = max(8, int(np.median(heights)) * 4) if heights else 64
+
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for index, word in enumerate(tesseract_words):
+        cx = word['x'] + word['width'] // 2
+        cy = word['y'] + word['height'] // 2
+        grid.setdefault((cx // cell, cy // cell), []).append(index)
+
+    claimed = [False] * len(tesseract_words)
+    fused = []
+
+    for phrase in easyocr_words:
+        x0, y0 = phrase['x'], phrase['y']
+        x1, y1 = x0 + phrase['width'], y0 + phrase['height']
+
+        members = []
+        for gx in range(x0 // cell, x1 // cell + 1):
+            for gy in range(y0 // cell, y1 // cell + 1):
+                for index in grid.get((gx, gy), ()):
+                    if claimed[index]:
+                        continue
+                    word = tesseract_words[index]
+                    cx = word['x'] + word['width'] / 2
+                    cy = word['y'] + word['height'] / 2
+                    if x0 <= cx <= x1 and y0 <= cy <= y1:
+                        members.append(index)
+
+        if not members:
+            fused.append(phrase)
+            stats["from_easyocr"] += 1
+            continue
+
+        for index in members:
+            claimed[index] = True
+        words = sorted((tesseract_words[i] for i in members), key=lambda w: (w['y'], w['x']))
+        tesseract_text = ''.join(w['text'] for w in words)
+        tesseract_confidence = float(np.mean([w['confidence'] for w in words]))
+        stats["matched"] += 1
+
+        if normalize_text(tesseract_text) == normalize_text(phrase['text']):
+            # Both engines agree - keep Tesseract's word granularity with the stronger confidence
+            stats["agreed"] += 1
+            confidence = max(tesseract_confidence, phrase['confidence'])
+            fused.extend(dict(w, confidence=max(w['confidence'], confidence), engine='both') for w in words)
+            stats["from_tesseract"] += len(words)
+        elif tesseract_confidence >= phrase['confidence']:
+            fused.extend(words)
+            stats["from_tesseract"] += len(words)
+        else:
+            fused.append(phrase)
+            stats["from_easyocr"] += 1
+
+    for index, word in enumerate(tesseract_words):
+        if not claimed[index]:
+            fused.append(word)
+            stats["from_tesseract"] += 1
+
+    return fused, stats
+
+
+def combine_results(tesseract_result: Dict, easyocr_result: Dict) -> Dict:
+    """
+    Combine results from multiple OCR engines for better accuracy.
+
+    Boxes are aligned across engines and the better reading is chosen per
+    word (or per EasyOCR phrase), so the returned text and boxes describe the
+    same set of words. Confidences are on the 0-100 scale both engines use.
+
+    Args:
+        tesseract_result: Results from Tesseract
+        easyocr_result: Results from EasyOCR
+
+    Returns:
+        Combined results
+    """
+    fused, stats = fuse_boxes(tesseract_result["bounding_boxes"], easyocr_result["bounding_boxes"])
+
+    lines = group_boxes_into_lines(fused)
+    text = ' '.join(line['text'] for line in lines)
+    confidence = np.mean([box['confidence'] for box in fused]) if fused else 0
+
+    if stats["from_tesseract"] >= stats["from_easyocr"]:
+        primary_result, secondary_result = tesseract_result, easyocr_result
+    else:
+        primary_result, secondary_result = easyocr_result, tesseract_result
+
+    return {
+        "text": text,
+        "confidence": confidence,
+        "bounding_boxes": fused,
+        "primary_engine": primary_result.get("engine", "tesseract"),
+        "secondary_engine": secondary_result.get("engine", "easyocr"),
+        "combined": True,
+        "fusion": stats
+    }
+
+
+def calculate_overlap(box1: Dict, box2: Dict) -> float:
+    """
+    Calculate overlap ratio between two bounding boxes.
+
+    Args:
+        box1: First bounding box
+        box2: Second bounding box
+
+    Returns:
+        Overlap ratio (0-1)
+    """
+    x1_min, y1_min = box1['x'], box1['y']
+    x1_max, y1_max = x1_min + box1['width'], y1_min + box1['height']
+
+    x2_min, y2_min = box2['x'], box2['y']
+    x2_max, y2_max = x2_min + box2['width'], y2_min + box2['height']
+
+    x_overlap = max(0, min(x1_max, x2_max) - max(x1_min, x2_min))
+    y_overlap = max(0, min(y1_max, y2_max) - max(y1_min, y2_min))
+    intersection = x_overlap * y_overlap
+
+    area1 = box1['width'] * box1['height']
+    area2 = box2['width'] * box2['height']
+    union = area1 + area2 - intersection
+
+    return intersection / union if union > 0 else 0
+
+
+def remove_duplicate_boxes(boxes: List[Dict], threshold: float = 0.7) -> List[Dict]:
+    """
+    Remove duplicate bounding boxes based on spatial overlap.
+
+    Args:
+        boxes: List of bounding box dictionaries
+        threshold: Overlap ratio above which the lower-confidence box is dropped
+
+    Returns:
+        Filtered list without duplicates
+    """
+    if not boxes:
+        return []
+
+    sorted_boxes = sorted(boxes, key=lambda x: x['confidence'], reverse=True)
+    unique_boxes = []
+
+    for box in sorted_boxes:
+        if not any(calculate_overlap(box, existing_box) > threshold for existing_box in unique_boxes):
+            unique_boxes.append(box)
+
+    return unique_boxes
@@ -0,0 +1,299 @@
+"""
+Text layout reconstruction and layout caching.
+
+Word boxes are grouped into lines and blocks with sort-and-sweep passes, and
+LayoutCache memoizes the line geometry of screens that keep reappearing.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def group_boxes_into_lines(boxes: List[Dict], gap_factor: float = 3.0) -> List[Dict]:
+    """
+    Group word boxes into text lines with a single sort-and-sweep pass.
+
+    Boxes are swept top to bottom by vertical centre; a box joins the current
+    line while its centre lies within the line's vertical extent. Each line is
+    then split wherever the horizontal gap exceeds gap_factor times its height,
+    so side-by-side columns don't merge.
+
+    Args:
+        boxes: Word bounding box dictionaries (x, y, width, height, text, confidence)
+        gap_factor: Horizontal gap, in line heights, that splits a line
+
+    Returns:
+        List of line dictionaries with geometry, text, confidence and their words
+    """
+    if not boxes:
+        return []
+
+    rows = []
+    current = None
+    for box in sorted(boxes, key=lambda b: b['y'] + b['height'] / 2):
+        center = box['y'] + box['height'] / 2
+        if current is not None and current['top'] <= center <= current['bottom']:
+            current['words'].append(box)
+            current['top'] = min(current['top'], box['y'])
+            current['bottom'] = max(current['bottom'], box['y'] + box['height'])
+        else:
+            current = {'top': box['y'], 'bottom': box['y'] + box['height'], 'words': [box]}
+            rows.append(current)
+
+    lines = []
+    for row in rows:
+        words = sorted(row['words'], key=lambda b: b['x'])
+        max_gap = gap_factor * max(1, row['bottom'] - row['top'])
+        segment = [words[0]]
+        for word in words[1:]:
+            previous_right = max(w['x'] + w['width'] for w in segment)
+            if word['x'] - previous_right > max_gap:
+                lines.append(_make_line(segment))
+                segment = [word]
+            else:
+                segment.append(word)
+        lines.append(_make_line(segment))
+
+    return lines
+
+
+def _make_line(words: List[Dict]) -> Dict:
+    x0 = min(w['x'] for w in words)
+    y0 = min(w['y'] for w in words)
+    x1 = max(w['x'] + w['width'] for w in words)
+    y1 = max(w['y'] + w['height'] for w in words)
+    return {
+        'x': x0,
+        'y': y0,
+        'width': x1 - x0,
+        'height': y1 - y0,
+        'text': ' '.join(w['text'] for w in words),
+        'confidence': float(np.mean([w['confidence'] for w in words])),
+        'words': words
+    }
+
+
+# Output levels accepted by reconstruct_layout and the ScreenReader read methods
+LAYOUT_LEVELS = ("lines", "blocks", "full")
+
+
+def group_lines_into_blocks(lines: List[Dict], gap_factor: float = 1.5) -> List[Dict]:
+    """
+    Group text lines into blocks (paragraphs, panes) with a sort-and-sweep pass.
+
+    Lines are swept top to bottom while a small set of open blocks is kept; a line
+    joins the open block it overlaps horizontally if the vertical gap is under
+    gap_factor line heights. Blocks that fall too far above the sweep position are
+    closed, so each line is only compared against the blocks still in reach.
+
+    Args:
+        lines: Line dictionaries as produced by group_boxes_into_lines
+        gap_factor: Maximum vertical gap, in line heights, within a block
+
+    Returns:
+        List of block dictionaries in reading order, each with its lines
+    """
+    blocks = []
+    open_blocks = []
+
+    for line in sorted(lines, key=lambda l: (l['y'], l['x'])):
+        reach = gap_factor * line['height']
+        open_blocks = [b for b in open_blocks if line['y'] - b['bottom'] <= reach]
+
+        target = None
+        for block in open_blocks:
+            overlap = min(block['right'], line['x'] + line['width']) - max(block['left'], line['x'])
+            if overlap > 0:
+                target = block
+                break
+
+        if target is None:
+            target = {'left': line['x'], 'right': line['x'] + line['width'],
+                      'top': line['y'], 'bottom': line['y'] + line['height'], 'lines': []}
+            blocks.append(target)
+            open_blocks.append(target)
+
+        target['lines'].append(line)
+        target['left'] = min(target['left'], line['x'])
+        target['right'] = max(target['right'], line['x'] + line['width'])
+        target['bottom'] = max(target['bottom'], line['y'] + line['height'])
+
+    ordered = []
+    for block in sorted(blocks, key=lambda b: (b['top'], b['left'])):
+        ordered.append({
+            'x': block['left'],
+            'y': block['top'],
+            'width': block['right'] - block['left'],
+            'height': block['bottom'] - block['top'],
+            'text': '\n'.join(l['text'] for l in block['lines']),
+            'confidence': float(np.mean([l['confidence'] for l in block['lines']])),
+            'lines': block['lines']
+        })
+    return ordered
+
+
+def reconstruct_layout(boxes: List[Dict], level: str = "full") -> Dict:
+    """
+    Rebuild lines and blocks from word boxes and assemble reading-order text.
+
+    Args:
+        boxes: Word bounding box dictionaries
+        level: "lines" returns only lines, "blocks" returns blocks with their lines,
+               "full" also keeps the words of every line
+
+    Returns:
+        Dictionary with reading-order text and the requested structure
+    """
+    if level not in LAYOUT_LEVELS:
+        raise ValueError(f"Unknown layout level '{level}'. Available: {', '.join(LAYOUT_LEVELS)}")
+
+    blocks = group_lines_into_blocks(group_boxes_into_lines(boxes))
+    text = '\n\n'.join(block['text'] for block in blocks)
+
+    def strip_line(line):
+        if level == "full":
+            return line
+        return {k: v for k, v in line.items() if k != 'words'}
+
+    lines = [strip_line(line) for block in blocks for line in block['lines']]
+
+    if level == "lines":
+        return {"text": text, "lines": lines}
+
+    for block in blocks:
+        block['lines'] = [strip_line(line) for line in block['lines']]
+
+    return {"text": text, "lines": lines, "blocks": blocks}
+
+
+class LayoutCache:
+    """
+    Memoizes text-line geometry for recurring screens.
+
+    Screens are identified by a 64-bit difference hash of a downscaled grayscale
+    image plus the image size, matched within a small Hamming distance so that
+    changing field values don't produce a new fingerprint. Each entry stores the
+    line boxes of the first full OCR pass along with a small pixel signature per
+    line; lines whose pixels still match are served from the cache.
+    """
+
+    def __init__(self, max_entries: int = 32, max_distance: int = 4,
+                 signature_tolerance: float = 3.0, refresh_after: int = 50):
+        """
+        Args:
+            max_entries: Number of screen layouts to keep (least recently used are evicted)
+            max_distance: Maximum Hamming distance between matching fingerprints
+            signature_tolerance: Mean absolute pixel difference below which a line is unchanged
+            refresh_after: Force a full detection pass after this many cache hits
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.signature_tolerance = signature_tolerance
+        self.refresh_after = refresh_after
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(gray: np.ndarray) -> int:
+        """
+        Compute a 64-bit difference hash of a grayscale image.
+
+        Args:
+            gray: Grayscale image
+
+        Returns:
+            Fingerprint as an integer
+        """
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+    @staticmethod
+    def line_signature(gray: np.ndarray, line: Dict) -> np.ndarray:
+        """
+        Downsample a line's pixels into a small signature for change verification.
+
+        Args:
+            gray: Grayscale image the line belongs to
+            line: Line dictionary with x, y, width, height
+
+        Returns:
+            Signature array
+        """
+        crop = gray[line['y']:line['y'] + line['height'], line['x']:line['x'] + line['width']]
+        if crop.size == 0:
+            return np.zeros((8, 32), dtype=np.float32)
+        return cv2.resize(crop, (32, 8), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def lookup(self, gray: np.ndarray) -> Optional[Dict]:
+        """
+        Find the cached layout matching an image, if any.
+
+        Args:
+            gray: Grayscale image
+
+        Returns:
+            Cache entry, or None on a miss or when a refresh is due
+        """
+        fingerprint = self.fingerprint(gray)
+        with self._lock:
+            for key, entry in self._entries.items():
+                shape, cached_fingerprint = key
+                if shape == gray.shape and bin(fingerprint ^ cached_fingerprint).count('1') <= self.max_distance:
+                    if entry['uses'] >= self.refresh_after:
+                        del self._entries[key]
+                        break
+                    entry['uses'] += 1
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def store(self, gray: np.ndarray, boxes: List[Dict]):
+        """
+        Record the line layout produced by a full OCR pass.
+
+        Args:
+            gray: Grayscale image that was OCR'd
+            boxes: Word bounding boxes from the full pass; they are copied, so the
+                caller may go on to modify its result
+        """
+        lines = group_boxes_into_lines([dict(box) for box in boxes])
+        for line in lines:
+            line['signature'] = self.line_signature(gray, line)
+
+        key = (gray.shape, self.fingerprint(gray))
+        with self._lock:
+            self._entries[key] = {'lines': lines, 'uses': 0}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update_lines(self, entry: Dict, lines: List[Dict]):
+        """
+        Replace an entry's lines after some of them were re-recognized.
+
+        Readers never modify entry['lines'] in place; they build a new list and
+        swap it in here, so concurrent hits always see a consistent set of lines.
+
+        Args:
+            entry: Entry returned by lookup()
+            lines: New line list for the entry
+        """
+        with self._lock:
+            entry['lines'] = lines
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,126 @@
+"""
+Monitor enumeration for multi-head X11 setups.
+
+Monitors are read from `xrandr --listmonitors`, which reports each monitor's
+geometry within the virtual desktop (Xvfb reports a single "screen" monitor).
+Without xrandr the whole desktop is treated as one monitor.
+"""
+
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+# " 1: +*HDMI-1 1920/527x1080/296+1920+0  HDMI-1"
+MONITOR_LINE = re.compile(
+    r'^\s*(?P<index>\d+):\s+\+?(?P<primary>\*)?(?P<name>\S+)\s+'
+    r'(?P<width>\d+)/\d+x(?P<height>\d+)/\d+\+(?P<x>-?\d+)\+(?P<y>-?\d+)'
+)
+
+
+def parse_monitors(output: str) -> List[Dict]:
+    """
+    Parse `xrandr --listmonitors` output.
+
+    Args:
+        output: Command output
+
+    Returns:
+        Monitor dictionaries (index, name, primary, x, y, width, height)
+    """
+    monitors = []
+    for line in output.splitlines():
+        match = MONITOR_LINE.match(line)
+        if match is None:
+            continue
+        monitors.append({
+            "index": int(match.group("index")),
+            "name": match.group("name"),
+            "primary": match.group("primary") is not None,
+            "x": int(match.group("x")),
+            "y": int(match.group("y")),
+            "width": int(match.group("width")),
+            "height": int(match.group("height")),
+        })
+    return monitors
+
+
+def monitor_region(monitor: Dict) -> Tuple[int, int, int, int]:
+    return monitor["x"], monitor["y"], monitor["width"], monitor["height"]
+
+
+class MonitorLayout:
+    """
+    Cached monitor list with lookup by index, name or "primary".
+
+    Args:
+        ttl: Seconds the monitor list is reused (hotplug is picked up after this)
+        display: X display to query (defaults to $DISPLAY)
+    """
+
+    def __init__(self, ttl: float = 10.0, display: Optional[str] = None):
+        self.ttl = ttl
+        self.display = display
+        self._monitors: List[Dict] = []
+        self._listed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _query(self) -> List[Dict]:
+        cmd = ["xrandr", "--listmonitors"]
+        if self.display:
+            cmd += ["-display", self.display]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        except FileNotFoundError:
+            return []
+        except subprocess.TimeoutExpired:
+            print("Warning: xrandr timed out, treating the desktop as one monitor")
+            return []
+        if result.returncode != 0:
+            print(f"Warning: xrandr failed, treating the desktop as one monitor: {result.stderr.strip()}")
+            return []
+        return parse_monitors(result.stdout)
+
+    def list_monitors(self, refresh: bool = False) -> List[Dict]:
+        """
+        List monitors in xrandr order.
+
+        Args:
+            refresh: Re-query instead of using the cached list
+
+        Returns:
+            Monitor dictionaries; empty when monitors can't be enumerated
+        """
+        with self._lock:
+            if refresh or not self._listed_at or time.time() - self._listed_at > self.ttl:
+                self._monitors = self._query()
+                self._listed_at = time.time()
+            return [dict(m) for m in self._monitors]
+
+    def select(self, selector: Union[int, str]) -> Dict:
+        """
+        Pick a monitor.
+
+        Args:
+            selector: Index (int or digit string), xrandr name, or "primary"
+
+        Returns:
+            Monitor dictionary
+        """
+        monitors = self.list_monitors()
+        if not monitors:
+            raise LookupError("No monitors found (is xrandr installed and the display running?)")
+        if selector == "primary":
+            return next((m for m in monitors if m["primary"]), monitors[0])
+        if isinstance(selector, int) or str(selector).isdigit():
+            index = int(selector)
+            for monitor in monitors:
+                if monitor["index"] == index:
+                    return monitor
+        else:
+            for monitor in monitors:
+                if monitor["name"] == selector:
+                    return monitor
+        raise LookupError(f"Unknown monitor '{selector}'. Available: "
+                          f"{', '.join(str(m['index']) + '=' + m['name'] for m in monitors)}")
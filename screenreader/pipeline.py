@@ -0,0 +1,254 @@
+"""
+Staged capture -> preprocess -> OCR pipeline for continuous reading.
+
+read_screen runs its three steps back to back, so the CPU idles while a frame
+is captured and capture idles while it is OCR'd. ReadingPipeline runs them as
+separate stages - a grabber thread, a preprocessing thread and a pool of OCR
+threads - connected by small bounded buffers. When a stage falls behind, the
+buffer in front of it drops its oldest frame (latest frame wins), so results
+stay current and sustained throughput is set by the slowest stage rather than
+the sum of all three.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional, Tuple
+
+import cv2
+
+
+class FrameBuffer:
+    """
+    Bounded hand-off between two pipeline stages. When full, put() discards the
+    oldest item instead of blocking the producer.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._cond:
+            self._items.append(item)
+            while len(self._items) > self.capacity:
+                self._items.popleft()
+                self.dropped += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None, latest: bool = False):
+        """
+        Take an item, waiting up to timeout seconds.
+
+        Args:
+            timeout: Seconds to wait (None waits until an item arrives or the buffer closes)
+            latest: Take the newest item and discard the older ones
+
+        Returns:
+            The item, or None on timeout or once the buffer is closed and empty
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._items:
+                remaining = None if deadline is None else deadline - time.time()
+                if self._closed or (remaining is not None and remaining <= 0):
+                    return None
+                self._cond.wait(remaining)
+            if latest:
+                item = self._items.pop()
+                self.dropped += len(self._items)
+                self._items.clear()
+                return item
+            return self._items.popleft()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+class StageStats:
+    """Item count and busy time of one stage."""
+
+    def __init__(self):
+        self.count = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.busy += seconds
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {"count": self.count,
+                    "avg_seconds": self.busy / self.count if self.count else 0.0}
+
+
+class ReadingPipeline:
+    """
+    Continuously read the screen (or a region) with overlapping stages.
+
+    Use as a context manager and iterate over it to receive results in frame
+    order; a result for a frame older than one already delivered is discarded.
+
+        with reader.stream(region=(0, 0, 800, 600)) as pipeline:
+            for result in pipeline:
+                print(result["frame"], result["text"])
+
+    Args:
+        reader: ScreenReader providing capture, preprocessing and OCR
+        region: Optional (x, y, width, height) to capture
+        profile: Optional preprocessing profile override
+        layout: Optional layout output level ("lines", "blocks" or "full")
+        interval: Minimum seconds between captures (0 captures back to back)
+        ocr_workers: OCR threads; OCR is usually the slowest stage
+        buffer_size: Frames buffered between capture and preprocessing
+        max_results: Results buffered for a slow consumer before the oldest are dropped
+    """
+
+    def __init__(self, reader, region: Optional[Tuple[int, int, int, int]] = None,
+                 profile: Optional[str] = None, layout: Optional[str] = None, interval: float = 0.0,
+                 ocr_workers: int = 2, buffer_size: int = 2, max_results: int = 8):
+        self.reader = reader
+        self.region = region
+        self.profile = profile
+        self.layout = layout
+        self.interval = interval
+        self.ocr_workers = max(1, ocr_workers)
+
+        self._frames = FrameBuffer(buffer_size)
+        self._processed = FrameBuffer(self.ocr_workers)
+        self._results = FrameBuffer(max_results)
+        self._stats = {"capture": StageStats(), "preprocess": StageStats(), "ocr": StageStats()}
+        self._stop = threading.Event()
+        self._threads = []
+        self._delivered_lock = threading.Lock()
+        self._last_delivered = -1
+        self._stale = 0
+        self._started_at = None
+
+    def start(self) -> "ReadingPipeline":
+        if self._threads:
+            return self
+        self._started_at = time.time()
+        targets = [("capture", self._capture_loop), ("preprocess", self._preprocess_loop)]
+        targets += [(f"ocr-{i}", self._ocr_loop) for i in range(self.ocr_workers)]
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=f"screenreader-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for buffer in (self._frames, self._processed):
+            buffer.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._results.close()
+
+    def __enter__(self) -> "ReadingPipeline":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __iter__(self) -> Iterator[Dict]:
+        while not self._stop.is_set() or len(self._results):
+            result = self._results.get(timeout=0.5)
+            if result is not None:
+                yield result
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Take the next result, or None if none arrives within timeout seconds."""
+        return self._results.get(timeout=timeout)
+
+    def _capture_loop(self):
+        sequence = 0
+        while not self._stop.is_set():
+            start = time.time()
+            try:
+                frame = self.reader.capture_screen(self.region)
+            except Exception as e:
+                print(f"Pipeline capture failed: {e}")
+                self._stop.wait(0.5)
+                continue
+            elapsed = time.time() - start
+            self._stats["capture"].record(elapsed)
+            self._frames.put((sequence, start, frame))
+            sequence += 1
+            if self.interval > elapsed:
+                self._stop.wait(self.interval - elapsed)
+
+    def _preprocess_loop(self):
+        while not self._stop.is_set():
+            item = self._frames.get(timeout=0.5, latest=True)
+            if item is None:
+                continue
+            sequence, captured_at, frame = item
+            start = time.time()
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            profile = self.reader.resolve_profile(gray, self.profile)
+            processed_image = self.reader.preprocess_image(gray, profile)
+            self._stats["preprocess"].record(time.time() - start)
+            self._processed.put((sequence, captured_at, frame, gray, processed_image, profile))
+
+    def _ocr_loop(self):
+        while not self._stop.is_set():
+            item = self._processed.get(timeout=0.5)
+            if item is None:
+                continue
+            sequence, captured_at, frame, gray, processed_image, profile = item
+            start = time.time()
+            try:
+                result = self.reader._apply_layout(self.reader._run_engines(frame, processed_image, gray),
+                                                   self.layout)
+            except Exception as e:
+                print(f"Pipeline OCR failed for frame {sequence}: {e}")
+                continue
+            self._stats["ocr"].record(time.time() - start)
+
+            result.update({
+                "frame": sequence,
+                "captured_at": captured_at,
+                "latency": time.time() - captured_at,
+                "image_shape": frame.shape,
+                "region": self.region,
+                "preprocessing_profile": profile,
+                "timestamp": time.time()
+            })
+            with self._delivered_lock:
+                # A worker that finished late must not overwrite a newer frame's result
+                if sequence < self._last_delivered:
+                    self._stale += 1
+                    continue
+                self._last_delivered = sequence
+                self._results.put(result)
+
+    def stats(self) -> Dict:
+        """Per-stage counts and timings, drop counters and delivered frames per second."""
+        elapsed = time.time() - self._started_at if self._started_at else 0.0
+        # Stale results are counted after their OCR time is recorded, so reading
+        # them first keeps delivered from going negative
+        with self._delivered_lock:
+            stale = self._stale
+        stages = {name: stats.to_dict() for name, stats in self._stats.items()}
+        delivered = stages["ocr"]["count"] - stale
+        return {
+            "stages": stages,
+            "dropped": {"before_preprocess": self._frames.dropped, "before_ocr": self._processed.dropped,
+                        "results": self._results.dropped, "stale": stale},
+            "delivered": delivered,
+            "fps": delivered / elapsed if elapsed > 0 else 0.0,
+            "ocr_workers": self.ocr_workers,
+        }
@@ -0,0 +1,227 @@
+"""
+Image preprocessing profiles.
+
+A profile is an ordered tuple of step names applied to a grayscale image.
+Profiles are compiled once into tuples of callables (with kernels and lookup
+tables precomputed) and cached per profile/adjustment combination.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Named preprocessing profiles. Each profile is an ordered tuple of step names
+# that operate on a single-channel (grayscale) image; see PREPROCESSING_STEPS.
+PREPROCESSING_PROFILES = {
+    "default": ("blur", "adaptive_threshold", "close"),
+    "dark_mode": ("invert", "blur", "adaptive_threshold", "close"),
+    "low_contrast": ("clahe", "blur", "otsu_threshold"),
+    "anti_aliased": ("sharpen", "otsu_threshold"),
+}
+
+# Pseudo-profile that picks "dark_mode" or "default" from a histogram check.
+AUTO_PROFILE = "auto"
+
+# Images whose dominant intensity falls below this value are treated as dark-theme.
+DARK_BACKGROUND_THRESHOLD = 110
+
+
+def _blur():
+    return lambda img: cv2.GaussianBlur(img, (3, 3), 0)
+
+
+def _adaptive_threshold():
+    return lambda img: cv2.adaptiveThreshold(
+        img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+
+
+def _otsu_threshold():
+    return lambda img: cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+def _close():
+    kernel = np.ones((2, 2), np.uint8)
+    return lambda img: cv2.morphologyEx(img, cv2.MORPH_CLOSE, kernel)
+
+
+def _sharpen():
+    kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
+    return lambda img: cv2.filter2D(img, -1, kernel)
+
+
+def _clahe():
+    # CLAHE objects keep internal buffers, so keep one per thread
+    local = threading.local()
+
+    def apply_clahe(img):
+        clahe = getattr(local, "clahe", None)
+        if clahe is None:
+            clahe = local.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe.apply(img)
+
+    return apply_clahe
+
+
+def _median():
+    return lambda img: cv2.medianBlur(img, 3)
+
+
+# Step name -> factory returning the compiled step callable
+PREPROCESSING_STEPS: Dict[str, Callable[[], Callable[[np.ndarray], np.ndarray]]] = {
+    "invert": lambda: cv2.bitwise_not,
+    "blur": _blur,
+    "adaptive_threshold": _adaptive_threshold,
+    "otsu_threshold": _otsu_threshold,
+    "close": _close,
+    "sharpen": _sharpen,
+    "clahe": _clahe,
+    "median": _median,
+}
+
+
+def register_step(name: str, factory: Callable[[], Callable[[np.ndarray], np.ndarray]]):
+    """
+    Register a preprocessing step that profiles can refer to by name.
+
+    Args:
+        name: Step name
+        factory: Zero-argument callable returning the step function
+    """
+    PREPROCESSING_STEPS[name] = factory
+    compile_preprocessing_pipeline.cache_clear()
+
+
+def register_profile(name: str, steps: Tuple[str, ...]):
+    """
+    Register (or replace) a named preprocessing profile.
+
+    Args:
+        name: Profile name
+        steps: Ordered step names from PREPROCESSING_STEPS
+    """
+    if name == AUTO_PROFILE:
+        raise ValueError(f"'{AUTO_PROFILE}' is reserved for automatic profile selection")
+    unknown = [step for step in steps if step not in PREPROCESSING_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing steps: {', '.join(unknown)}")
+    PREPROCESSING_PROFILES[name] = tuple(steps)
+    compile_preprocessing_pipeline.cache_clear()
+
+
+def is_valid_profile(profile: Optional[str]) -> bool:
+    return profile == AUTO_PROFILE or profile in PREPROCESSING_PROFILES
+
+
+def _compile_step(name: str):
+    """
+    Build a preprocessing step, precomputing any kernels it needs.
+
+    Args:
+        name: Step name as used in PREPROCESSING_PROFILES
+
+    Returns:
+        Callable taking and returning a grayscale image
+    """
+    factory = PREPROCESSING_STEPS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown preprocessing step: {name}")
+    return factory()
+
+
+@lru_cache(maxsize=32)
+def compile_preprocessing_pipeline(profile: str, contrast: float = 1.0,
+                                   brightness: float = 1.0, noise_reduction: bool = False):
+    """
+    Compile a preprocessing profile into a list of callables. Results are cached,
+    so each distinct profile/adjustment combination is only built once.
+
+    Args:
+        profile: Name of a profile in PREPROCESSING_PROFILES
+        contrast: Contrast factor (1.0 leaves the image unchanged)
+        brightness: Brightness factor (1.0 leaves the image unchanged)
+        noise_reduction: Whether to apply a median filter before the profile steps
+
+    Returns:
+        Tuple of callables to apply in order to a grayscale image
+    """
+    if profile not in PREPROCESSING_PROFILES:
+        raise ValueError(
+            f"Unknown preprocessing profile '{profile}'. "
+            f"Available: {', '.join(sorted(PREPROCESSING_PROFILES))}, {AUTO_PROFILE}"
+        )
+
+    steps = []
+
+    if contrast != 1.0 or brightness != 1.0:
+        # Brightness scales intensities, contrast stretches them around mid-grey
+        # (same semantics as PIL.ImageEnhance) - folded into a single lookup table.
+        values = np.arange(256, dtype=np.float32) * brightness
+        values = (values - 128.0) * contrast + 128.0
+        lut = np.clip(values, 0, 255).astype(np.uint8)
+        steps.append(lambda img: cv2.LUT(img, lut))
+
+    if noise_reduction:
+        steps.append(_compile_step("median"))
+
+    steps.extend(_compile_step(name) for name in PREPROCESSING_PROFILES[profile])
+
+    return tuple(steps)
+
+
+def is_dark_background(gray: np.ndarray) -> bool:
+    """
+    Detect dark-theme screenshots from the dominant intensity of a subsampled histogram.
+
+    Args:
+        gray: Grayscale image
+
+    Returns:
+        True if the background (most frequent intensity band) is dark
+    """
+    sample = np.ascontiguousarray(gray[::4, ::4])
+    hist = cv2.calcHist([sample], [0], None, [16], [0, 256])
+    dominant_bin = int(np.argmax(hist))
+
+    return (dominant_bin + 0.5) * 16 < DARK_BACKGROUND_THRESHOLD
+
+
+def resolve_profile(gray: np.ndarray, profile: str) -> str:
+    """
+    Resolve a profile name, running dark-theme detection for "auto".
+
+    Args:
+        gray: Grayscale image used for auto-detection
+        profile: Requested profile
+
+    Returns:
+        Concrete profile name from PREPROCESSING_PROFILES
+    """
+    if profile == AUTO_PROFILE:
+        return "dark_mode" if is_dark_background(gray) else "default"
+    return profile
+
+
+def preprocess(gray: np.ndarray, profile: str, contrast: float = 1.0, brightness: float = 1.0,
+               noise_reduction: bool = False) -> np.ndarray:
+    """
+    Run a compiled preprocessing pipeline on a grayscale image.
+
+    Args:
+        gray: Grayscale image
+        profile: Concrete profile name
+        contrast: Contrast factor applied before the profile steps
+        brightness: Brightness factor applied before the profile steps
+        noise_reduction: Whether to median-filter before the profile steps
+
+    Returns:
+        Preprocessed image
+    """
+    processed = gray
+    for step in compile_preprocessing_pipeline(profile, float(contrast), float(brightness),
+                                               bool(noise_reduction)):
+        processed = step(processed)
+    return processed
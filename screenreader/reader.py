@@ -0,0 +1,1322 @@
+"""
+ScreenReader: screen capture, preprocessing and OCR in one pipeline.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from . import fusion, search
+from .capture import create_capture_backend, create_test_image, pointer_position
+from .documents import DEFAULT_PDF_DPI, iter_pages
+from .engines import EASYOCR_AVAILABLE, EASYOCR_MODES, create_engine, empty_result
+from .fields import field_text, is_valid, resolve_field, tesseract_config
+from .layout import LayoutCache, reconstruct_layout
+from .monitors import MonitorLayout, monitor_region
+from .pipeline import ReadingPipeline
+from .preprocess import is_dark_background, is_valid_profile, preprocess, resolve_profile
+from .video import VideoSampler
+from .windows import WindowLocator
+
+
+# Tesseract settings for single text lines (page segmentation mode 7)
+LINE_TESSERACT_CONFIG = '--oem 3 --psm 7'
+
+# Line crops shorter than this many pixels are upscaled before single-line OCR
+LINE_TEXT_HEIGHT = 32
+
+
+class ScreenReader:
+    """
+    A comprehensive computer vision model for reading screen content.
+    Combines screen capture with multiple OCR engines for robust text extraction.
+    """
+
+    def __init__(self, use_easyocr: bool = True, use_tesseract: bool = True,
+                 preprocessing_profile: str = "default", layout_cache: bool = False,
+                 easyocr_mode: str = "default", easyocr_threads: Optional[int] = None,
+                 easyocr_interop_threads: Optional[int] = None, capture_backend: str = "scrot",
+                 capture_options: Optional[Dict] = None):
+        """
+        Initialize the screen reader with OCR engines.
+
+        Args:
+            use_easyocr: Whether to use EasyOCR engine
+            use_tesseract: Whether to use Tesseract OCR engine
+            preprocessing_profile: Default preprocessing profile name, or "auto"
+            layout_cache: Whether to memoize line layouts of recurring screens
+            easyocr_mode: EasyOCR CPU inference mode (default, fp32, int8 or onnx)
+            easyocr_threads: Intra-op threads for EasyOCR inference
+            easyocr_interop_threads: Inter-op threads for EasyOCR inference
+            capture_backend: Name of a registered screen capture backend
+            capture_options: Keyword arguments for the capture backend, e.g.
+                {"path": "session.frames"} for "record" and "replay"
+        """
+        if not is_valid_profile(preprocessing_profile):
+            raise ValueError(f"Unknown preprocessing profile: {preprocessing_profile}")
+
+        if easyocr_mode not in EASYOCR_MODES:
+            raise ValueError(f"Unknown EasyOCR mode '{easyocr_mode}'. Available: {', '.join(EASYOCR_MODES)}")
+
+        self.use_easyocr = use_easyocr and EASYOCR_AVAILABLE
+        self.use_tesseract = use_tesseract
+        self.preprocessing_profile = preprocessing_profile
+        self.layout_cache = LayoutCache() if layout_cache else None
+        self.easyocr_mode = easyocr_mode
+        self.capture_backend = create_capture_backend(capture_backend, **(capture_options or {}))
+        self.tesseract_engine = None
+        self.easyocr_engine = None
+        # Normalized query -> screen-coordinate line box where find_text last saw it
+        self._last_found = OrderedDict()
+        self._last_found_lock = threading.Lock()
+        # Single-line Tesseract engine for read_at_pointer, created on first use
+        self._line_engine = None
+        # Constrained Tesseract engines for read_fields, one per config (least recently used evicted)
+        self._field_engines = OrderedDict()
+        self._field_engines_lock = threading.Lock()
+        # X11 window lookup for read_window; geometry is cached for a couple of seconds
+        self.windows = WindowLocator()
+        self.monitors = MonitorLayout()
+
+        if use_easyocr and not EASYOCR_AVAILABLE:
+            print("Warning: EasyOCR requested but not available. Install with: pip install easyocr")
+            print("Falling back to Tesseract-only mode.")
+
+        if self.use_easyocr:
+            print("Initializing EasyOCR...")
+            self.easyocr_engine = create_engine("easyocr", mode=easyocr_mode, threads=easyocr_threads,
+                                                interop_threads=easyocr_interop_threads)
+
+        if self.use_tesseract:
+            self.tesseract_engine = create_engine("tesseract")
+            print("Tesseract OCR ready")
+
+    @property
+    def easyocr_reader(self):
+        """The underlying easyocr.Reader, or None when EasyOCR is disabled."""
+        return self.easyocr_engine.reader if self.easyocr_engine is not None else None
+
+    def capture_screen(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Capture screen or specific region with the configured capture backend.
+
+        Args:
+            region: Tuple of (x, y, width, height) for specific region capture
+
+        Returns:
+            Captured image as numpy array
+        """
+        return self.capture_backend.capture(region)
+
+    def _create_test_image(self) -> np.ndarray:
+        return create_test_image()
+
+    def warm_up(self) -> Dict:
+        """
+        Exercise every enabled engine and the full pipeline on a synthetic image.
+
+        The first inference of each engine pays for lazy initialisation (torch
+        graph, Tesseract traineddata, OpenCV kernels); running it here moves
+        that cost out of the first real request.
+
+        Returns:
+            Dictionary with per-engine and pipeline timings in seconds
+        """
+        print("Warming up OCR engines...")
+        start_time = time.time()
+        image = self._create_test_image()
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        processed_image = self.preprocess_image(gray)
+
+        engines = {}
+        if self.tesseract_engine is not None:
+            engine_start = time.time()
+            self.tesseract_engine.extract(processed_image)
+            engines["tesseract"] = {"seconds": time.time() - engine_start, "config": self.tesseract_engine.config}
+            engine_start = time.time()
+            self._get_line_engine().extract(gray[20:70, :])
+            engines["tesseract_line"] = {"seconds": time.time() - engine_start, "config": self._line_engine.config}
+        if self.easyocr_engine is not None:
+            engine_start = time.time()
+            self.easyocr_engine.extract(gray)
+            engines["easyocr"] = {"seconds": time.time() - engine_start, "mode": self.easyocr_mode,
+                                  "languages": list(self.easyocr_engine.languages)}
+
+        pipeline_start = time.time()
+        result = self.process_uploaded_image(image)
+        pipeline_time = time.time() - pipeline_start
+
+        total_time = time.time() - start_time
+        print(f"Warm-up completed in {total_time:.2f} seconds")
+        return {
+            "engines": engines,
+            "pipeline_seconds": pipeline_time,
+            "total_seconds": total_time,
+            "words_found": len(result.get("bounding_boxes", [])),
+        }
+
+    def preprocess_image(self, image: np.ndarray, profile: Optional[str] = None,
+                         contrast: float = 1.0, brightness: float = 1.0,
+                         noise_reduction: bool = False) -> np.ndarray:
+        """
+        Preprocess image for better OCR accuracy.
+
+        Args:
+            image: Input image as numpy array
+            profile: Preprocessing profile name or "auto" (defaults to the reader's profile)
+            contrast: Contrast factor applied before the profile steps
+            brightness: Brightness factor applied before the profile steps
+            noise_reduction: Whether to median-filter before the profile steps
+
+        Returns:
+            Preprocessed image
+        """
+        if image.ndim == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+
+        profile = self.resolve_profile(gray, profile)
+
+        return preprocess(gray, profile, contrast, brightness, noise_reduction)
+
+    def resolve_profile(self, gray: np.ndarray, profile: Optional[str] = None) -> str:
+        """
+        Resolve a requested profile name, running dark-theme detection for "auto".
+
+        Args:
+            gray: Grayscale image used for auto-detection
+            profile: Requested profile (defaults to the reader's profile)
+
+        Returns:
+            Concrete profile name from PREPROCESSING_PROFILES
+        """
+        return resolve_profile(gray, profile or self.preprocessing_profile)
+
+    def _is_dark_background(self, gray: np.ndarray) -> bool:
+        return is_dark_background(gray)
+
+    def extract_text_tesseract(self, image: np.ndarray) -> Dict:
+        """
+        Extract text using Tesseract OCR.
+
+        Args:
+            image: Input image as numpy array
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        if not self.use_tesseract:
+            return empty_result()
+
+        return self.tesseract_engine.extract(image)
+
+    def extract_text_easyocr(self, image: np.ndarray) -> Dict:
+        """
+        Extract text using EasyOCR.
+
+        Args:
+            image: Input image as numpy array
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        if not self.use_easyocr:
+            return empty_result()
+
+        return self.easyocr_engine.extract(image)
+
+    def combine_results(self, tesseract_result: Dict, easyocr_result: Dict) -> Dict:
+        """
+        Combine results from multiple OCR engines for better accuracy.
+
+        Args:
+            tesseract_result: Results from Tesseract
+            easyocr_result: Results from EasyOCR
+
+        Returns:
+            Combined results (see fusion.combine_results)
+        """
+        return fusion.combine_results(tesseract_result, easyocr_result)
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return fusion.normalize_text(text)
+
+    def _fuse_boxes(self, tesseract_boxes: List[Dict], easyocr_boxes: List[Dict]) -> Tuple[List[Dict], Dict]:
+        return fusion.fuse_boxes(tesseract_boxes, easyocr_boxes)
+
+    def _remove_duplicate_boxes(self, boxes: List[Dict]) -> List[Dict]:
+        return fusion.remove_duplicate_boxes(boxes)
+
+    def _calculate_overlap(self, box1: Dict, box2: Dict) -> float:
+        return fusion.calculate_overlap(box1, box2)
+
+    def read_screen(self, region: Optional[Tuple[int, int, int, int]] = None,
+                    profile: Optional[str] = None, layout: Optional[str] = None,
+                    monitor=None) -> Dict:
+        """
+        Main method to capture and read screen content.
+
+        Args:
+            region: Optional region tuple (x, y, width, height)
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+            monitor: Optional monitor index, xrandr name, "primary", or "all" to
+                read every monitor concurrently (see read_all_monitors)
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        if monitor is not None:
+            if region is not None:
+                raise ValueError("Give either a region or a monitor, not both")
+            if monitor == "all":
+                return self.read_all_monitors(profile=profile, layout=layout)
+            selected = self.monitors.select(monitor)
+            result = self.read_screen(region=monitor_region(selected), profile=profile, layout=layout)
+            result["monitor"] = selected
+            return result
+
+        print("Capturing screen...")
+        start_time = time.time()
+
+        raw_image = self.capture_screen(region)
+
+        gray = cv2.cvtColor(raw_image, cv2.COLOR_BGR2GRAY)
+        profile = self.resolve_profile(gray, profile)
+        processed_image = self.preprocess_image(gray, profile)
+
+        final_result = self._apply_layout(self._run_engines(raw_image, processed_image, gray), layout)
+
+        processing_time = time.time() - start_time
+        final_result.update({
+            "processing_time": processing_time,
+            "image_shape": raw_image.shape,
+            "region": region,
+            "preprocessing_profile": profile,
+            "timestamp": time.time()
+        })
+
+        print(f"Screen reading completed in {processing_time:.2f} seconds")
+        return final_result
+
+    def read_region(self, x: int, y: int, width: int, height: int,
+                    profile: Optional[str] = None, layout: Optional[str] = None) -> Dict:
+        """
+        Read text from a specific screen region.
+
+        Args:
+            x: X coordinate of top-left corner
+            y: Y coordinate of top-left corner
+            width: Width of region
+            height: Height of region
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        return self.read_screen(region=(x, y, width, height), profile=profile, layout=layout)
+
+    def list_monitors(self, refresh: bool = False) -> List[Dict]:
+        """
+        List monitors (index, name, primary flag and geometry) from xrandr.
+
+        Args:
+            refresh: Re-query instead of using the cached list
+
+        Returns:
+            Monitor dictionaries; empty when monitors can't be enumerated
+        """
+        return self.monitors.list_monitors(refresh)
+
+    def stream(self, region: Optional[Tuple[int, int, int, int]] = None, profile: Optional[str] = None,
+               layout: Optional[str] = None, interval: float = 0.0, ocr_workers: int = 2) -> ReadingPipeline:
+        """
+        Read the screen continuously with capture, preprocessing and OCR overlapped.
+
+        Args:
+            region: Optional region tuple (x, y, width, height)
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+            interval: Minimum seconds between captures (0 captures back to back)
+            ocr_workers: Number of concurrent OCR threads
+
+        Returns:
+            ReadingPipeline; use it as a context manager and iterate for results
+        """
+        return ReadingPipeline(self, region=region, profile=profile, layout=layout,
+                               interval=interval, ocr_workers=ocr_workers)
+
+    def read_all_monitors(self, profile: Optional[str] = None, layout: Optional[str] = None) -> Dict:
+        """
+        Capture and OCR every monitor concurrently.
+
+        Each monitor is read as its own region, so the dead space a multi-head
+        virtual desktop has between monitors of different sizes is never
+        processed. Bounding boxes are translated to global desktop coordinates
+        and tagged with their monitor's name.
+
+        Args:
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+
+        Returns:
+            Dictionary with the merged text and boxes plus per-monitor results under "monitors"
+        """
+        monitors = self.list_monitors()
+        if not monitors:
+            # Enumeration unavailable: fall back to the whole desktop as one unit
+            return self.read_screen(profile=profile, layout=layout)
+
+        start_time = time.time()
+
+        def read(monitor):
+            result = self.read_screen(region=monitor_region(monitor), profile=profile, layout=layout)
+            # New dicts: the boxes may be shared with the layout cache
+            result["bounding_boxes"] = [dict(box, x=box['x'] + monitor["x"], y=box['y'] + monitor["y"],
+                                             monitor=monitor["name"])
+                                        for box in result["bounding_boxes"]]
+            result["monitor"] = monitor
+            return result
+
+        if len(monitors) > 1:
+            with ThreadPoolExecutor(max_workers=len(monitors)) as executor:
+                monitor_results = list(executor.map(read, monitors))
+        else:
+            monitor_results = [read(monitors[0])]
+
+        texts = [r["text"] for r in monitor_results if r["text"]]
+        confidences = [r["confidence"] for r in monitor_results if r["text"]]
+        processing_time = time.time() - start_time
+        print(f"Read {len(monitors)} monitors in {processing_time:.2f} seconds")
+
+        return {
+            "text": "\n\n".join(texts),
+            "confidence": np.mean(confidences) if confidences else 0,
+            "bounding_boxes": [box for r in monitor_results for box in r["bounding_boxes"]],
+            "monitors": monitor_results,
+            "processing_time": processing_time,
+            "region": None,
+            "timestamp": time.time()
+        }
+
+    def list_windows(self, refresh: bool = False) -> List[Dict]:
+        """
+        List X11 windows (title, WM_CLASS, ID and geometry) that read_window can target.
+
+        Args:
+            refresh: Re-enumerate instead of using the cached listing
+
+        Returns:
+            Window dictionaries in bottom-to-top stacking order
+        """
+        return self.windows.list_windows(refresh)
+
+    def read_window(self, title: Optional[str] = None, wm_class: Optional[str] = None,
+                    window_id=None, profile: Optional[str] = None, layout: Optional[str] = None) -> Dict:
+        """
+        Read the on-screen part of a single application window.
+
+        Args:
+            title: Part of the window title (case-insensitive)
+            wm_class: WM_CLASS class or instance name
+            window_id: X window ID (int, or "0x..." string)
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+
+        Returns:
+            Dictionary with extracted text and metadata, including the matched window.
+            Bounding boxes are relative to the captured region (see "region").
+        """
+        window = self.windows.find(title=title, wm_class=wm_class, window_id=window_id)
+        if window is None:
+            raise LookupError("No window matches the given title, class or ID")
+        region = self.windows.visible_region(window)
+        if region is None:
+            raise LookupError(f"Window {window['id']:#x} is entirely off-screen")
+
+        result = self.read_screen(region=region, profile=profile, layout=layout)
+        screen_width, screen_height = self.windows.screen_size()
+        result["window"] = dict(window, id_hex=f"{window['id']:#x}")
+        result["window_pixel_fraction"] = region[2] * region[3] / float(screen_width * screen_height)
+        return result
+
+    def find_text(self, query: str, region: Optional[Tuple[int, int, int, int]] = None,
+                  fuzzy: bool = False, min_similarity: float = 0.8, min_confidence: float = 60.0,
+                  profile: Optional[str] = None, batch_size: int = 8) -> Dict:
+        """
+        Locate a text label on screen, stopping at the first confident match.
+
+        Candidate lines are searched in priority order - the line where the query
+        was last found, then lines proposed by a cheap morphological pass in
+        reading order - and recognized batch_size at a time without running text
+        detection. The search ends as soon as a line contains the query.
+
+        Args:
+            query: Text to look for
+            region: Optional (x, y, width, height) screen region to search
+            fuzzy: Accept approximate matches (OCR noise, small typos)
+            min_similarity: Lowest similarity (0-1) accepted when fuzzy is set
+            min_confidence: Lowest mean OCR confidence (0-100) of the matched words
+            profile: Optional preprocessing profile override
+            batch_size: Candidate lines recognized per OCR call
+
+        Returns:
+            Dictionary with "found" and, when found, the match text and screen coordinates
+        """
+        key = fusion.normalize_text(query)
+        if not key:
+            raise ValueError("Query must contain non-whitespace characters")
+        if self.tesseract_engine is None and self.easyocr_engine is None:
+            raise RuntimeError("No OCR engine is enabled")
+
+        start_time = time.time()
+        image = self.capture_screen(region)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        profile = self.resolve_profile(gray, profile)
+        processed_image = self.preprocess_image(gray, profile)
+        offset_x, offset_y = (region[0], region[1]) if region else (0, 0)
+
+        candidates = [r for r in search.propose_text_regions(gray) if search.could_contain(r, query)]
+        total = len(candidates)
+        batches = []
+
+        with self._last_found_lock:
+            last = self._last_found.get(key)
+        if last is not None:
+            try:
+                x, y, width, height = self._clip_roi(image, (last['x'] - offset_x, last['y'] - offset_y,
+                                                             last['width'], last['height']))
+                known = {'x': x, 'y': y, 'width': width, 'height': height}
+                batches.append([known])
+                candidates = [r for r in candidates if not search.overlaps(r, known)]
+                total = len(candidates) + 1
+            except ValueError:
+                pass  # Last position lies outside the searched region
+        batches.extend(candidates[i:i + batch_size] for i in range(0, len(candidates), max(1, batch_size)))
+
+        searched = 0
+        match = None
+        for lines in batches:
+            searched += len(lines)
+            for line, words in zip(lines, self._recognize_candidate_lines(gray, processed_image, lines)):
+                words = sorted(words, key=lambda w: w['x'])
+                found = search.match_words(query, words, fuzzy, min_similarity)
+                if found is None:
+                    continue
+                similarity, first, last_word = found
+                matched = words[first:last_word]
+                confidence = float(np.mean([w['confidence'] for w in matched]))
+                if confidence < min_confidence:
+                    continue
+                box = search.union_box(matched)
+                match = {
+                    "text": ' '.join(w['text'] for w in matched),
+                    "x": box['x'] + offset_x,
+                    "y": box['y'] + offset_y,
+                    "width": box['width'],
+                    "height": box['height'],
+                    "confidence": confidence,
+                    "similarity": similarity
+                }
+                with self._last_found_lock:
+                    self._last_found[key] = dict(line, x=line['x'] + offset_x, y=line['y'] + offset_y)
+                    self._last_found.move_to_end(key)
+                    while len(self._last_found) > 256:
+                        self._last_found.popitem(last=False)
+                break
+            if match is not None:
+                break
+
+        processing_time = time.time() - start_time
+        print(f"find_text {'matched' if match else 'did not match'} '{query}' after {searched}/{total} "
+              f"candidate lines in {processing_time:.2f} seconds")
+        return {
+            "query": query,
+            "found": match is not None,
+            "match": match,
+            "candidates_searched": searched,
+            "candidates_total": total,
+            "processing_time": processing_time,
+            "region": region,
+            "preprocessing_profile": profile,
+            "timestamp": time.time(),
+            "source": "find_text"
+        }
+
+    def _get_line_engine(self):
+        if self._line_engine is None:
+            self._line_engine = create_engine("tesseract", config=LINE_TESSERACT_CONFIG)
+        return self._line_engine
+
+    def read_at_pointer(self, x: Optional[int] = None, y: Optional[int] = None,
+                        window: Tuple[int, int] = (360, 48), max_window: Tuple[int, int] = (1920, 192)) -> Dict:
+        """
+        Read the text line under the mouse pointer with as little work as possible.
+
+        Only a small window around the pointer is captured. The line under the
+        pointer is found with a connected-component scan; while it runs into the
+        window's edge the window is enlarged, so the whole line is read. The line
+        is then recognized directly - single-line Tesseract (psm 7) or EasyOCR's
+        recognizer without its detector - skipping the preprocessing profiles and
+        the engine fusion of a full read.
+
+        Args:
+            x: Pointer x coordinate (defaults to the current pointer position)
+            y: Pointer y coordinate (defaults to the current pointer position)
+            window: Initial (width, height) of the captured window
+            max_window: Largest (width, height) the window may grow to
+
+        Returns:
+            Dictionary with the line text, word boxes in screen coordinates and the word under the pointer
+        """
+        if self.tesseract_engine is None and self.easyocr_engine is None:
+            raise RuntimeError("No OCR engine is enabled")
+        start_time = time.time()
+        if x is None or y is None:
+            x, y = pointer_position()
+
+        width, height = window
+        while True:
+            left, top = max(0, x - width // 2), max(0, y - height // 2)
+            image = self.capture_screen((left, top, width, height))
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Backends may return a smaller (clipped) image than requested
+            local_x = min(x - left, gray.shape[1] - 1)
+            local_y = min(y - top, gray.shape[0] - 1)
+            line = search.region_at_point(search.propose_text_regions(gray, max_height_ratio=0.9),
+                                          local_x, local_y)
+            if line is None:
+                break
+            # Lines within the proposal padding of an edge may continue past it
+            margin = 2 * search.REGION_PADDING
+            touches_sides = line['x'] <= margin or line['x'] + line['width'] >= gray.shape[1] - margin
+            touches_ends = line['y'] <= margin or line['y'] + line['height'] >= gray.shape[0] - margin
+            can_widen = touches_sides and width < max_window[0] and gray.shape[1] == width
+            can_heighten = touches_ends and height < max_window[1] and gray.shape[0] == height
+            if not (can_widen or can_heighten):
+                break
+            if can_widen:
+                width = min(max_window[0], width * 2)
+            if can_heighten:
+                height = min(max_window[1], int(height * 1.5))
+
+        words = []
+        engine = None
+        if line is not None:
+            if self.tesseract_engine is not None:
+                engine = "tesseract"
+                words = self._read_line_tesseract(gray, line)
+            else:
+                engine = "easyocr"
+                words = self.easyocr_engine.recognize_lines(gray, [line])[0]
+
+        for word in words:
+            word['x'] += left
+            word['y'] += top
+        words.sort(key=lambda w: w['x'])
+
+        under_pointer = search.region_at_point(words, x, y, max_distance=float('inf')) if words else None
+        processing_time = time.time() - start_time
+        print(f"Pointer read completed in {processing_time * 1000:.0f} ms")
+        return {
+            "text": ' '.join(w['text'] for w in words),
+            "confidence": float(np.mean([w['confidence'] for w in words])) if words else 0,
+            "bounding_boxes": words,
+            "word": under_pointer,
+            "pointer": {"x": x, "y": y},
+            "line": dict(line, x=line['x'] + left, y=line['y'] + top) if line is not None else None,
+            "window": {"x": left, "y": top, "width": gray.shape[1], "height": gray.shape[0]},
+            "engine": engine,
+            "processing_time": processing_time,
+            "timestamp": time.time(),
+            "source": "pointer"
+        }
+
+    def _read_line_tesseract(self, gray: np.ndarray, line: Dict, engine=None) -> List[Dict]:
+        """
+        Recognize one line crop with single-line Tesseract (or the given engine).
+
+        Light-on-dark crops are inverted and small text is upscaled; that is all
+        the preprocessing the pointer and field paths do.
+        """
+        crop = gray[line['y']:line['y'] + line['height'], line['x']:line['x'] + line['width']]
+        if is_dark_background(crop):
+            crop = cv2.bitwise_not(crop)
+        scale = max(1.0, LINE_TEXT_HEIGHT / max(1, crop.shape[0]))
+        if scale > 1.0:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+        words = (engine or self._get_line_engine()).extract(crop)["bounding_boxes"]
+        return [dict(w, x=line['x'] + int(w['x'] / scale), y=line['y'] + int(w['y'] / scale),
+                     width=int(w['width'] / scale), height=int(w['height'] / scale)) for w in words]
+
+    def _get_field_engine(self, config: str):
+        with self._field_engines_lock:
+            engine = self._field_engines.get(config)
+            if engine is None:
+                engine = self._field_engines[config] = create_engine("tesseract", config=config)
+                # Configs come from client allowlists, so keep only a bounded number
+                while len(self._field_engines) > 32:
+                    self._field_engines.popitem(last=False)
+            self._field_engines.move_to_end(config)
+            return engine
+
+    def read_fields(self, fields: List[Dict], image: Optional[np.ndarray] = None) -> Dict:
+        """
+        Read small fields of known types, such as counters, clocks or codes.
+
+        Each field is a pre-cropped box, so no text detection runs: Tesseract
+        reads it with the type's page segmentation mode and character allowlist
+        (EasyOCR, when Tesseract is disabled, runs only its recognizer with the
+        allowlist). Without an image, only the area spanning all fields is
+        captured, once. Fields are recognized concurrently.
+
+        Args:
+            fields: Field dictionaries with x, y, width, height and optionally
+                name, type (see FIELD_TYPES; default "line"), allowlist and psm
+            image: Optional image to read from instead of capturing the screen
+
+        Returns:
+            Dictionary with per-field results under "fields" (text, confidence,
+            valid - whether the text matches the type's pattern) plus merged text
+        """
+        if not fields:
+            raise ValueError("Give at least one field")
+        start_time = time.time()
+        specs = [resolve_field(f.get("type") or "line", f.get("allowlist"), f.get("psm")) for f in fields]
+
+        offset_x, offset_y = 0, 0
+        if image is None:
+            x0 = min(f["x"] for f in fields)
+            y0 = min(f["y"] for f in fields)
+            x1 = max(f["x"] + f["width"] for f in fields)
+            y1 = max(f["y"] + f["height"] for f in fields)
+            image = self.capture_screen((x0, y0, x1 - x0, y1 - y0))
+            offset_x, offset_y = x0, y0
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        def read(index):
+            field, spec = fields[index], specs[index]
+            x, y, width, height = self._clip_roi(gray, (field["x"] - offset_x, field["y"] - offset_y,
+                                                        field["width"], field["height"]))
+            line = {'x': x, 'y': y, 'width': width, 'height': height}
+            if self.tesseract_engine is not None:
+                words = self._read_line_tesseract(gray, line, self._get_field_engine(tesseract_config(spec)))
+            else:
+                words = self.easyocr_engine.recognize_lines(gray, [line], allowlist=spec["allowlist"])[0]
+            words = [dict(w, x=w['x'] + offset_x, y=w['y'] + offset_y) for w in words]
+            text = field_text(words, spec)
+            return {
+                "name": field.get("name") or str(index),
+                "type": spec["type"],
+                "text": text,
+                "confidence": float(np.mean([w['confidence'] for w in words])) if words else 0,
+                "valid": is_valid(text, spec),
+                "x": x + offset_x,
+                "y": y + offset_y,
+                "width": width,
+                "height": height,
+                "bounding_boxes": words
+            }
+
+        workers = min(len(fields), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                field_results = list(executor.map(read, range(len(fields))))
+        else:
+            field_results = [read(index) for index in range(len(fields))]
+
+        filled = [r for r in field_results if r["text"]]
+        return {
+            "text": "\n".join(r["text"] for r in filled),
+            "confidence": np.mean([r["confidence"] for r in filled]) if filled else 0,
+            "bounding_boxes": [box for r in field_results for box in r["bounding_boxes"]],
+            "fields": field_results,
+            "processing_time": time.time() - start_time,
+            "image_shape": image.shape,
+            "timestamp": time.time(),
+            "source": "fields"
+        }
+
+    def read_field(self, x: int, y: int, width: int, height: int, field_type: str = "line",
+                   allowlist: Optional[str] = None, psm: Optional[int] = None) -> Dict:
+        """
+        Read one field of a known type (see read_fields).
+
+        Args:
+            x: X coordinate of top-left corner
+            y: Y coordinate of top-left corner
+            width: Width of the field
+            height: Height of the field
+            field_type: Name from FIELD_TYPES, e.g. "digits", "number", "time" or "code"
+            allowlist: Optional characters the recognizer may output, overriding the type's
+            psm: Optional Tesseract page segmentation mode overriding the type's
+
+        Returns:
+            Field result with text, confidence, valid and processing_time
+        """
+        result = self.read_fields([{"x": x, "y": y, "width": width, "height": height,
+                                    "type": field_type, "allowlist": allowlist, "psm": psm}])
+        return dict(result["fields"][0], processing_time=result["processing_time"])
+
+    def _recognize_candidate_lines(self, gray: np.ndarray, processed_image: np.ndarray,
+                                   lines: List[Dict]) -> List[List[Dict]]:
+        """Recognize line boxes with the fastest enabled engine."""
+        if self.tesseract_engine is not None:
+            return self.tesseract_engine.recognize_lines(processed_image, lines)
+        return self.easyocr_engine.recognize_lines(gray, lines)
+
+    def _run_engines(self, image: np.ndarray, processed_image: np.ndarray,
+                     gray: Optional[np.ndarray] = None) -> Dict:
+        """
+        Run the enabled OCR engines and combine their results.
+
+        Args:
+            image: Original BGR image (used by EasyOCR)
+            processed_image: Preprocessed image (used by Tesseract)
+            gray: Optional grayscale image; enables the layout cache when it is configured
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        if self.layout_cache is not None and gray is not None:
+            entry = self.layout_cache.lookup(gray)
+            if entry is not None:
+                return self._read_cached_layout(entry, gray, processed_image)
+
+        result = self._run_detection_engines(image, processed_image)
+
+        if self.layout_cache is not None and gray is not None and result["bounding_boxes"]:
+            self.layout_cache.store(gray, result["bounding_boxes"])
+
+        return result
+
+    def _run_detection_engines(self, image: np.ndarray, processed_image: np.ndarray) -> Dict:
+        """
+        Run full detection and recognition with the enabled OCR engines.
+
+        Args:
+            image: Original BGR image (used by EasyOCR)
+            processed_image: Preprocessed image (used by Tesseract)
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        results = []
+
+        if self.use_tesseract:
+            print("Extracting text with Tesseract...")
+            tesseract_result = self.extract_text_tesseract(processed_image)
+            results.append(tesseract_result)
+
+        if self.use_easyocr:
+            print("Extracting text with EasyOCR...")
+            easyocr_result = self.extract_text_easyocr(image)
+            results.append(easyocr_result)
+
+        if len(results) == 2:
+            return self.combine_results(results[0], results[1])
+        elif len(results) == 1:
+            return results[0]
+        else:
+            return empty_result()
+
+    def _read_cached_layout(self, entry: Dict, gray: np.ndarray, processed_image: np.ndarray) -> Dict:
+        """
+        Read a frame whose layout is already known: unchanged lines come from the
+        cache, changed lines are recognized without running text detection.
+
+        Args:
+            entry: Layout cache entry for this screen
+            gray: Grayscale frame
+            processed_image: Preprocessed frame (used by Tesseract)
+
+        Returns:
+            Dictionary with extracted text and metadata
+        """
+        # The entry is shared with concurrent readers: work on copies of its lines
+        # and swap the new list in afterwards instead of updating it in place
+        lines = [dict(line) for line in entry['lines']]
+        changed = []
+
+        for line in lines:
+            signature = self.layout_cache.line_signature(gray, line)
+            difference = float(np.mean(np.abs(signature - line['signature'])))
+            if difference > self.layout_cache.signature_tolerance:
+                changed.append(line)
+
+        if changed:
+            if self.use_tesseract:
+                recognized = self._recognize_lines_tesseract(processed_image, changed)
+            else:
+                recognized = self._recognize_lines_easyocr(gray, changed)
+
+            for line, words in zip(changed, recognized):
+                # Keep the recorded geometry; only the content of the line changed
+                line['words'] = words
+                line['text'] = ' '.join(w['text'] for w in words)
+                line['confidence'] = float(np.mean([w['confidence'] for w in words])) if words else 0.0
+                line['signature'] = self.layout_cache.line_signature(gray, line)
+            self.layout_cache.update_lines(entry, lines)
+
+        texts = [line['text'] for line in lines if line['text']]
+        confidences = [line['confidence'] for line in lines if line['text']]
+
+        return {
+            "text": ' '.join(texts),
+            "confidence": np.mean(confidences) if confidences else 0,
+            "bounding_boxes": [dict(word) for line in lines for word in line['words']],
+            "engine": "layout_cache",
+            "layout_cache": {
+                "hit": True,
+                "lines": len(lines),
+                "reused_lines": len(lines) - len(changed),
+                "recognized_lines": len(changed)
+            }
+        }
+
+    def _recognize_lines_tesseract(self, processed_image: np.ndarray, lines: List[Dict]) -> List[List[Dict]]:
+        return self.tesseract_engine.recognize_lines(processed_image, lines)
+
+    def _recognize_lines_easyocr(self, gray: np.ndarray, lines: List[Dict]) -> List[List[Dict]]:
+        return self.easyocr_engine.recognize_lines(gray, lines)
+
+    def _apply_layout(self, result: Dict, layout: Optional[str]) -> Dict:
+        """
+        Replace a flat OCR result with reading-order layout output.
+
+        For "lines" and "blocks" the word list is dropped and bounding_boxes holds
+        line or block boxes instead; "full" keeps the words alongside the structure.
+
+        Args:
+            result: Result dictionary with word-level bounding_boxes
+            layout: None (unchanged), "lines", "blocks" or "full"
+
+        Returns:
+            The updated result dictionary
+        """
+        if not layout:
+            return result
+
+        structure = reconstruct_layout(result["bounding_boxes"], layout)
+        result.update(structure)
+        result["layout"] = layout
+
+        if layout == "lines":
+            result["bounding_boxes"] = structure["lines"]
+        elif layout == "blocks":
+            result["bounding_boxes"] = [{k: v for k, v in b.items() if k != 'lines'} for b in structure["blocks"]]
+
+        return result
+
+    def process_uploaded_image(self, image: np.ndarray, profile: Optional[str] = None,
+                               contrast: float = 1.0, brightness: float = 1.0,
+                               noise_reduction: bool = False,
+                               rois: Optional[List[Tuple[int, int, int, int]]] = None,
+                               layout: Optional[str] = None) -> Dict:
+        """
+        Process an uploaded image through the OCR pipeline.
+
+        Args:
+            image: Uploaded image as numpy array
+            profile: Optional preprocessing profile override
+            contrast: Contrast factor for preprocessing
+            brightness: Brightness factor for preprocessing
+            noise_reduction: Whether to apply noise reduction during preprocessing
+            rois: Optional list of (x, y, width, height) regions; only these are OCR'd
+            layout: Optional layout output level ("lines", "blocks" or "full")
+
+        Returns:
+            Dictionary with extracted text and metadata; with rois, preprocessing_profile
+            is "mixed" when the regions resolved different profiles
+        """
+        print("Processing uploaded image...")
+        start_time = time.time()
+
+        if rois:
+            final_result = self._process_rois(image, rois, profile, contrast, brightness, noise_reduction)
+            # Each region resolves its own profile; report it when they agree
+            profiles = {region["preprocessing_profile"] for region in final_result["regions"]}
+            profile = profiles.pop() if len(profiles) == 1 else "mixed"
+        else:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            profile = self.resolve_profile(gray, profile)
+            processed_image = self.preprocess_image(gray, profile, contrast, brightness, noise_reduction)
+            final_result = self._run_engines(image, processed_image, gray)
+
+        final_result = self._apply_layout(final_result, layout)
+
+        processing_time = time.time() - start_time
+        final_result.update({
+            "processing_time": processing_time,
+            "image_shape": image.shape,
+            "region": None,
+            "preprocessing_profile": profile,
+            "timestamp": time.time(),
+            "source": "uploaded_image"
+        })
+
+        print(f"Image processing completed in {processing_time:.2f} seconds")
+        return final_result
+
+    def iter_progressive(self, image: np.ndarray, profile: Optional[str] = None,
+                         contrast: float = 1.0, brightness: float = 1.0, noise_reduction: bool = False,
+                         layout: Optional[str] = None, region: Optional[Tuple[int, int, int, int]] = None,
+                         source: str = "uploaded_image") -> Iterator[Dict]:
+        """
+        Process an image, yielding Tesseract's result before the merged one.
+
+        With both engines enabled, EasyOCR runs on a worker thread while
+        Tesseract runs on the caller's; Tesseract's result is yielded as soon as
+        it is ready (stage "partial"), followed by the fused result once EasyOCR
+        finishes (stage "final"). With a single engine only the final result is
+        yielded. The layout cache is not consulted.
+
+        Args:
+            image: Image as numpy array
+            profile: Optional preprocessing profile override
+            contrast: Contrast factor for preprocessing
+            brightness: Brightness factor for preprocessing
+            noise_reduction: Whether to apply noise reduction during preprocessing
+            layout: Optional layout output level ("lines", "blocks" or "full")
+            region: Screen region the image was captured from, for the metadata
+            source: Source label added to each result
+
+        Yields:
+            Result dictionaries with "stage" ("partial" or "final") and "final" flags
+        """
+        start_time = time.time()
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        profile = self.resolve_profile(gray, profile)
+        processed_image = self.preprocess_image(gray, profile, contrast, brightness, noise_reduction)
+
+        def finish(result, stage):
+            result = self._apply_layout(result, layout)
+            result.update({
+                "stage": stage,
+                "final": stage == "final",
+                "processing_time": time.time() - start_time,
+                "image_shape": image.shape,
+                "region": region,
+                "preprocessing_profile": profile,
+                "timestamp": time.time(),
+                "source": source
+            })
+            return result
+
+        if not (self.use_tesseract and self.use_easyocr):
+            yield finish(self._run_detection_engines(image, processed_image), "final")
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            easyocr_future = executor.submit(self.extract_text_easyocr, image)
+            tesseract_result = self.extract_text_tesseract(processed_image)
+            partial = dict(tesseract_result, bounding_boxes=[dict(b) for b in tesseract_result["bounding_boxes"]])
+            yield finish(partial, "partial")
+            yield finish(self.combine_results(tesseract_result, easyocr_future.result()), "final")
+
+    def read_screen_progressive(self, region: Optional[Tuple[int, int, int, int]] = None,
+                                profile: Optional[str] = None, layout: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Capture the screen and yield Tesseract's result before the merged one (see iter_progressive).
+
+        Args:
+            region: Optional region tuple (x, y, width, height)
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level ("lines", "blocks" or "full")
+
+        Yields:
+            Partial and final result dictionaries
+        """
+        raw_image = self.capture_screen(region)
+        yield from self.iter_progressive(raw_image, profile=profile, layout=layout, region=region,
+                                         source="region" if region else "screen")
+
+    def process_video(self, path: str, profile: Optional[str] = None, layout: Optional[str] = None,
+                      min_interval: float = 0.5, max_interval: float = 4.0,
+                      workers: Optional[int] = None) -> Dict:
+        """
+        Extract a timestamped text timeline from a video or screen recording.
+
+        Frames are sampled adaptively and deduplicated (see VideoSampler); each
+        distinct screen is OCR'd once, in parallel with decoding, and screens that
+        reappear reuse their earlier result.
+
+        Args:
+            path: Video file path (any format cv2.VideoCapture can decode)
+            profile: Optional preprocessing profile override
+            layout: Optional layout output level for each screen
+            min_interval: Sampling interval in seconds after a screen change
+            max_interval: Longest sampling interval on an unchanged screen
+            workers: OCR worker threads (defaults to the CPU count)
+
+        Returns:
+            Dictionary with the text timeline, the distinct screens and sampling statistics
+        """
+        print(f"Processing video {path}...")
+        start_time = time.time()
+
+        sampler = VideoSampler(path, min_interval, max_interval)
+        workers = workers or os.cpu_count() or 1
+        segments = []
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for keyframe in sampler:
+                if segments:
+                    segments[-1]["end"] = keyframe["timestamp"]
+                segments.append({"start": keyframe["timestamp"], "end": None,
+                                 "screen": keyframe["screen"], "frame_index": keyframe["frame_index"]})
+
+                if keyframe["new"]:
+                    # Bound the frames held in memory while OCR catches up with decoding
+                    if len(pending) >= 2 * workers:
+                        _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    future = executor.submit(self._read_keyframe, keyframe["image"], profile, layout)
+                    futures[keyframe["screen"]] = future
+                    pending.add(future)
+
+            screen_results = {screen: future.result() for screen, future in futures.items()}
+
+        if segments:
+            segments[-1]["end"] = sampler.duration
+
+        screens = []
+        for screen, result in sorted(screen_results.items()):
+            first = next(s for s in segments if s["screen"] == screen)
+            result.update({"screen": screen, "first_seen": first["start"], "frame_index": first["frame_index"]})
+            screens.append(result)
+
+        timeline = []
+        for segment in segments:
+            result = screen_results[segment["screen"]]
+            if timeline and timeline[-1]["text"] == result["text"]:
+                # Visually different frames that read the same extend the previous entry
+                timeline[-1]["end"] = segment["end"]
+                continue
+            timeline.append({
+                "start": segment["start"],
+                "end": segment["end"],
+                "text": result["text"],
+                "confidence": result["confidence"],
+                "screen": segment["screen"],
+                "frame_index": segment["frame_index"]
+            })
+
+        texts = [entry["text"] for entry in timeline if entry["text"]]
+        confidences = [s["confidence"] for s in screens if s["text"]]
+
+        processing_time = time.time() - start_time
+        final_result = {
+            "text": "\n".join(texts),
+            "confidence": np.mean(confidences) if confidences else 0,
+            "bounding_boxes": [],
+            "timeline": timeline,
+            "screens": screens,
+            "video": {
+                "duration": sampler.duration,
+                "fps": sampler.fps,
+                "frames": sampler.frames,
+                "sampled_frames": sampler.sampled_frames,
+                "keyframes": len(segments),
+                "distinct_screens": len(screens)
+            },
+            "processing_time": processing_time,
+            "image_shape": sampler.frame_shape,
+            "region": None,
+            "preprocessing_profile": profile or self.preprocessing_profile,
+            "timestamp": time.time(),
+            "source": "video"
+        }
+
+        print(f"Video processing completed in {processing_time:.2f} seconds "
+              f"({len(screens)} distinct screens from {sampler.sampled_frames} sampled frames)")
+        return final_result
+
+    def _read_keyframe(self, image: np.ndarray, profile: Optional[str], layout: Optional[str]) -> Dict:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        frame_profile = self.resolve_profile(gray, profile)
+        processed = self.preprocess_image(gray, frame_profile)
+        result = self._apply_layout(self._run_engines(image, processed, gray), layout)
+        result["preprocessing_profile"] = frame_profile
+        return result
+
+    def iter_document(self, path: str, profile: Optional[str] = None, contrast: float = 1.0,
+                      brightness: float = 1.0, noise_reduction: bool = False,
+                      layout: Optional[str] = None, dpi: int = DEFAULT_PDF_DPI,
+                      workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        OCR the pages of a multi-page TIFF or PDF, yielding results page by page.
+
+        Pages are decoded lazily and OCR'd on a thread pool; at most twice the
+        worker count are decoded ahead of the page being yielded, so memory stays
+        bounded regardless of document size. Results are yielded in page order.
+
+        Args:
+            path: PDF, TIFF or single-page image file
+            profile: Optional preprocessing profile override
+            contrast: Contrast factor for preprocessing
+            brightness: Brightness factor for preprocessing
+            noise_reduction: Whether to apply noise reduction during preprocessing
+            layout: Optional layout output level ("lines", "blocks" or "full")
+            dpi: Rendering resolution for PDF pages
+            workers: OCR worker threads (defaults to the CPU count)
+
+        Yields:
+            Result dictionary for each page, with its page number
+        """
+        workers = workers or os.cpu_count() or 1
+        pages = iter_pages(path, dpi)
+
+        def process(page_number, image):
+            result = self.process_uploaded_image(image, profile=profile, contrast=contrast, brightness=brightness,
+                                                 noise_reduction=noise_reduction, layout=layout)
+            result["page"] = page_number
+            result["source"] = "document"
+            return result
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            exhausted = False
+            try:
+                while in_flight or not exhausted:
+                    while not exhausted and len(in_flight) < 2 * workers:
+                        page = next(pages, None)
+                        if page is None:
+                            exhausted = True
+                        else:
+                            in_flight.append(executor.submit(process, *page))
+                    if in_flight:
+                        yield in_flight.popleft().result()
+            finally:
+                # A consumer that stops early (or closes the generator) doesn't
+                # wait for pages that haven't started
+                for future in in_flight:
+                    future.cancel()
+
+    def process_document(self, path: str, **options) -> Dict:
+        """
+        OCR every page of a multi-page TIFF or PDF.
+
+        Args:
+            path: PDF, TIFF or single-page image file
+            **options: Passed to iter_document
+
+        Returns:
+            Dictionary with the combined text and the per-page results
+        """
+        start_time = time.time()
+        pages = list(self.iter_document(path, **options))
+
+        texts = [page["text"] for page in pages if page["text"]]
+        confidences = [page["confidence"] for page in pages if page["text"]]
+
+        return {
+            "text": "\n\n".join(texts),
+            "confidence": np.mean(confidences) if confidences else 0,
+            "bounding_boxes": [],
+            "pages": pages,
+            "page_count": len(pages),
+            "processing_time": time.time() - start_time,
+            "timestamp": time.time(),
+            "source": "document"
+        }
+
+    def _clip_roi(self, image: np.ndarray, roi: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """
+        Clip a region of interest to the image bounds.
+
+        Args:
+            image: Image the ROI refers to
+            roi: Tuple of (x, y, width, height)
+
+        Returns:
+            Clipped (x, y, width, height)
+        """
+        x, y, width, height = (int(v) for v in roi)
+        img_height, img_width = image.shape[:2]
+
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(img_width, x + width), min(img_height, y + height)
+
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"Region of interest {roi} lies outside the {img_width}x{img_height} image")
+
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _process_rois(self, image: np.ndarray, rois: List[Tuple[int, int, int, int]],
+                      profile: Optional[str], contrast: float, brightness: float,
+                      noise_reduction: bool) -> Dict:
+        """
+        OCR only the given regions of an image, in parallel.
+
+        Crops are NumPy views into the original image, so no pixels are copied
+        before preprocessing. Bounding boxes are returned in full-image coordinates.
+
+        Args:
+            image: Full image as numpy array
+            rois: List of (x, y, width, height) regions
+            profile: Optional preprocessing profile override
+            contrast: Contrast factor for preprocessing
+            brightness: Brightness factor for preprocessing
+            noise_reduction: Whether to apply noise reduction during preprocessing
+
+        Returns:
+            Dictionary with merged text, boxes and a per-region breakdown
+        """
+        clipped = [self._clip_roi(image, roi) for roi in rois]
+
+        def process(roi):
+            x, y, width, height = roi
+            crop = image[y:y + height, x:x + width]
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            roi_profile = self.resolve_profile(gray, profile)
+            processed = self.preprocess_image(gray, roi_profile, contrast, brightness, noise_reduction)
+            result = self._run_engines(crop, processed)
+
+            for box in result["bounding_boxes"]:
+                box['x'] += x
+                box['y'] += y
+
+            result["roi"] = {"x": x, "y": y, "width": width, "height": height}
+            result["preprocessing_profile"] = roi_profile
+            return result
+
+        workers = min(len(clipped), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                region_results = list(executor.map(process, clipped))
+        else:
+            region_results = [process(roi) for roi in clipped]
+
+        texts = [r["text"] for r in region_results if r["text"]]
+        confidences = [r["confidence"] for r in region_results if r["text"]]
+
+        return {
+            "text": "\n".join(texts),
+            "confidence": np.mean(confidences) if confidences else 0,
+            "bounding_boxes": [box for r in region_results for box in r["bounding_boxes"]],
+            "regions": region_results,
+            "roi_pixels": sum(w * h for _, _, w, h in clipped)
+        }
+
+    def save_debug_image(self, image: np.ndarray, filename: str = "debug_capture.png"):
+        """
+        Save captured image for debugging purposes.
+
+        Args:
+            image: Image to save
+            filename: Output filename
+        """
+        cv2.imwrite(filename, image)
+        print(f"Debug image saved as {filename}")
@@ -0,0 +1,274 @@
+"""
+Record-and-replay screen capture for reproducible performance testing.
+
+The "record" capture backend wraps another backend and appends every frame it
+captures, with its timestamp and screen region, to a frame file. The "replay"
+backend serves those frames back through read_screen, read_region or any
+monitoring loop - as fast as they are requested, or paced like the original
+session - so real workloads can be profiled without a display and without the
+silent fall-back to a generated test image.
+
+Frame file layout: an 8-byte magic and a version, then one record per frame -
+a fixed header (timestamp, region x/y, height, width, channels) followed by the
+raw BGR pixels. The file is only ever appended to, and is memory-mapped for
+replay, so a long recording is paged in on demand rather than loaded.
+
+Record a session from the command line:
+
+    python -m screenreader.recording session.frames --seconds 60 --interval 0.5
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .capture import create_capture_backend
+
+Region = Tuple[int, int, int, int]
+
+FRAME_FILE_MAGIC = b"SRFRAMES"
+FRAME_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<8sI")
+# timestamp, region x, region y, height, width, channels (padded to 32 bytes)
+_FRAME_HEADER = struct.Struct("<diiIII4x")
+
+
+class FrameRecorder:
+    """
+    Appends frames to a frame file.
+
+    Args:
+        path: Frame file path; an existing file is appended to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_FILE_HEADER.pack(FRAME_FILE_MAGIC, FRAME_FILE_VERSION))
+        self.frames = 0
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None, region: Optional[Region] = None):
+        """
+        Append a frame.
+
+        Args:
+            frame: BGR (or grayscale) uint8 image
+            timestamp: Capture time (defaults to now)
+            region: Screen region the frame shows; only its x and y are stored
+        """
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        x, y = (region[0], region[1]) if region else (0, 0)
+        header = _FRAME_HEADER.pack(time.time() if timestamp is None else timestamp, x, y, height, width, channels)
+        with self._lock:
+            self._file.write(header)
+            self._file.write(frame.data)
+            self.frames += 1
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "FrameRecorder":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameFile:
+    """
+    Read-only, memory-mapped view of a frame file.
+
+    Frames are NumPy views into the mapping; nothing is read from disk until a
+    frame's pixels are touched. A partially written last frame (for example from
+    a recording that is still running) is ignored.
+
+    Args:
+        path: Frame file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _FILE_HEADER.size:
+                raise ValueError(f"{path} is not a frame file")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = _FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != FRAME_FILE_MAGIC:
+            raise ValueError(f"{path} is not a frame file")
+        if version != FRAME_FILE_VERSION:
+            raise ValueError(f"Unsupported frame file version {version}")
+
+        # (offset of the header, timestamp, x, y, shape) per complete frame
+        self._index: List[Tuple[int, float, int, int, Tuple[int, ...]]] = []
+        offset = _FILE_HEADER.size
+        size = len(self._mmap)
+        while offset + _FRAME_HEADER.size <= size:
+            timestamp, x, y, height, width, channels = _FRAME_HEADER.unpack_from(self._mmap, offset)
+            end = offset + _FRAME_HEADER.size + height * width * channels
+            if end > size:
+                break
+            shape = (height, width, channels) if channels > 1 else (height, width)
+            self._index.append((offset, timestamp, x, y, shape))
+            offset = end
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, index: int) -> Tuple[float, Region, np.ndarray]:
+        """
+        Returns:
+            (timestamp, (x, y, width, height) of the recorded region, read-only frame view)
+        """
+        offset, timestamp, x, y, shape = self._index[index]
+        frame = np.frombuffer(self._mmap, dtype=np.uint8, count=int(np.prod(shape)),
+                              offset=offset + _FRAME_HEADER.size).reshape(shape)
+        return timestamp, (x, y, shape[1], shape[0]), frame
+
+    def __iter__(self) -> Iterator[Tuple[float, Region, np.ndarray]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def duration(self) -> float:
+        return self._index[-1][1] - self._index[0][1] if self._index else 0.0
+
+    def close(self):
+        self._mmap.close()
+
+
+class RecordingCapture:
+    """
+    Capture backend that records every frame another backend captures.
+
+    Args:
+        path: Frame file to append to
+        backend: Name of the capture backend to record from
+        **options: Passed to that backend
+    """
+
+    name = "record"
+
+    def __init__(self, path: str, backend: str = "scrot", **options):
+        self.inner = create_capture_backend(backend, **options)
+        self.recorder = FrameRecorder(path)
+
+    def capture(self, region: Optional[Region] = None) -> np.ndarray:
+        timestamp = time.time()
+        frame = self.inner.capture(region)
+        self.recorder.write(frame, timestamp, region)
+        # Flushed per frame so the file is replayable while recording continues
+        self.recorder.flush()
+        return frame
+
+
+class ReplayCapture:
+    """
+    Capture backend that plays back a frame file.
+
+    With speed=None frames are returned one per capture() call, in order, as
+    fast as they are asked for - the same sequence on every run. With a speed,
+    the recording plays in real time (scaled by speed) from the first
+    capture() call, and each call returns the frame that was on screen at that
+    moment, as a live display would; a slow reader skips frames.
+
+    Region requests are cut from the recorded frames, which are assumed to
+    cover them (record full-screen captures to replay arbitrary regions).
+    Returned frames are writable copies.
+
+    Args:
+        path: Frame file to play
+        speed: Playback speed relative to the recording (1.0 = original), or None for max speed
+        loop: Start over at the end instead of raising EOFError
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, speed: Optional[float] = None, loop: bool = False):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None for max speed)")
+        self.frames = FrameFile(path)
+        if not len(self.frames):
+            raise ValueError(f"{path} contains no frames")
+        self.speed = speed
+        self.loop = loop
+        # Frame times relative to the first frame, for paced playback
+        self._offsets = np.array([self.frames[i][0] for i in range(len(self.frames))]) - self.frames[0][0]
+        self._position = 0
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    def _next_index(self) -> int:
+        count = len(self.frames)
+        if self.speed is None:
+            index = self._position
+            self._position += 1
+        else:
+            now = time.time()
+            if self._started_at is None:
+                self._started_at = now
+            elapsed = (now - self._started_at) * self.speed
+            duration = self._offsets[-1]
+            if self.loop and duration > 0:
+                elapsed %= duration
+            if elapsed > duration:
+                index = count
+            else:
+                index = max(0, int(np.searchsorted(self._offsets, elapsed, side="right")) - 1)
+        if index >= count:
+            if not self.loop:
+                raise EOFError(f"Replay of {self.frames.path} finished after {count} frames")
+            index %= count
+        return index
+
+    def capture(self, region: Optional[Region] = None) -> np.ndarray:
+        with self._lock:
+            index = self._next_index()
+        _, (x0, y0, width, height), frame = self.frames[index]
+        if region is None:
+            return frame.copy()
+        x, y, w, h = region
+        left, top = max(0, x - x0), max(0, y - y0)
+        right, bottom = min(width, x - x0 + w), min(height, y - y0 + h)
+        if right <= left or bottom <= top:
+            raise ValueError(f"Region {region} is outside the recorded frames ({x0}, {y0}, {width}, {height})")
+        return frame[top:bottom, left:right].copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record screen captures to a frame file for replay")
+    parser.add_argument("path", help="Frame file to append to")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Recording length")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between captures")
+    parser.add_argument("--backend", default="scrot", help="Capture backend to record from")
+    args = parser.parse_args()
+
+    capture = RecordingCapture(args.path, backend=args.backend)
+    end = time.time() + args.seconds
+    try:
+        while time.time() < end:
+            start = time.time()
+            capture.capture()
+            time.sleep(max(0.0, args.interval - (time.time() - start)))
+    finally:
+        capture.recorder.close()
+    print(f"Recorded {capture.recorder.frames} frames to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
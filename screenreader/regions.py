@@ -0,0 +1,279 @@
+"""
+Shared capture for many region subscribers.
+
+Reading regions one by one costs a screen capture each. RegionHub takes one
+full-screen capture per tick and slices every subscriber's region out of it as
+a NumPy view. Overlapping subscriptions are merged into a single area that is
+OCR'd once, and the words are then handed to each subscriber whose region
+contains them, so capture cost stays constant however many regions are
+watched and shared pixels are never recognized twice. An area whose pixels
+haven't changed since the last tick reuses its previous words without OCR.
+"""
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .layout import group_boxes_into_lines
+from .video import ScreenIndex
+
+Region = Tuple[int, int, int, int]
+
+
+def _intersects(a: Region, b: Region) -> bool:
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def _union(a: Region, b: Region) -> Region:
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1, y1 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def merge_regions(regions: Dict[int, Region]) -> List[Tuple[Region, List[int]]]:
+    """
+    Merge overlapping regions into the areas that need to be OCR'd.
+
+    Args:
+        regions: Region per subscription ID
+
+    Returns:
+        (area, subscription IDs it serves) pairs; every region lies inside its area
+    """
+    areas = [(region, [key]) for key, region in regions.items()]
+    merged = True
+    while merged:
+        merged = False
+        for i, j in itertools.combinations(range(len(areas)), 2):
+            if _intersects(areas[i][0], areas[j][0]):
+                areas[i] = (_union(areas[i][0], areas[j][0]), areas[i][1] + areas[j][1])
+                del areas[j]
+                merged = True
+                break
+    return areas
+
+
+class Subscription:
+    """A subscriber's region, optional callback and most recent result."""
+
+    def __init__(self, subscription_id: int, region: Region, callback: Optional[Callable] = None):
+        self.id = subscription_id
+        self.region = region
+        self.callback = callback
+        self.result: Optional[Dict] = None
+        self.created_at = time.time()
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        x, y, width, height = self.region
+        data = {"id": self.id, "x": x, "y": y, "width": width, "height": height,
+                "created_at": self.created_at,
+                "updated_at": self.result["timestamp"] if self.result else None}
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class RegionHub:
+    """
+    Serves many region subscriptions from one capture per tick.
+
+    Call tick() yourself or start() a background loop. Each subscription's
+    latest result is available from get(); a callback, if given, is called
+    with (subscription_id, result) from the tick thread whenever the pixels of
+    the subscription's area have changed (and on its first tick).
+
+    Args:
+        reader: ScreenReader used for capture, preprocessing and OCR
+        interval: Seconds between ticks of the background loop
+        profile: Optional preprocessing profile override
+        run: Optional wrapper each tick is executed through, as run(tick) - for
+            example to take an OCR slot from an admission controller
+    """
+
+    def __init__(self, reader, interval: float = 1.0, profile: Optional[str] = None,
+                 run: Optional[Callable] = None):
+        self.reader = reader
+        self.interval = interval
+        self.profile = profile
+        self.run = run
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # Change detection: last thumbnail and words per OCR'd area
+        self._screens = ScreenIndex(thumbnail_width=480)
+        self._area_cache: Dict[Region, Tuple] = {}
+        self._stats = {"ticks": 0, "areas_ocrd": 0, "areas_unchanged": 0, "pixels_ocrd": 0,
+                       "last_tick_seconds": 0.0}
+
+    def subscribe(self, x: int, y: int, width: int, height: int,
+                  callback: Optional[Callable] = None) -> Subscription:
+        """
+        Start watching a region.
+
+        Args:
+            x: X coordinate of top-left corner
+            y: Y coordinate of top-left corner
+            width: Width of region
+            height: Height of region
+            callback: Optional callable receiving (subscription_id, result) when the area changes
+
+        Returns:
+            The new Subscription
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Region width and height must be positive")
+        with self._lock:
+            subscription = Subscription(next(self._ids), (x, y, width, height), callback)
+            self._subscriptions[subscription.id] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        with self._lock:
+            return self._subscriptions.pop(subscription_id, None) is not None
+
+    def get(self, subscription_id: int) -> Optional[Subscription]:
+        with self._lock:
+            return self._subscriptions.get(subscription_id)
+
+    def list(self) -> List[Subscription]:
+        with self._lock:
+            return list(self._subscriptions.values())
+
+    def tick(self) -> Dict[int, Dict]:
+        """
+        Capture the screen once and update every subscription.
+
+        Returns:
+            Result per subscription ID
+        """
+        with self._lock:
+            subscriptions = dict(self._subscriptions)
+        if not subscriptions:
+            return {}
+
+        start_time = time.time()
+        frame = self.reader.capture_screen()
+        frame_height, frame_width = frame.shape[:2]
+        screen = (0, 0, frame_width, frame_height)
+
+        regions = {key: s.region for key, s in subscriptions.items() if _intersects(s.region, screen)}
+        areas = []
+        for area, keys in merge_regions(regions):
+            x, y, width, height = self.reader._clip_roi(frame, area)
+            areas.append(((x, y, width, height), keys))
+
+        def process(area):
+            x, y, width, height = area
+            crop = frame[y:y + height, x:x + width]
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            signature = self._screens.signature(gray)
+            with self._lock:
+                cached = self._area_cache.get(area)
+            if cached is not None and self._screens.same_screen(signature, cached[0]):
+                return cached[1], False
+            processed = self.reader.preprocess_image(gray, self.reader.resolve_profile(gray, self.profile))
+            boxes = self.reader._run_engines(crop, processed)["bounding_boxes"]
+            with self._lock:
+                self._area_cache[area] = (signature, boxes)
+            return boxes, True
+
+        workers = min(len(areas), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                area_results = list(executor.map(process, [area for area, _ in areas]))
+        else:
+            area_results = [process(area) for area, _ in areas]
+        # Areas no longer in use (subscriptions changed) drop out of the cache
+        with self._lock:
+            self._area_cache = {area: self._area_cache[area] for area, _ in areas if area in self._area_cache}
+
+        timestamp = time.time()
+        results = {}
+        for (area, keys), (boxes, changed) in zip(areas, area_results):
+            for key in keys:
+                results[key] = self._slice_result(subscriptions[key].region, area, boxes, timestamp)
+                results[key]["changed"] = changed or subscriptions[key].result is None
+        for key in subscriptions.keys() - results.keys():
+            results[key] = self._slice_result(subscriptions[key].region, None, [], timestamp)
+            results[key].update(changed=subscriptions[key].result is None, error="Region lies outside the screen")
+
+        for key, result in results.items():
+            subscription = subscriptions[key]
+            subscription.result = result
+            if subscription.callback is not None and result["changed"]:
+                try:
+                    subscription.callback(key, result)
+                except Exception as e:
+                    print(f"Subscription {key} callback failed: {e}")
+
+        ocrd = [area for (area, _), (_, changed) in zip(areas, area_results) if changed]
+        # Ticks may run concurrently (the loop and API requests), and stats() reads from request threads
+        with self._lock:
+            self._stats["ticks"] += 1
+            self._stats["areas_ocrd"] += len(ocrd)
+            self._stats["areas_unchanged"] += len(areas) - len(ocrd)
+            self._stats["pixels_ocrd"] += sum(w * h for _, _, w, h in ocrd)
+            self._stats["last_tick_seconds"] = time.time() - start_time
+        return results
+
+    @staticmethod
+    def _slice_result(region: Region, area: Optional[Region], boxes: List[Dict], timestamp: float) -> Dict:
+        """Pick the words of an area whose centre lies in the region, in region coordinates."""
+        x, y, width, height = region
+        words = []
+        for box in boxes:
+            center_x = area[0] + box['x'] + box['width'] / 2
+            center_y = area[1] + box['y'] + box['height'] / 2
+            if x <= center_x < x + width and y <= center_y < y + height:
+                words.append(dict(box, x=box['x'] + area[0] - x, y=box['y'] + area[1] - y))
+
+        lines = group_boxes_into_lines(words)
+        return {
+            "text": "\n".join(line['text'] for line in lines),
+            "confidence": float(np.mean([w['confidence'] for w in words])) if words else 0,
+            "bounding_boxes": words,
+            "region": region,
+            "shared_area": area,
+            "timestamp": timestamp
+        }
+
+    def start(self) -> "RegionHub":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="screenreader-regions", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            start = time.time()
+            try:
+                if self.run is not None:
+                    self.run(self.tick)
+                else:
+                    self.tick()
+            except Exception as e:
+                print(f"Region tick failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.time() - start)))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscriptions = len(self._subscriptions)
+            stats = dict(self._stats)
+        return dict(stats, subscriptions=subscriptions, interval=self.interval,
+                    running=self._thread is not None)
@@ -0,0 +1,153 @@
+"""
+Locating a text label on screen without a full transcript.
+
+Candidate text lines are proposed with a cheap morphological pass (no OCR),
+then recognized a few at a time in priority order until one contains the
+query. Matching works on whitespace-insensitive, lower-cased text, optionally
+with a difflib similarity threshold for OCR noise.
+"""
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .fusion import normalize_text
+from .layout import group_boxes_into_lines
+
+# Padding added around proposed lines so ascenders and descenders aren't clipped
+REGION_PADDING = 3
+
+# Gap between glyph clusters, in line heights, that still counts as the same line
+WORD_GAP_FACTOR = 1.5
+
+# Narrowest line, in multiples of its height per query character, that could hold the query
+MIN_CHAR_WIDTH_RATIO = 0.3
+
+
+def propose_text_regions(gray: np.ndarray, min_height: int = 6, max_height_ratio: float = 0.25) -> List[Dict]:
+    """
+    Propose text line boxes from stroke edges, without running OCR.
+
+    The morphological gradient picks up glyph edges for dark-on-light and
+    light-on-dark text alike; a short horizontal closing joins glyphs into
+    word-sized components, which are then swept into lines the same way OCR
+    word boxes are.
+
+    Args:
+        gray: Grayscale image
+        min_height: Components shorter than this are ignored
+        max_height_ratio: Components taller than this fraction of the image are ignored
+
+    Returns:
+        Line boxes (x, y, width, height) in reading order
+    """
+    height, width = gray.shape[:2]
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    kernel_width = max(9, width // 120)
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_width, 1)))
+
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    max_height = max(min_height, int(height * max_height_ratio))
+
+    components = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if min_height <= h <= max_height and w * h >= 2 * min_height * min_height:
+            components.append({'x': x, 'y': y, 'width': w, 'height': h, 'text': '', 'confidence': 0})
+
+    regions = []
+    for line in group_boxes_into_lines(components, gap_factor=WORD_GAP_FACTOR):
+        x0, y0 = max(0, line['x'] - REGION_PADDING), max(0, line['y'] - REGION_PADDING)
+        x1 = min(width, line['x'] + line['width'] + REGION_PADDING)
+        y1 = min(height, line['y'] + line['height'] + REGION_PADDING)
+        regions.append({'x': int(x0), 'y': int(y0), 'width': int(x1 - x0), 'height': int(y1 - y0)})
+    return regions
+
+
+def region_at_point(regions: List[Dict], x: int, y: int, max_distance: Optional[float] = None) -> Optional[Dict]:
+    """
+    Pick the line box under a point, or the nearest one.
+
+    Args:
+        regions: Line boxes from propose_text_regions
+        x: Point x coordinate
+        y: Point y coordinate
+        max_distance: Farthest a line may be from the point (defaults to its height)
+
+    Returns:
+        The chosen line box, or None
+    """
+    best = None
+    for region in regions:
+        dx = max(region['x'] - x, 0, x - (region['x'] + region['width']))
+        dy = max(region['y'] - y, 0, y - (region['y'] + region['height']))
+        distance = (dx * dx + dy * dy) ** 0.5
+        limit = region['height'] if max_distance is None else max_distance
+        if distance <= limit and (best is None or distance < best[0]):
+            best = (distance, region)
+    return best[1] if best else None
+
+
+def could_contain(region: Dict, query: str) -> bool:
+    """Whether a line box is wide enough to hold the query at its text height."""
+    return region['width'] >= MIN_CHAR_WIDTH_RATIO * len(query) * region['height']
+
+
+def match_words(query: str, words: List[Dict], fuzzy: bool = False,
+                min_similarity: float = 0.8) -> Optional[Tuple[float, int, int]]:
+    """
+    Find the run of consecutive words that best matches the query.
+
+    Args:
+        query: Text to look for
+        words: Word boxes of one line, left to right
+        fuzzy: Accept approximate matches scored with difflib
+        min_similarity: Lowest similarity accepted when fuzzy is set
+
+    Returns:
+        (similarity, first word index, last word index + 1), or None
+    """
+    target = normalize_text(query)
+    if not target or not words:
+        return None
+
+    span = max(1, len(query.split()))
+    best = None
+    for start in range(len(words)):
+        for end in range(start + 1, min(len(words), start + span + 1) + 1):
+            text = normalize_text(''.join(w['text'] for w in words[start:end]))
+            if target in text:
+                # Prefer the tightest exact run
+                score = 1.0
+            elif fuzzy:
+                score = SequenceMatcher(None, target, text).ratio()
+            else:
+                continue
+            if best is None or score > best[0] or (score == best[0] and end - start < best[2] - best[1]):
+                best = (score, start, end)
+
+    if best is None or best[0] < (min_similarity if fuzzy else 1.0):
+        return None
+    return best
+
+
+def union_box(boxes: List[Dict]) -> Dict:
+    x0 = min(b['x'] for b in boxes)
+    y0 = min(b['y'] for b in boxes)
+    x1 = max(b['x'] + b['width'] for b in boxes)
+    y1 = max(b['y'] + b['height'] for b in boxes)
+    return {'x': int(x0), 'y': int(y0), 'width': int(x1 - x0), 'height': int(y1 - y0)}
+
+
+def overlaps(a: Dict, b: Dict, threshold: float = 0.5) -> bool:
+    """Whether the intersection covers at least threshold of the smaller box."""
+    x0, y0 = max(a['x'], b['x']), max(a['y'], b['y'])
+    x1 = min(a['x'] + a['width'], b['x'] + b['width'])
+    y1 = min(a['y'] + a['height'], b['y'] + b['height'])
+    if x1 <= x0 or y1 <= y0:
+        return False
+    smaller = min(a['width'] * a['height'], b['width'] * b['height'])
+    return (x1 - x0) * (y1 - y0) >= threshold * max(1, smaller)
@@ -0,0 +1,26 @@
+"""
+JSON serialization helpers for OCR results.
+
+Results carry NumPy scalars (confidences, coordinates) and sometimes arrays;
+json_default converts them for json.dumps, orjson and msgpack.
+"""
+
+from typing import Any
+
+import numpy as np
+
+
+def json_default(value: Any):
+    """
+    Serialize NumPy arrays and scalars and other stragglers found in OCR results.
+
+    Arrays are checked first: they also have item(), which only works for a
+    single element.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
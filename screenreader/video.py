@@ -0,0 +1,182 @@
+"""
+Keyframe extraction for screen recordings.
+
+Frames are decoded sequentially and sampled adaptively: the sampling interval
+doubles while the screen stays the same and drops back to the minimum as soon
+as it changes. Each sample is matched against the distinct screens seen so far
+(a perceptual hash narrows the candidates, a thumbnail comparison confirms the
+match), so only genuinely new screens need to be OCR'd.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .layout import LayoutCache
+
+# Signature of a frame: (64-bit difference hash, grayscale thumbnail)
+Signature = Tuple[int, np.ndarray]
+
+
+class ScreenIndex:
+    """
+    Distinct screens seen in a recording.
+
+    The difference hash alone is too coarse to notice a changed word on a full
+    screen, so it only selects candidates; a screen matches when its thumbnail
+    also differs from the candidate's in at most a handful of pixels.
+    """
+
+    def __init__(self, max_distance: int = 6, thumbnail_width: int = 240,
+                 pixel_tolerance: int = 24, max_changed_pixels: int = 4):
+        """
+        Args:
+            max_distance: Maximum Hamming distance between hashes of matching screens
+            thumbnail_width: Width of the comparison thumbnail
+            pixel_tolerance: Per-pixel thumbnail difference treated as compression noise
+            max_changed_pixels: Thumbnail pixels allowed to differ beyond the tolerance
+        """
+        self.max_distance = max_distance
+        self.thumbnail_width = thumbnail_width
+        self.pixel_tolerance = pixel_tolerance
+        self.max_changed_pixels = max_changed_pixels
+        self._signatures: List[Signature] = []
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, gray: np.ndarray) -> Signature:
+        """
+        Compute the hash and thumbnail of a grayscale frame.
+
+        Args:
+            gray: Grayscale frame
+
+        Returns:
+            Frame signature
+        """
+        height, width = gray.shape[:2]
+        thumb_width = min(width, self.thumbnail_width)
+        thumb_height = max(1, round(height * thumb_width / width))
+        thumbnail = cv2.resize(gray, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
+        return LayoutCache.fingerprint(thumbnail), thumbnail
+
+    def same_screen(self, a: Signature, b: Signature) -> bool:
+        if bin(a[0] ^ b[0]).count('1') > self.max_distance or a[1].shape != b[1].shape:
+            return False
+        changed = np.count_nonzero(cv2.absdiff(a[1], b[1]) > self.pixel_tolerance)
+        return changed <= self.max_changed_pixels
+
+    def match(self, signature: Signature, preferred: Optional[int] = None) -> Optional[int]:
+        """
+        Find the screen a signature belongs to.
+
+        Args:
+            signature: Frame signature
+            preferred: Screen to check first (usually the one currently shown)
+
+        Returns:
+            Screen ID, or None for a new screen
+        """
+        if preferred is not None and self.same_screen(signature, self._signatures[preferred]):
+            return preferred
+        for screen_id, known in enumerate(self._signatures):
+            if screen_id != preferred and self.same_screen(signature, known):
+                return screen_id
+        return None
+
+    def add(self, signature: Signature) -> int:
+        self._signatures.append(signature)
+        return len(self._signatures) - 1
+
+
+class VideoSampler:
+    """
+    Iterates over the screen changes of a video file.
+
+    Iteration yields one dictionary per change of the visible screen with
+    frame_index, timestamp, image (BGR), screen (ID in the index) and new
+    (whether the screen was seen for the first time). Because sampling backs off
+    to max_interval on static stretches, a change is reported at the first
+    sample that shows it - up to max_interval after it happened.
+    """
+
+    def __init__(self, path: str, min_interval: float = 0.5, max_interval: float = 4.0,
+                 index: Optional[ScreenIndex] = None):
+        """
+        Args:
+            path: Video file path
+            min_interval: Sampling interval in seconds after a screen change
+            max_interval: Longest sampling interval on an unchanged screen
+            index: Screen index used for deduplication (a new one by default)
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Sampling intervals must satisfy 0 < min_interval <= max_interval")
+
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.index = index or ScreenIndex()
+        self.fps = 0.0
+        self.frames = 0
+        self.sampled_frames = 0
+        self.frame_shape: Optional[Tuple[int, ...]] = None
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.fps if self.fps else 0.0
+
+    def __iter__(self) -> Iterator[Dict]:
+        capture = cv2.VideoCapture(self.path)
+        if not capture.isOpened():
+            raise ValueError(f"Could not open video file: {self.path}")
+
+        try:
+            # Some containers don't report a frame rate; assume a typical recording
+            self.fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+            step = self.min_interval
+            next_sample = 0
+            current = None
+            frame_index = -1
+
+            while True:
+                # grab() decodes without the colour conversion and copy of retrieve(),
+                # so frames between samples are cheap to skip
+                if not capture.grab():
+                    break
+                frame_index += 1
+                if frame_index < next_sample:
+                    continue
+
+                ok, frame = capture.retrieve()
+                if not ok:
+                    break
+                self.sampled_frames += 1
+                self.frame_shape = frame.shape
+
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                signature = self.index.signature(gray)
+                screen = self.index.match(signature, current)
+
+                if screen is not None and screen == current:
+                    step = min(step * 2, self.max_interval)
+                else:
+                    step = self.min_interval
+                    new = screen is None
+                    if new:
+                        screen = self.index.add(signature)
+                    current = screen
+                    yield {
+                        "frame_index": frame_index,
+                        "timestamp": frame_index / self.fps,
+                        "image": frame,
+                        "screen": screen,
+                        "new": new
+                    }
+
+                next_sample = frame_index + max(1, round(step * self.fps))
+
+            self.frames = frame_index + 1
+        finally:
+            capture.release()
@@ -0,0 +1,199 @@
+"""
+Text-pattern watches on screen regions.
+
+A watch is a region plus a regular expression or keyword set. Watches are
+served by a RegionHub, so all of them share one capture per tick, and a rule is
+only evaluated when the pixels of its area changed - an idle screen costs a
+capture and a thumbnail comparison per tick, however many watches there are.
+A watch fires once when its pattern starts matching and is re-armed when the
+text stops matching; events go to a callback and/or are POSTed as JSON to a
+webhook URL.
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .regions import RegionHub
+
+# Seconds a webhook POST may take before it is abandoned
+WEBHOOK_TIMEOUT = 5.0
+
+
+def compile_pattern(pattern: Optional[str] = None, keywords: Optional[Iterable[str]] = None,
+                    ignore_case: bool = True) -> re.Pattern:
+    """
+    Build the expression a watch evaluates.
+
+    Args:
+        pattern: Regular expression
+        keywords: Words or phrases, any of which triggers the watch (matched as whole words)
+        ignore_case: Match case-insensitively
+
+    Returns:
+        Compiled regular expression
+    """
+    parts = []
+    if pattern:
+        parts.append(f"(?:{pattern})")
+    if keywords:
+        parts.extend(r"\b" + re.escape(keyword.strip()) + r"\b" for keyword in keywords if keyword.strip())
+    if not parts:
+        raise ValueError("Give a pattern or at least one keyword")
+    try:
+        return re.compile("|".join(parts), re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern: {e}")
+
+
+class Watch:
+    """A region, the expression evaluated on its text, and where events go."""
+
+    def __init__(self, watch_id: int, subscription_id: Optional[int], region, expression: re.Pattern,
+                 callback: Optional[Callable] = None, webhook: Optional[str] = None):
+        self.id = watch_id
+        self.subscription_id = subscription_id
+        self.region = region
+        self.expression = expression
+        self.callback = callback
+        self.webhook = webhook
+        self.matching = False
+        self.fired = 0
+        self.evaluations = 0
+        self.created_at = time.time()
+
+    def to_dict(self) -> Dict:
+        x, y, width, height = self.region
+        return {"id": self.id, "x": x, "y": y, "width": width, "height": height,
+                "pattern": self.expression.pattern, "webhook": self.webhook,
+                "matching": self.matching, "fired": self.fired, "evaluations": self.evaluations,
+                "created_at": self.created_at}
+
+
+class Watcher:
+    """
+    Evaluates watches on the results of a RegionHub.
+
+    Args:
+        hub: RegionHub the watched regions are subscribed to (start() it to run watches)
+        max_events: Recent events kept for events()
+    """
+
+    def __init__(self, hub: RegionHub, max_events: int = 200):
+        self.hub = hub
+        self._watches: Dict[int, Watch] = {}
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count(1)
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        # Webhooks are posted off the tick thread so a slow receiver can't stall every watch
+        self._webhooks = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenreader-webhook")
+
+    def add(self, x: int, y: int, width: int, height: int, pattern: Optional[str] = None,
+            keywords: Optional[List[str]] = None, ignore_case: bool = True,
+            callback: Optional[Callable] = None, webhook: Optional[str] = None) -> Watch:
+        """
+        Watch a region for text.
+
+        Args:
+            x: X coordinate of top-left corner
+            y: Y coordinate of top-left corner
+            width: Width of region
+            height: Height of region
+            pattern: Regular expression to look for
+            keywords: Words or phrases to look for (alternative or addition to pattern)
+            ignore_case: Match case-insensitively
+            callback: Optional callable receiving each event dictionary
+            webhook: Optional http(s) URL each event is POSTed to as JSON
+
+        Returns:
+            The new Watch
+        """
+        expression = compile_pattern(pattern, keywords, ignore_case)
+        if webhook is not None and not webhook.startswith(("http://", "https://")):
+            raise ValueError("Webhook must be an http:// or https:// URL")
+
+        with self._lock:
+            watch = Watch(next(self._ids), None, (x, y, width, height), expression, callback, webhook)
+            # Registered before subscribing so the first tick already finds it
+            self._watches[watch.id] = watch
+        try:
+            # The hub calls back only when the region's area changed, so this is
+            # the only point where the rule is evaluated
+            subscription = self.hub.subscribe(x, y, width, height,
+                                              callback=lambda _, result: self._evaluate(watch.id, result))
+        except ValueError:
+            with self._lock:
+                del self._watches[watch.id]
+            raise
+        watch.subscription_id = subscription.id
+        return watch
+
+    def remove(self, watch_id: int) -> bool:
+        with self._lock:
+            watch = self._watches.pop(watch_id, None)
+        if watch is None:
+            return False
+        self.hub.unsubscribe(watch.subscription_id)
+        return True
+
+    def get(self, watch_id: int) -> Optional[Watch]:
+        with self._lock:
+            return self._watches.get(watch_id)
+
+    def list(self) -> List[Watch]:
+        with self._lock:
+            return list(self._watches.values())
+
+    def events(self, after: int = 0) -> List[Dict]:
+        """Recent events with a sequence number greater than after, oldest first."""
+        with self._lock:
+            return [event for event in self._events if event["sequence"] > after]
+
+    def _evaluate(self, watch_id: int, result: Dict):
+        watch = self.get(watch_id)
+        if watch is None or result.get("error"):
+            return
+        watch.evaluations += 1
+        text = result["text"]
+        matches = [m.group(0) for m in watch.expression.finditer(text)]
+        was_matching, watch.matching = watch.matching, bool(matches)
+        if not matches or was_matching:
+            return
+
+        watch.fired += 1
+        with self._lock:
+            event = {"sequence": next(self._sequence), "watch_id": watch.id, "matches": matches,
+                     "text": text, "region": watch.region, "timestamp": result["timestamp"]}
+            self._events.append(event)
+        if watch.callback is not None:
+            try:
+                watch.callback(event)
+            except Exception as e:
+                print(f"Watch {watch.id} callback failed: {e}")
+        if watch.webhook is not None:
+            self._webhooks.submit(self._post, watch.webhook, event)
+
+    @staticmethod
+    def _post(url: str, event: Dict):
+        body = json.dumps(event).encode("utf-8")
+        request = urllib.request.Request(url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=WEBHOOK_TIMEOUT) as response:
+                response.read()
+        except Exception as e:
+            print(f"Webhook {url} failed for watch {event['watch_id']}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            watches = list(self._watches.values())
+        return {"watches": len(watches), "matching": sum(w.matching for w in watches),
+                "fired": sum(w.fired for w in watches), "evaluations": sum(w.evaluations for w in watches),
+                "hub": self.hub.stats()}
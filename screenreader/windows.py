@@ -0,0 +1,174 @@
+"""
+X11 window enumeration for window-scoped capture.
+
+Windows are listed with a single `xwininfo -root -tree` call (x11-utils), which
+reports every window's title, WM_CLASS and absolute geometry; this works under
+Xvfb and any window manager. The listing is cached for a short time so that
+repeated reads of the same window don't re-enumerate the desktop.
+"""
+
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+# 0x1a00007 "Title": ("instance" "Class")  800x600+10+20  +110+220
+WINDOW_LINE = re.compile(
+    r'^\s*(?P<id>0x[0-9a-fA-F]+) (?:"(?P<title>.*)"|\(has no name\)): '
+    r'\((?:"(?P<instance>[^"]*)" "(?P<wm_class>[^"]*)")?\)\s+'
+    r'(?P<width>\d+)x(?P<height>\d+)[+-]-?\d+[+-]-?\d+\s+\+(?P<x>-?\d+)\+(?P<y>-?\d+)'
+)
+
+# Windows this small are input-only helpers, not something to read
+MIN_WINDOW_SIZE = 8
+
+
+def parse_window_tree(output: str) -> List[Dict]:
+    """
+    Parse `xwininfo -root -tree` output into window dictionaries.
+
+    Args:
+        output: Command output
+
+    Returns:
+        Named windows (id, title, instance, wm_class, x, y, width, height) in
+        bottom-to-top stacking order
+    """
+    windows = []
+    for line in output.splitlines():
+        match = WINDOW_LINE.match(line)
+        if match is None or match.group("title") is None:
+            continue
+        width, height = int(match.group("width")), int(match.group("height"))
+        if width < MIN_WINDOW_SIZE or height < MIN_WINDOW_SIZE:
+            continue
+        windows.append({
+            "id": int(match.group("id"), 16),
+            "title": match.group("title"),
+            "instance": match.group("instance") or "",
+            "wm_class": match.group("wm_class") or "",
+            "x": int(match.group("x")),
+            "y": int(match.group("y")),
+            "width": width,
+            "height": height,
+        })
+    return windows
+
+
+def parse_window_id(window_id: Union[int, str]) -> int:
+    """Accept window IDs as integers or decimal/hex strings ("0x1a00007")."""
+    if isinstance(window_id, int):
+        return window_id
+    return int(window_id, 0)
+
+
+class WindowLocator:
+    """
+    Finds X11 windows by title, class or ID, caching the window list.
+
+    Args:
+        ttl: Seconds a window listing (and so each window's geometry) is reused
+        display: X display to query (defaults to $DISPLAY)
+    """
+
+    def __init__(self, ttl: float = 2.0, display: Optional[str] = None):
+        self.ttl = ttl
+        self.display = display
+        self._windows: List[Dict] = []
+        self._listed_at = 0.0
+        self._screen_size = None
+        self._lock = threading.Lock()
+
+    def _run(self, *args: str) -> str:
+        cmd = ["xwininfo", *args]
+        if self.display:
+            cmd += ["-display", self.display]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        except FileNotFoundError:
+            raise RuntimeError("Window capture requires xwininfo. Install with: apt-get install x11-utils")
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"xwininfo timed out after {e.timeout:g} seconds")
+        if result.returncode != 0:
+            raise RuntimeError(f"xwininfo failed: {result.stderr.strip() or result.returncode}")
+        return result.stdout
+
+    def list_windows(self, refresh: bool = False) -> List[Dict]:
+        """
+        List named top-level and child windows.
+
+        Args:
+            refresh: Ignore the cached listing
+
+        Returns:
+            Window dictionaries in bottom-to-top stacking order
+        """
+        with self._lock:
+            if refresh or not self._listed_at or time.time() - self._listed_at > self.ttl:
+                self._windows = parse_window_tree(self._run("-root", "-tree"))
+                self._listed_at = time.time()
+            return [dict(w) for w in self._windows]
+
+    def screen_size(self) -> Tuple[int, int]:
+        """(width, height) of the root window; cached, since it rarely changes."""
+        with self._lock:
+            if self._screen_size is None:
+                output = self._run("-root")
+                width = re.search(r"Width:\s*(\d+)", output)
+                height = re.search(r"Height:\s*(\d+)", output)
+                if width is None or height is None:
+                    raise RuntimeError("Could not read the root window size from xwininfo")
+                self._screen_size = (int(width.group(1)), int(height.group(1)))
+            return self._screen_size
+
+    def find(self, title: Optional[str] = None, wm_class: Optional[str] = None,
+             window_id: Optional[Union[int, str]] = None) -> Optional[Dict]:
+        """
+        Find a window. Titles match case-insensitively as substrings, classes
+        match the WM_CLASS class or instance name. When several windows match,
+        the topmost one wins.
+
+        Args:
+            title: Part of the window title
+            wm_class: WM_CLASS class or instance name
+            window_id: X window ID
+
+        Returns:
+            Window dictionary, or None if nothing matches
+        """
+        if title is None and wm_class is None and window_id is None:
+            raise ValueError("Give a window title, class or ID")
+        wanted_id = parse_window_id(window_id) if window_id is not None else None
+
+        def matches(window):
+            if wanted_id is not None and window["id"] != wanted_id:
+                return False
+            if title is not None and title.lower() not in window["title"].lower():
+                return False
+            if wm_class is not None and wm_class.lower() not in (window["wm_class"].lower(),
+                                                                   window["instance"].lower()):
+                return False
+            return True
+
+        # A cached miss may just mean the window appeared since the last listing
+        for refresh in (False, True):
+            found = [w for w in self.list_windows(refresh) if matches(w)]
+            if found:
+                return found[-1]
+        return None
+
+    def visible_region(self, window: Dict) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Clip a window's geometry to the screen.
+
+        Returns:
+            (x, y, width, height) of the on-screen part, or None if it is off-screen
+        """
+        screen_width, screen_height = self.screen_size()
+        x0, y0 = max(0, window["x"]), max(0, window["y"])
+        x1 = min(screen_width, window["x"] + window["width"])
+        y1 = min(screen_height, window["y"] + window["height"])
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
@@ -8,7 +8,7 @@ import os
 import sys
 import time
 import json
-from screen_reader import ScreenReader
+from screenreader import ScreenReader
 
 def test_basic_functionality():
     """Test basic screen reading functionality."""
@@ -137,7 +137,15 @@ def test_performance():
     print("=" * 60)
     
     try:
-        reader = ScreenReader(use_easyocr=True, use_tesseract=True)
+        replay_path = os.environ.get("SCREENREADER_REPLAY")
+        if replay_path:
+            # Recorded full-screen frames (python -m screenreader.recording) make timings
+            # reproducible and never fall back to the generated test image
+            print(f"Replaying captures from {replay_path}")
+            reader = ScreenReader(use_easyocr=True, use_tesseract=True, capture_backend="replay",
+                                  capture_options={"path": replay_path, "loop": True})
+        else:
+            reader = ScreenReader(use_easyocr=True, use_tesseract=True)
         
         print("\n7. Testing performance with multiple captures...")
         times = []
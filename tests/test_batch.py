@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+
+from screenreader import batch
+from screenreader.serialization import json_default
+
+
+def fake_init_worker(reader_options):
+    pass
+
+
+def fake_ocr_file(name, digest, data, profile, layout):
+    """Files starting with b"bad" fail, anything else 'reads' as its own bytes."""
+    if data.startswith(b"bad"):
+        return {"path": name, "sha256": digest, "status": "error", "error": "could not decode image"}
+    return {"path": name, "sha256": digest, "status": "ok", "text": data.decode(), "confidence": 90.0}
+
+
+def write_files(directory, files):
+    for name, data in files.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(data)
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return {record["path"].rsplit(os.sep, 1)[-1]: record for record in map(json.loads, f)}
+
+
+def test_checkpoint_resume_and_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "_init_worker", fake_init_worker)
+    monkeypatch.setattr(batch, "_ocr_file", fake_ocr_file)
+    source = tmp_path / "shots"
+    source.mkdir()
+    output = str(tmp_path / "results.jsonl")
+    write_files(source, {"a.png": b"alpha", "b.png": b"alpha", "bad.png": b"bad1",
+                         "c.png": b"gamma", "d.png": b"bad1"})
+
+    stats = batch.run_batch(str(source), output, workers=1)
+    assert (stats["processed"], stats["duplicates"], stats["errors"], stats["skipped"]) == (2, 1, 2, 0)
+    records = read_records(output)
+    assert records["b.png"]["status"] == "duplicate"
+    # A copy of content that failed is not a duplicate of a result that doesn't exist
+    assert records["d.png"]["status"] == "error"
+
+    checkpoint = batch.Checkpoint(output + ".checkpoint")
+    assert len(checkpoint.names) == 5
+    assert records["a.png"]["sha256"] in checkpoint.hashes
+    assert records["bad.png"]["sha256"] not in checkpoint.hashes
+    checkpoint.close()
+
+    # Resuming skips finished files; new copies of good content are duplicates,
+    # new copies of failed content are OCR'd again
+    write_files(source, {"e.png": b"alpha", "f.png": b"bad1", "g.png": b"delta"})
+    stats = batch.run_batch(str(source), output, workers=1)
+    assert (stats["processed"], stats["duplicates"], stats["errors"], stats["skipped"]) == (1, 1, 1, 5)
+    records = read_records(output)
+    assert len(records) == 8
+    assert records["e.png"]["status"] == "duplicate"
+    assert records["f.png"]["status"] == "error"
+    assert records["g.png"]["text"] == "delta"
+
+
+def test_restart_ignores_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "_init_worker", fake_init_worker)
+    monkeypatch.setattr(batch, "_ocr_file", fake_ocr_file)
+    source = tmp_path / "shots"
+    source.mkdir()
+    output = str(tmp_path / "results.jsonl")
+    write_files(source, {"a.png": b"alpha"})
+
+    batch.run_batch(str(source), output, workers=1)
+    stats = batch.run_batch(str(source), output, workers=1, resume=False)
+    assert (stats["processed"], stats["skipped"]) == (1, 0)
+    assert len(read_records(output)) == 1
+
+
+def test_json_default_serializes_arrays_and_scalars():
+    value = {"shape": np.array([2, 3]), "box": np.array([[1, 2], [3, 4]]), "confidence": np.float32(0.5),
+             "count": np.int64(3), "one": np.array([7])}
+    assert json.loads(json.dumps(value, default=json_default)) == {
+        "shape": [2, 3], "box": [[1, 2], [3, 4]], "confidence": 0.5, "count": 3, "one": [7]}
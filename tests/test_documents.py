@@ -0,0 +1,77 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from screenreader import documents
+from screenreader.reader import ScreenReader
+
+
+def test_count_pages_requires_pymupdf_for_pdfs(tmp_path, monkeypatch):
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(b"%PDF-1.4\n")
+    monkeypatch.setattr(documents, "PYMUPDF_AVAILABLE", False)
+    with pytest.raises(RuntimeError, match="requires PyMuPDF"):
+        documents.count_pages(str(path))
+
+
+@pytest.mark.skipif(not documents.PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_count_pages_rejects_broken_pdfs(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"%PDF-1.4 not really")
+    with pytest.raises(ValueError, match="Could not open PDF"):
+        documents.count_pages(str(path))
+
+
+def test_multipage_tiff_is_counted_and_decoded(tmp_path):
+    path = str(tmp_path / "pages.tiff")
+    pages = [np.full((20, 30, 3), shade, dtype=np.uint8) for shade in (0, 128, 255)]
+    assert cv2.imwritemulti(path, pages)
+
+    assert documents.count_pages(path) == 3
+    decoded = list(documents.iter_pages(path))
+    assert [number for number, _ in decoded] == [1, 2, 3]
+    assert [int(image.mean()) for _, image in decoded] == [0, 128, 255]
+
+
+class PageReader:
+    """Stands in for ScreenReader's OCR and records which pages were processed."""
+
+    def __init__(self):
+        self.processed = []
+
+    def process_uploaded_image(self, image, **options):
+        self.processed.append(int(image.mean()))
+        return {"text": str(int(image.mean()))}
+
+
+def test_iter_document_yields_pages_in_order(tmp_path):
+    path = str(tmp_path / "pages.tiff")
+    assert cv2.imwritemulti(path, [np.full((20, 30, 3), shade, dtype=np.uint8) for shade in (10, 20, 30)])
+
+    results = list(ScreenReader.iter_document(PageReader(), path, workers=2))
+    assert [(r["page"], r["text"], r["source"]) for r in results] == [(1, "10", "document"), (2, "20", "document"),
+                                                                      (3, "30", "document")]
+
+
+def test_closing_iter_document_skips_pages_not_yet_started(tmp_path):
+    path = str(tmp_path / "pages.tiff")
+    assert cv2.imwritemulti(path, [np.full((20, 30, 3), shade, dtype=np.uint8) for shade in (10, 20, 30, 40, 50)])
+
+    reader = PageReader()
+    release = threading.Event()
+    process = reader.process_uploaded_image
+
+    def blocking_after_first_page(image, **options):
+        # Pages 2 and 3 occupy both workers, so page 4 is still waiting when the consumer stops
+        if int(image.mean()) != 10:
+            release.wait(5)
+        return process(image, **options)
+
+    reader.process_uploaded_image = blocking_after_first_page
+    pages = ScreenReader.iter_document(reader, path, workers=2)
+    assert next(pages)["page"] == 1
+    threading.Timer(0.1, release.set).start()
+    pages.close()
+    assert sorted(reader.processed) == [10, 20, 30]
@@ -0,0 +1,36 @@
+import numpy as np
+
+from screenreader.engines import EasyOCREngine, TesseractEngine
+
+
+def test_recognize_lines_without_lines():
+    image = np.full((50, 100), 255, dtype=np.uint8)
+    assert TesseractEngine().recognize_lines(image, []) == []
+
+    engine = object.__new__(EasyOCREngine)
+    engine.reader = None
+    assert engine.recognize_lines(image, []) == []
+
+
+def test_recognize_lines_maps_mosaic_words_back_to_their_lines():
+    engine = TesseractEngine()
+    image = np.full((200, 300), 255, dtype=np.uint8)
+    lines = [{'x': 40, 'y': 100, 'width': 80, 'height': 20}, {'x': 10, 'y': 10, 'width': 50, 'height': 10}]
+    mosaics = []
+
+    def extract(mosaic):
+        mosaics.append(mosaic)
+        # Line crops are stacked top to bottom with 8 pixels of padding: the
+        # first at y=8, the second at y=8+20+8=36
+        return {"bounding_boxes": [
+            {'x': 8, 'y': 10, 'width': 30, 'height': 12, 'text': 'first', 'confidence': 90},
+            {'x': 18, 'y': 37, 'width': 20, 'height': 8, 'text': 'second', 'confidence': 80},
+        ]}
+
+    engine.extract = extract
+    words = engine.recognize_lines(image, lines)
+
+    assert mosaics[0].shape == (8 + 20 + 8 + 10 + 8, 80 + 16)
+    assert [[w['text'] for w in line] for line in words] == [['first'], ['second']]
+    assert (words[0][0]['x'], words[0][0]['y']) == (40, 102)
+    assert (words[1][0]['x'], words[1][0]['y']) == (20, 11)
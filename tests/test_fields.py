@@ -0,0 +1,72 @@
+import pytest
+
+from screenreader import fields
+from screenreader.fields import check_field_options, field_text, is_valid, resolve_field, tesseract_config
+from screenreader.reader import ScreenReader
+
+
+def test_resolve_field_uses_the_type_defaults():
+    spec = resolve_field("digits")
+    assert (spec["type"], spec["psm"], spec["allowlist"]) == ("digits", 7, "0123456789")
+    assert tesseract_config(spec) == "--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789"
+
+
+def test_resolve_field_overrides():
+    spec = resolve_field("digits", allowlist="0123456789ABCDEF", psm=8)
+    assert (spec["psm"], spec["allowlist"]) == (8, "0123456789ABCDEF")
+    # A custom character set drops the type's pattern
+    assert spec["pattern"] is None
+
+
+@pytest.mark.parametrize("options", [
+    {"field_type": "unknown"},
+    {"psm": 14},
+    {"psm": -1},
+    {"psm": 7.0},
+    {"psm": True},
+    {"psm": "7"},
+    {"allowlist": "12 3"},
+    {"allowlist": "12'3"},
+    {"allowlist": '12"3'},
+    {"allowlist": "12\\3"},
+    {"allowlist": "12\x003"},
+])
+def test_resolve_field_rejects_invalid_options(options):
+    with pytest.raises(ValueError):
+        resolve_field(**dict({"field_type": "line"}, **options))
+
+
+def test_builtin_field_types_are_valid():
+    for spec in fields.FIELD_TYPES.values():
+        check_field_options(spec["allowlist"], spec["psm"])
+
+
+@pytest.mark.parametrize("field_type, text, valid", [
+    ("digits", "0042", True),
+    ("digits", "42a", False),
+    ("number", "-1,234.5%", True),
+    ("number", "1.2.", False),
+    ("time", "12:30:05", True),
+    ("code", "AB-12_C", True),
+    ("code", "ab12", False),
+    ("line", "", False),
+    ("line", "anything goes", True),
+])
+def test_is_valid(field_type, text, valid):
+    assert is_valid(text, resolve_field(field_type)) is valid
+
+
+def test_field_text_joins_words_in_reading_order():
+    words = [{"text": "34", "x": 20}, {"text": "12", "x": 0}]
+    assert field_text(words, resolve_field("line")) == "12 34"
+    assert field_text(words, resolve_field("digits")) == "1234"
+
+
+def test_field_engine_cache_is_bounded():
+    reader = ScreenReader(use_easyocr=False)
+    configs = [tesseract_config(resolve_field("line", allowlist=str(i))) for i in range(40)]
+    engines = [reader._get_field_engine(config) for config in configs]
+
+    assert len(reader._field_engines) == 32
+    assert reader._get_field_engine(configs[-1]) is engines[-1]
+    assert configs[0] not in reader._field_engines
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from screenreader.engines import EasyOCREngine
+from screenreader.fusion import combine_results, fuse_boxes
+
+
+def box(text, x, y, confidence, width=40, height=12):
+    return {"text": text, "x": x, "y": y, "width": width, "height": height, "confidence": confidence}
+
+
+def result(boxes, engine):
+    return {"text": " ".join(b["text"] for b in boxes), "confidence": 0, "bounding_boxes": boxes, "engine": engine}
+
+
+def test_agreeing_overlap_keeps_tesseract_words_with_best_confidence():
+    tesseract = [box("Hello", 10, 10, 70), box("world", 60, 10, 80)]
+    easyocr = [box("Hello world", 8, 8, 95, width=100, height=16)]
+
+    fused, stats = fuse_boxes(tesseract, easyocr)
+    assert [w["text"] for w in fused] == ["Hello", "world"]
+    assert all(w["engine"] == "both" and w["confidence"] == 95 for w in fused)
+    assert stats == {"matched": 1, "agreed": 1, "from_tesseract": 2, "from_easyocr": 0}
+
+
+@pytest.mark.parametrize("tesseract_confidence, winner", [(90, "tesseract"), (40, "easyocr")])
+def test_disagreeing_overlap_goes_to_the_more_confident_engine(tesseract_confidence, winner):
+    tesseract = [box("He1lo", 10, 10, tesseract_confidence)]
+    easyocr = [box("Hello", 8, 8, 60, width=50, height=16)]
+
+    fused, stats = fuse_boxes(tesseract, easyocr)
+    assert [w["engine"] for w in fused] == [winner]
+    assert fused[0]["text"] == ("He1lo" if winner == "tesseract" else "Hello")
+    assert stats["matched"] == 1 and stats["agreed"] == 0
+
+
+def test_disjoint_boxes_are_all_kept():
+    tesseract = [box("left", 10, 10, 80)]
+    easyocr = [box("right", 500, 300, 70)]
+
+    fused, stats = fuse_boxes(tesseract, easyocr)
+    assert sorted(w["text"] for w in fused) == ["left", "right"]
+    assert stats == {"matched": 0, "agreed": 0, "from_tesseract": 1, "from_easyocr": 1}
+
+
+@pytest.mark.parametrize("tesseract_boxes, easyocr_boxes", [
+    ([box("only", 10, 10, 80)], []),
+    ([], [box("only", 10, 10, 80)]),
+])
+def test_one_engine_returning_nothing(tesseract_boxes, easyocr_boxes):
+    combined = combine_results(result(tesseract_boxes, "tesseract"), result(easyocr_boxes, "easyocr"))
+    assert combined["text"] == "only"
+    assert combined["confidence"] == pytest.approx(80)
+    assert combined["combined"] is True
+
+
+def test_both_engines_empty():
+    combined = combine_results(result([], "tesseract"), result([], "easyocr"))
+    assert combined["text"] == "" and combined["bounding_boxes"] == [] and combined["confidence"] == 0
+
+
+class FakeEasyOCRReader:
+    def readtext(self, image):
+        return [([[0, 0], [40, 0], [40, 12], [0, 12]], "kept", 0.9),
+                ([[50, 0], [90, 0], [90, 12], [50, 12]], "dropped", 0.1)]
+
+    def recognize(self, gray, horizontal_list, free_list, allowlist=None):
+        return self.readtext(gray)
+
+
+def test_easyocr_confidences_use_the_0_to_100_scale():
+    engine = object.__new__(EasyOCREngine)
+    engine.reader = FakeEasyOCRReader()
+    engine.min_confidence = 0.3
+    image = np.zeros((20, 100, 3), dtype=np.uint8)
+
+    extracted = engine.extract(image)
+    assert extracted["confidence"] == pytest.approx(90)
+    assert [b["confidence"] for b in extracted["bounding_boxes"]] == [pytest.approx(90)]
+
+    lines = engine.recognize_lines(image[:, :, 0], [{"x": 0, "y": 0, "width": 100, "height": 20}])
+    assert [w["confidence"] for w in lines[0]] == [pytest.approx(90)]
@@ -0,0 +1,59 @@
+import pytest
+
+from screenreader.layout import group_boxes_into_lines, group_lines_into_blocks, reconstruct_layout
+
+
+def word(text, x, y, width=40, height=10, confidence=90.0):
+    return {'text': text, 'x': x, 'y': y, 'width': width, 'height': height, 'confidence': confidence}
+
+
+# Two side-by-side columns of two lines each, then a paragraph further down the left column
+WORDS = [
+    word('world', 50, 1), word('hello', 0, 0), word('right', 300, 0),
+    word('second', 0, 15, confidence=70.0), word('pane', 300, 16),
+    word('later', 0, 100),
+]
+
+
+def test_words_are_grouped_into_lines_and_split_at_column_gaps():
+    lines = group_boxes_into_lines(WORDS)
+    assert [line['text'] for line in lines] == ['hello world', 'right', 'second', 'pane', 'later']
+    assert {k: lines[0][k] for k in ('x', 'y', 'width', 'height')} == {'x': 0, 'y': 0, 'width': 90, 'height': 11}
+    assert [w['text'] for w in lines[0]['words']] == ['hello', 'world']
+
+
+def test_a_larger_gap_factor_keeps_columns_on_one_line():
+    lines = group_boxes_into_lines(WORDS, gap_factor=30)
+    assert lines[0]['text'] == 'hello world right'
+
+
+def test_lines_are_grouped_into_blocks_in_reading_order():
+    blocks = group_lines_into_blocks(group_boxes_into_lines(WORDS))
+    assert [block['text'] for block in blocks] == ['hello world\nsecond', 'right\npane', 'later']
+    assert blocks[0]['confidence'] == pytest.approx(80.0)
+    assert (blocks[1]['x'], blocks[1]['y'], blocks[1]['height']) == (300, 0, 26)
+
+
+def test_empty_input_has_no_layout():
+    assert group_boxes_into_lines([]) == []
+    assert reconstruct_layout([]) == {'text': '', 'lines': [], 'blocks': []}
+
+
+def test_reconstruct_layout_levels():
+    full = reconstruct_layout(WORDS)
+    assert full['text'] == 'hello world\nsecond\n\nright\npane\n\nlater'
+    assert [line['text'] for line in full['lines']] == ['hello world', 'second', 'right', 'pane', 'later']
+    assert 'words' in full['blocks'][0]['lines'][0]
+
+    blocks = reconstruct_layout(WORDS, level='blocks')
+    assert len(blocks['blocks']) == 3
+    assert all('words' not in line for block in blocks['blocks'] for line in block['lines'])
+
+    lines = reconstruct_layout(WORDS, level='lines')
+    assert set(lines) == {'text', 'lines'}
+    assert all('words' not in line for line in lines['lines'])
+
+
+def test_unknown_layout_level_is_rejected():
+    with pytest.raises(ValueError, match="Unknown layout level 'words'"):
+        reconstruct_layout(WORDS, level='words')
@@ -0,0 +1,98 @@
+import threading
+
+import numpy as np
+
+from screenreader.layout import LayoutCache
+from screenreader.reader import ScreenReader
+
+LINES = [(20, 20, 200, 20), (20, 80, 200, 20)]
+
+
+def make_frame(shade: int) -> np.ndarray:
+    """Blank frame whose first line is filled with the given shade."""
+    gray = np.full((200, 400), 255, dtype=np.uint8)
+    x, y, width, height = LINES[0]
+    gray[y:y + height, x:x + width] = shade
+    return gray
+
+
+def words_for(gray: np.ndarray, line: dict) -> list:
+    """Stand-in recognizer: the 'text' of a line is its mean shade."""
+    crop = gray[line['y']:line['y'] + line['height'], line['x']:line['x'] + line['width']]
+    return [{'text': str(int(crop.mean())), 'confidence': 90.0,
+             'x': line['x'], 'y': line['y'], 'width': line['width'], 'height': line['height']}]
+
+
+def make_reader() -> ScreenReader:
+    reader = ScreenReader(use_easyocr=False, layout_cache=True)
+    # Every test frame is treated as the same screen
+    reader.layout_cache = LayoutCache(max_distance=64)
+    boxes = [{'text': 'line', 'confidence': 90.0, 'x': x, 'y': y, 'width': w, 'height': h}
+             for x, y, w, h in LINES]
+    reader._run_detection_engines = lambda image, processed: {
+        "text": "line line", "confidence": 90.0, "bounding_boxes": [dict(b) for b in boxes], "engine": "fake"}
+    return reader
+
+
+def test_store_copies_boxes():
+    reader = make_reader()
+    first = make_frame(255)
+    result = reader._run_engines(first, first, first)
+    for box in result["bounding_boxes"]:
+        box['x'] += 1000
+
+    entry = reader.layout_cache.lookup(first)
+    assert [line['x'] for line in entry['lines']] == [x for x, _, _, _ in LINES]
+    assert all(word['x'] < 1000 for line in entry['lines'] for word in line['words'])
+
+
+def test_concurrent_frames_through_one_cached_layout():
+    reader = make_reader()
+    first = make_frame(255)
+    reader._run_engines(first, first, first)
+
+    # Both readers recognize their changed line, and both have updated it, before
+    # either one builds its result
+    recognized = threading.Barrier(2, timeout=5)
+    updated = threading.Barrier(2, timeout=5)
+    state = threading.local()
+    line_signature = reader.layout_cache.line_signature
+
+    def recognize(processed, lines):
+        recognized.wait()
+        state.recognized = True
+        return [words_for(processed, line) for line in lines]
+
+    def signature(gray, line):
+        if getattr(state, "recognized", False):
+            state.recognized = False
+            updated.wait()
+        return line_signature(gray, line)
+
+    reader._recognize_lines_tesseract = recognize
+    reader.layout_cache.line_signature = signature
+
+    frames = {0: make_frame(0), 1: make_frame(100)}
+    results = {}
+
+    def read(key):
+        frame = frames[key]
+        results[key] = reader._run_engines(frame, frame, frame)
+
+    threads = [threading.Thread(target=read, args=(key,)) for key in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for key, shade in ((0, 0), (1, 100)):
+        result = results[key]
+        assert result["engine"] == "layout_cache"
+        assert result["layout_cache"]["recognized_lines"] == 1
+        assert result["text"].split()[0] == str(shade)
+
+    # The entry holds one reader's lines, complete and consistent with their signatures
+    entry = reader.layout_cache.lookup(first)
+    line = entry['lines'][0]
+    assert line['text'] in ("0", "100")
+    assert float(line['signature'].mean()) == float(line['text'])
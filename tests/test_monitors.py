@@ -0,0 +1,68 @@
+import subprocess
+
+import pytest
+
+from screenreader import monitors
+from screenreader.monitors import MonitorLayout, monitor_region, parse_monitors
+
+XRANDR_OUTPUT = """Monitors: 3
+ 0: +*DP-1 2560/597x1440/336+0+0  DP-1
+ 1: +HDMI-1 1920/527x1080/296+2560+360  HDMI-1
+ 2: +eDP-1 1920/344x1200/215+-1920+0  eDP-1
+"""
+
+
+def test_parse_monitors():
+    parsed = parse_monitors(XRANDR_OUTPUT)
+    assert [(m["index"], m["name"], m["primary"]) for m in parsed] == [(0, "DP-1", True), (1, "HDMI-1", False),
+                                                                      (2, "eDP-1", False)]
+    assert monitor_region(parsed[1]) == (2560, 360, 1920, 1080)
+    assert monitor_region(parsed[2]) == (-1920, 0, 1920, 1200)
+
+
+def test_parse_xvfb_screen_monitor():
+    assert parse_monitors("Monitors: 1\n 0: +*screen 1280/338x720/190+0+0  screen\n") == [
+        {"index": 0, "name": "screen", "primary": True, "x": 0, "y": 0, "width": 1280, "height": 720}]
+
+
+def fake_xrandr(monkeypatch, stdout="", returncode=0, error=None):
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        if error is not None:
+            raise error
+        return subprocess.CompletedProcess(cmd, returncode, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(monitors.subprocess, "run", run)
+    return calls
+
+
+def test_select_by_index_name_and_primary(monkeypatch):
+    fake_xrandr(monkeypatch, XRANDR_OUTPUT)
+    layout = MonitorLayout()
+    assert layout.select("primary")["name"] == "DP-1"
+    assert layout.select(1)["name"] == "HDMI-1"
+    assert layout.select("2")["name"] == "eDP-1"
+    assert layout.select("HDMI-1")["index"] == 1
+    with pytest.raises(LookupError, match="Unknown monitor"):
+        layout.select("VGA-1")
+
+
+def test_monitor_list_is_cached(monkeypatch):
+    calls = fake_xrandr(monkeypatch, XRANDR_OUTPUT)
+    layout = MonitorLayout(ttl=60)
+    layout.list_monitors()[0]["name"] = "changed"
+    assert layout.list_monitors()[0]["name"] == "DP-1"
+    assert len(calls) == 1
+    layout.list_monitors(refresh=True)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("error", [FileNotFoundError("xrandr"), subprocess.TimeoutExpired("xrandr", 5)])
+def test_unavailable_xrandr_means_no_monitor_list(monkeypatch, error):
+    fake_xrandr(monkeypatch, error=error)
+    layout = MonitorLayout()
+    assert layout.list_monitors() == []
+    with pytest.raises(LookupError, match="No monitors found"):
+        layout.select("primary")
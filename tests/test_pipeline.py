@@ -0,0 +1,99 @@
+import threading
+import time
+
+import numpy as np
+
+from screenreader.pipeline import FrameBuffer, ReadingPipeline
+
+
+def test_full_buffer_drops_the_oldest_item():
+    buffer = FrameBuffer(2)
+    for item in range(5):
+        buffer.put(item)
+    assert len(buffer) == 2 and buffer.dropped == 3
+    assert [buffer.get(timeout=0), buffer.get(timeout=0)] == [3, 4]
+
+
+def test_latest_get_discards_older_items():
+    buffer = FrameBuffer(4)
+    for item in range(3):
+        buffer.put(item)
+    assert buffer.get(timeout=0, latest=True) == 2
+    assert len(buffer) == 0 and buffer.dropped == 2
+
+
+def test_get_times_out_on_an_empty_buffer():
+    buffer = FrameBuffer(1)
+    start = time.time()
+    assert buffer.get(timeout=0.05) is None
+    assert time.time() - start >= 0.04
+
+
+def test_close_wakes_a_waiting_consumer():
+    buffer = FrameBuffer(1)
+    received = []
+    consumer = threading.Thread(target=lambda: received.append(buffer.get()))
+    consumer.start()
+    time.sleep(0.05)
+    buffer.close()
+    consumer.join(2)
+    assert not consumer.is_alive() and received == [None]
+
+
+def test_items_put_before_close_are_still_delivered():
+    buffer = FrameBuffer(2)
+    buffer.put("last")
+    buffer.close()
+    assert buffer.get() == "last"
+    assert buffer.get() is None
+
+
+class FakeReader:
+    """Serves a blank frame and a one-word result per OCR call."""
+
+    def __init__(self, ocr_seconds=0.01):
+        self.ocr_seconds = ocr_seconds
+
+    def capture_screen(self, region=None):
+        return np.zeros((20, 40, 3), dtype=np.uint8)
+
+    def resolve_profile(self, gray, profile=None):
+        return profile or "default"
+
+    def preprocess_image(self, gray, profile=None):
+        return gray
+
+    def _run_engines(self, frame, processed, gray=None):
+        time.sleep(self.ocr_seconds)
+        return {"text": "word", "confidence": 90.0, "bounding_boxes": []}
+
+    def _apply_layout(self, result, layout):
+        return result
+
+
+def test_pipeline_delivers_results_in_frame_order():
+    with ReadingPipeline(FakeReader(), ocr_workers=3, interval=0.002) as pipeline:
+        results = []
+        deadline = time.time() + 5
+        while len(results) < 10 and time.time() < deadline:
+            result = pipeline.get(timeout=1)
+            if result is not None:
+                results.append(result)
+
+    frames = [result["frame"] for result in results]
+    assert len(frames) == 10
+    assert frames == sorted(set(frames))
+    assert all(result["text"] == "word" and result["preprocessing_profile"] == "default" for result in results)
+
+
+def test_pipeline_stats_account_for_every_ocr_result():
+    pipeline = ReadingPipeline(FakeReader(), ocr_workers=2)
+    with pipeline:
+        deadline = time.time() + 5
+        while pipeline.stats()["stages"]["ocr"]["count"] < 5 and time.time() < deadline:
+            time.sleep(0.01)
+
+    stats = pipeline.stats()
+    assert stats["stages"]["ocr"]["count"] >= 5
+    assert stats["delivered"] == stats["stages"]["ocr"]["count"] - stats["dropped"]["stale"]
+    assert stats["delivered"] >= 0 and stats["ocr_workers"] == 2
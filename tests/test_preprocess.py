@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from screenreader import preprocess
+from screenreader.preprocess import (AUTO_PROFILE, compile_preprocessing_pipeline, is_dark_background,
+                                     is_valid_profile, register_profile, register_step, resolve_profile)
+
+
+def screen(background, text):
+    gray = np.full((60, 120), background, dtype=np.uint8)
+    gray[20:40, 10:110:4] = text
+    return gray
+
+
+def test_auto_picks_dark_mode_for_dark_themes():
+    assert resolve_profile(screen(30, 220), AUTO_PROFILE) == "dark_mode"
+    assert resolve_profile(screen(240, 10), AUTO_PROFILE) == "default"
+    assert resolve_profile(screen(30, 220), "low_contrast") == "low_contrast"
+
+
+def test_dark_detection_follows_the_dominant_intensity():
+    # Mostly light pixels with a dark band is still a light theme
+    gray = screen(230, 0)
+    gray[:10] = 0
+    assert not is_dark_background(gray)
+    assert is_dark_background(screen(100, 255))
+
+
+def test_compiled_pipelines_are_cached_per_adjustment():
+    first = compile_preprocessing_pipeline("default")
+    assert compile_preprocessing_pipeline("default") is first
+    assert len(first) == len(preprocess.PREPROCESSING_PROFILES["default"])
+
+    adjusted = compile_preprocessing_pipeline("default", 1.5, 1.0, True)
+    assert adjusted is not first
+    # Contrast/brightness lookup table and median filter come before the profile steps
+    assert len(adjusted) == len(first) + 2
+
+
+def test_contrast_and_brightness_lookup_table():
+    gray = np.array([[0, 64, 128, 200]], dtype=np.uint8)
+    brighten = compile_preprocessing_pipeline("anti_aliased", 1.0, 1.5)[0]
+    assert brighten(gray).tolist() == [[0, 96, 192, 255]]
+    stretch = compile_preprocessing_pipeline("anti_aliased", 2.0, 1.0)[0]
+    assert stretch(gray).tolist() == [[0, 0, 128, 255]]
+
+
+def test_dark_mode_output_matches_default_on_the_inverted_image():
+    dark = screen(30, 220)
+    expected = preprocess.preprocess(255 - dark, "default")
+    np.testing.assert_array_equal(preprocess.preprocess(dark, "dark_mode"), expected)
+
+
+def test_unknown_profiles_are_rejected():
+    assert is_valid_profile(AUTO_PROFILE) and is_valid_profile("default")
+    assert not is_valid_profile("sepia")
+    with pytest.raises(ValueError, match="Unknown preprocessing profile"):
+        compile_preprocessing_pipeline("sepia")
+
+
+def test_registered_profiles_and_steps(monkeypatch):
+    monkeypatch.setattr(preprocess, "PREPROCESSING_PROFILES", dict(preprocess.PREPROCESSING_PROFILES))
+    monkeypatch.setattr(preprocess, "PREPROCESSING_STEPS", dict(preprocess.PREPROCESSING_STEPS))
+    compile_preprocessing_pipeline.cache_clear()
+    try:
+        register_step("double", lambda: lambda img: img * 2)
+        register_profile("doubled", ("double",))
+        assert preprocess.preprocess(np.ones((2, 2), dtype=np.uint8), "doubled").tolist() == [[2, 2], [2, 2]]
+        with pytest.raises(ValueError, match="reserved"):
+            register_profile(AUTO_PROFILE, ("blur",))
+        with pytest.raises(ValueError, match="Unknown preprocessing steps"):
+            register_profile("broken", ("missing",))
+    finally:
+        compile_preprocessing_pipeline.cache_clear()
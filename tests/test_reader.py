@@ -0,0 +1,139 @@
+import cv2
+import numpy as np
+import pytest
+
+from screenreader.reader import ScreenReader
+from screenreader.recording import FrameRecorder
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    # No OCR engines: detection returns one word near the top-left of whatever it is given
+    reader = ScreenReader(use_easyocr=False, use_tesseract=False)
+
+    def detect(image, processed_image):
+        height, width = image.shape[:2]
+        return {"text": "word", "confidence": 80.0, "engine": "tesseract", "image_size": (width, height),
+                "bounding_boxes": [{"text": "word", "x": 2, "y": 3, "width": 10, "height": 5,
+                                    "confidence": 80.0}]}
+
+    monkeypatch.setattr(reader, "_run_detection_engines", detect)
+    return reader
+
+
+def image(width=200, height=100, dark_from=None):
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    if dark_from is not None:
+        pixels[:, dark_from:] = 20
+    return pixels
+
+
+def test_rois_are_clipped_and_boxes_offset_into_image_coordinates(reader):
+    result = reader.process_uploaded_image(image(), rois=[(10, 20, 50, 30), (180, 90, 100, 100)])
+
+    assert [r["roi"] for r in result["regions"]] == [{"x": 10, "y": 20, "width": 50, "height": 30},
+                                                      {"x": 180, "y": 90, "width": 20, "height": 10}]
+    assert [(b["x"], b["y"]) for b in result["bounding_boxes"]] == [(12, 23), (182, 93)]
+    assert result["roi_pixels"] == 50 * 30 + 20 * 10
+    assert result["text"] == "word\nword"
+
+
+def test_roi_outside_the_image_is_rejected(reader):
+    with pytest.raises(ValueError, match="lies outside"):
+        reader.process_uploaded_image(image(), rois=[(300, 0, 10, 10)])
+
+
+def test_roi_results_report_the_resolved_profile(reader):
+    result = reader.process_uploaded_image(image(), rois=[(0, 0, 50, 50)], profile="auto")
+    assert result["preprocessing_profile"] == result["regions"][0]["preprocessing_profile"] == "default"
+
+    result = reader.process_uploaded_image(image(dark_from=100), rois=[(0, 0, 50, 50), (150, 0, 50, 50)],
+                                           profile="auto")
+    assert [r["preprocessing_profile"] for r in result["regions"]] == ["default", "dark_mode"]
+    assert result["preprocessing_profile"] == "mixed"
+
+
+def test_whole_image_reports_the_resolved_profile(reader):
+    assert reader.process_uploaded_image(image(dark_from=0), profile="auto")["preprocessing_profile"] == "dark_mode"
+
+
+class FakeEngine:
+    config = "--psm 6"
+
+    def __init__(self):
+        self.shapes = []
+
+    def extract(self, image):
+        # Reads the whole image as one word
+        self.shapes.append(image.shape)
+        height, width = image.shape[:2]
+        return {"bounding_boxes": [{"text": "word", "x": 0, "y": 0, "width": width, "height": height,
+                                    "confidence": 90.0}]}
+
+
+def test_warm_up_exercises_each_enabled_engine_and_the_pipeline(reader):
+    reader.tesseract_engine = FakeEngine()
+    reader._line_engine = FakeEngine()
+
+    report = reader.warm_up()
+
+    assert set(report["engines"]) == {"tesseract", "tesseract_line"}
+    assert report["engines"]["tesseract"]["config"] == "--psm 6"
+    assert len(reader.tesseract_engine.shapes) == 1
+    # The line engine only sees a single-line crop of the test image
+    assert reader._line_engine.shapes[0][0] == 50
+    assert report["words_found"] == 1
+    assert report["total_seconds"] >= report["pipeline_seconds"] >= 0
+
+
+def test_warm_up_without_engines_still_runs_the_pipeline(reader):
+    report = reader.warm_up()
+    assert report["engines"] == {}
+    assert report["words_found"] == 1
+
+
+@pytest.fixture
+def pointer_reader(tmp_path):
+    # A 640x200 screen with a short label in the bottom-right corner and one long line across the middle
+    screen = np.full((200, 640, 3), 255, dtype=np.uint8)
+    cv2.putText(screen, "Save", (560, 192), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+    cv2.putText(screen, "A long line of menu text across the screen", (60, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                (0, 0, 0), 1)
+    path = str(tmp_path / "screen.frames")
+    with FrameRecorder(path) as recorder:
+        recorder.write(screen, timestamp=0.0)
+
+    reader = ScreenReader(use_easyocr=False, use_tesseract=False, capture_backend="replay",
+                          capture_options={"path": path, "loop": True})
+    reader.tesseract_engine = FakeEngine()
+    reader._line_engine = FakeEngine()
+    return reader
+
+
+def test_pointer_window_is_clipped_at_the_screen_edge(pointer_reader):
+    result = pointer_reader.read_at_pointer(580, 186)
+
+    # The 360x48 window around the pointer runs off the bottom-right corner
+    assert result["window"] == {"x": 400, "y": 162, "width": 240, "height": 38}
+    line = result["line"]
+    assert 550 <= line["x"] <= 560 and line["x"] + line["width"] <= 640
+    assert line["y"] + line["height"] <= 200
+    # Word boxes are reported in screen coordinates
+    word = result["word"]
+    assert (word["x"], word["y"]) == (line["x"], line["y"])
+    assert result["text"] == "word" and result["engine"] == "tesseract"
+
+
+def test_pointer_window_grows_along_a_line_until_the_screen_edge(pointer_reader):
+    result = pointer_reader.read_at_pointer(350, 100)
+
+    # Doubling the width to 720 would pass both screen edges, so the capture is clipped to the screen
+    assert result["window"] == {"x": 0, "y": 76, "width": 640, "height": 48}
+    line = result["line"]
+    assert line["x"] < 70 and line["x"] + line["width"] > 400
+
+
+def test_pointer_over_blank_screen_reads_nothing(pointer_reader):
+    result = pointer_reader.read_at_pointer(639, 199)
+    assert result["window"] == {"x": 459, "y": 175, "width": 181, "height": 25}
+    assert result["line"] is None and result["text"] == "" and result["word"] is None
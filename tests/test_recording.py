@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from screenreader.recording import FrameFile, FrameRecorder, ReplayCapture
+
+
+def frame(value, height=6, width=8):
+    image = np.full((height, width, 3), value, dtype=np.uint8)
+    image[0, 0] = (1, 2, 3)
+    return image
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "session.frames")
+    with FrameRecorder(path) as recorder:
+        recorder.write(frame(10), timestamp=100.0, region=(5, 7, 8, 6))
+        recorder.write(frame(20), timestamp=100.5, region=(5, 7, 8, 6))
+        recorder.write(np.full((4, 4), 30, dtype=np.uint8), timestamp=101.0)
+    return path
+
+
+def test_frames_round_trip(recording):
+    frames = FrameFile(recording)
+    try:
+        assert len(frames) == 3 and frames.duration == 1.0
+        timestamp, region, image = frames[0]
+        assert timestamp == 100.0 and region == (5, 7, 8, 6)
+        np.testing.assert_array_equal(image, frame(10))
+        gray_timestamp, gray_region, gray = frames[2]
+        assert gray.shape == (4, 4) and gray_region == (0, 0, 4, 4) and (gray == 30).all()
+        assert [t for t, _, _ in frames] == [100.0, 100.5, 101.0]
+        # The mapping can only be closed once no frame views are left
+        del image, gray
+    finally:
+        frames.close()
+
+
+def test_recorder_appends_to_an_existing_file(recording):
+    with FrameRecorder(recording) as recorder:
+        recorder.write(frame(40), timestamp=102.0)
+    assert len(FrameFile(recording)) == 4
+
+
+def test_truncated_last_frame_is_ignored(recording):
+    # A recording interrupted halfway through writing a frame's pixels
+    with FrameRecorder(recording) as recorder:
+        recorder.write(frame(40), timestamp=102.0)
+    with open(recording, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 10)
+    assert len(FrameFile(recording)) == 3
+
+
+def test_rejects_files_that_are_not_recordings(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOTFRAMES-123")
+    with pytest.raises(ValueError):
+        FrameFile(str(path))
+
+
+def test_replay_serves_frames_in_order_then_stops(recording):
+    replay = ReplayCapture(recording)
+    assert replay.capture()[1, 1, 0] == 10
+    assert replay.capture()[1, 1, 0] == 20
+    replay.capture()
+    with pytest.raises(EOFError):
+        replay.capture()
+
+
+def test_looping_replay_starts_over(recording):
+    replay = ReplayCapture(recording, loop=True)
+    values = [int(replay.capture()[1, 1, ...].flat[0]) for _ in range(4)]
+    assert values == [10, 20, 30, 10]
+
+
+def test_replay_crops_regions_in_screen_coordinates(recording):
+    replay = ReplayCapture(recording)
+    crop = replay.capture((5, 7, 2, 2))
+    assert crop.shape == (2, 2, 3) and tuple(crop[0, 0]) == (1, 2, 3)
+    crop[:] = 0
+    assert tuple(replay.frames[0][2][0, 0]) == (1, 2, 3)
+    with pytest.raises(ValueError, match="outside the recorded frames"):
+        replay.capture((100, 100, 2, 2))
+
+
+def test_replay_rejects_bad_speed_and_empty_files(tmp_path, recording):
+    with pytest.raises(ValueError):
+        ReplayCapture(recording, speed=0)
+    empty = str(tmp_path / "empty.frames")
+    FrameRecorder(empty).close()
+    with pytest.raises(ValueError, match="no frames"):
+        ReplayCapture(empty)
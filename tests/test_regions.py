@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+
+from screenreader.reader import ScreenReader
+from screenreader.regions import RegionHub, merge_regions
+
+
+def areas_by_keys(merged):
+    return {tuple(sorted(keys)): area for area, keys in merged}
+
+
+def test_disjoint_regions_are_not_merged():
+    merged = merge_regions({1: (0, 0, 10, 10), 2: (20, 0, 10, 10)})
+    assert areas_by_keys(merged) == {(1,): (0, 0, 10, 10), (2,): (20, 0, 10, 10)}
+
+
+def test_overlapping_regions_merge_into_their_bounding_area():
+    merged = merge_regions({1: (0, 0, 10, 10), 2: (5, 5, 10, 10)})
+    assert areas_by_keys(merged) == {(1, 2): (0, 0, 15, 15)}
+
+
+def test_touching_regions_stay_separate():
+    merged = merge_regions({1: (0, 0, 10, 10), 2: (10, 0, 10, 10)})
+    assert len(merged) == 2
+
+
+def test_chained_overlaps_merge_transitively():
+    # 1 and 3 don't overlap, but each overlaps 2
+    regions = {1: (0, 0, 10, 10), 2: (8, 0, 10, 10), 3: (16, 0, 10, 10), 4: (100, 100, 5, 5)}
+    merged = areas_by_keys(merge_regions(regions))
+    assert merged == {(1, 2, 3): (0, 0, 26, 10), (4,): (100, 100, 5, 5)}
+
+
+def test_area_formed_by_a_merge_can_absorb_another_region():
+    # 3 overlaps neither 1 nor 2, only the union of the two
+    regions = {1: (0, 0, 10, 10), 2: (20, 20, 10, 10), 3: (12, 12, 3, 3), 5: (5, 5, 20, 20)}
+    merged = merge_regions(regions)
+    assert len(merged) == 1 and sorted(merged[0][1]) == [1, 2, 3, 5]
+
+
+def test_every_region_lies_inside_its_area():
+    regions = {i: (i * 7 % 50, i * 13 % 40, 12, 9) for i in range(20)}
+    for (ax, ay, aw, ah), keys in merge_regions(regions):
+        for key in keys:
+            x, y, width, height = regions[key]
+            assert ax <= x and ay <= y and x + width <= ax + aw and y + height <= ay + ah
+
+
+def test_slice_result_keeps_words_centred_in_the_region_in_region_coordinates():
+    boxes = [{"text": "in", "x": 12, "y": 2, "width": 6, "height": 4, "confidence": 80.0},
+             {"text": "out", "x": 0, "y": 2, "width": 6, "height": 4, "confidence": 40.0}]
+    result = RegionHub._slice_result((110, 50, 20, 10), (100, 50, 40, 10), boxes, 1.0)
+    assert [(w["text"], w["x"], w["y"]) for w in result["bounding_boxes"]] == [("in", 2, 2)]
+    assert result["text"] == "in" and result["confidence"] == 80.0
+    assert boxes[0]["x"] == 12
+
+
+class FakeReader:
+    """Serves a fixed frame and one word per OCR'd area, counting OCR calls."""
+
+    def __init__(self):
+        self.frame = np.zeros((200, 300, 3), dtype=np.uint8)
+        self.frame[20:40, 20:60] = 255
+        self.ocr_calls = 0
+        self._lock = threading.Lock()
+
+    def capture_screen(self, region=None):
+        return self.frame.copy()
+
+    _clip_roi = ScreenReader._clip_roi
+
+    def resolve_profile(self, gray, profile=None):
+        return "default"
+
+    def preprocess_image(self, gray, profile=None):
+        return gray
+
+    def _run_engines(self, image, processed, gray=None):
+        with self._lock:
+            self.ocr_calls += 1
+        return {"bounding_boxes": [{"text": "word", "x": 25, "y": 25, "width": 20, "height": 10,
+                                    "confidence": 90.0}]}
+
+
+def test_tick_ocrs_each_shared_area_once_and_reuses_unchanged_ones():
+    reader = FakeReader()
+    hub = RegionHub(reader)
+    changes = []
+    first = hub.subscribe(0, 0, 100, 100, callback=lambda key, result: changes.append(key))
+    second = hub.subscribe(50, 50, 100, 100)
+    hub.subscribe(250, 150, 40, 40)
+
+    results = hub.tick()
+    assert reader.ocr_calls == 2
+    assert results[first.id]["text"] == "word" and results[second.id]["text"] == ""
+    assert results[first.id]["shared_area"] == (0, 0, 150, 150)
+
+    results = hub.tick()
+    assert reader.ocr_calls == 2
+    assert not any(result["changed"] for result in results.values())
+    assert changes == [first.id]
+    stats = hub.stats()
+    assert (stats["ticks"], stats["areas_ocrd"], stats["areas_unchanged"]) == (2, 2, 2)
+
+
+def test_concurrent_ticks_keep_consistent_stats():
+    hub = RegionHub(FakeReader())
+    for i in range(4):
+        hub.subscribe(i * 70, 0, 60, 60)
+    threads = [threading.Thread(target=lambda: [hub.tick() for _ in range(10)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = hub.stats()
+    assert stats["ticks"] == 40
+    assert stats["areas_ocrd"] + stats["areas_unchanged"] == 160
@@ -0,0 +1,50 @@
+import pytest
+
+from screenreader.search import could_contain, match_words, region_at_point
+
+
+def words(*texts):
+    return [{'text': text, 'x': 50 * i, 'y': 0, 'width': 40, 'height': 10} for i, text in enumerate(texts)]
+
+
+MENU = words('File', 'Save', 'As...', 'Close')
+
+
+def test_exact_match_is_case_and_whitespace_insensitive():
+    assert match_words('save as', MENU) == (1.0, 1, 3)
+    assert match_words('SAVEAS', MENU) == (1.0, 1, 3)
+
+
+def test_exact_match_prefers_the_tightest_run():
+    # "File Save" also contains "save", but the single word wins
+    assert match_words('Save', MENU) == (1.0, 1, 2)
+
+
+def test_missing_text_does_not_match():
+    assert match_words('Open', MENU) is None
+    assert match_words('   ', MENU) is None
+    assert match_words('Save', []) is None
+
+
+def test_fuzzy_match_tolerates_ocr_noise():
+    noisy = words('File', 'Sane', 'Close')
+    assert match_words('Save', noisy) is None
+    score, start, end = match_words('Save', noisy, fuzzy=True, min_similarity=0.7)
+    assert (start, end) == (1, 2)
+    assert score == pytest.approx(0.75)
+    assert match_words('Save', noisy, fuzzy=True, min_similarity=0.8) is None
+
+
+def test_could_contain_compares_width_to_query_length():
+    line = {'x': 0, 'y': 0, 'width': 15, 'height': 10}
+    assert could_contain(line, 'Close')
+    assert not could_contain(line, 'Close all')
+
+
+def test_region_at_point_picks_the_nearest_line_within_reach():
+    top = {'x': 0, 'y': 0, 'width': 100, 'height': 10}
+    bottom = {'x': 0, 'y': 30, 'width': 100, 'height': 10}
+    assert region_at_point([top, bottom], 50, 5) is top
+    assert region_at_point([top, bottom], 50, 27) is bottom
+    assert region_at_point([top, bottom], 50, 60) is None
+    assert region_at_point([top, bottom], 50, 60, max_distance=25) is bottom
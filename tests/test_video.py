@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+import pytest
+
+from screenreader.video import ScreenIndex, VideoSampler
+
+FPS = 10
+
+
+def screen(dark: bool) -> np.ndarray:
+    frame = np.full((120, 160, 3), 20 if dark else 235, dtype=np.uint8)
+    frame[20:40, 10:150 if dark else 80] = 235 if dark else 20
+    return frame
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Eight seconds at 10 fps: screen A for 3s, screen B for 2s, then A again for 3s."""
+    path = str(tmp_path / "recording.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (160, 120))
+    if not writer.isOpened():
+        pytest.skip("No MJPG video encoder available")
+    for frames, dark in ((30, False), (20, True), (30, False)):
+        for _ in range(frames):
+            writer.write(screen(dark))
+    writer.release()
+    return path
+
+
+def test_sampler_reports_each_screen_change_once(recording):
+    sampler = VideoSampler(recording, min_interval=0.1, max_interval=0.8)
+    changes = [(c["frame_index"], c["screen"], c["new"]) for c in sampler]
+
+    # Changes are seen at the first sample after them; A is recognized when it returns
+    assert changes == [(0, 0, True), (31, 1, True), (54, 0, False)]
+    assert len(sampler.index) == 2
+    assert sampler.frames == 80
+    assert sampler.duration == pytest.approx(8.0)
+
+
+def test_sampling_interval_backs_off_on_a_static_screen(recording):
+    sampler = VideoSampler(recording, min_interval=0.1, max_interval=0.8)
+    list(sampler)
+    # Doubling 1, 2, 4, 8 frames after each change instead of decoding all 80 frames
+    assert sampler.sampled_frames == 17
+
+    dense = VideoSampler(recording, min_interval=0.1, max_interval=0.1)
+    list(dense)
+    assert dense.sampled_frames == 80
+
+
+def test_invalid_intervals_are_rejected(recording):
+    with pytest.raises(ValueError, match="Sampling intervals"):
+        VideoSampler(recording, min_interval=0)
+    with pytest.raises(ValueError, match="Sampling intervals"):
+        VideoSampler(recording, min_interval=2, max_interval=1)
+
+
+def test_unreadable_video_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Could not open video file"):
+        list(VideoSampler(str(tmp_path / "missing.avi")))
+
+
+def test_screen_index_matches_known_screens():
+    index = ScreenIndex()
+    light = index.signature(cv2.cvtColor(screen(False), cv2.COLOR_BGR2GRAY))
+    dark = index.signature(cv2.cvtColor(screen(True), cv2.COLOR_BGR2GRAY))
+    assert index.match(light) is None
+    assert index.add(light) == 0
+    assert index.add(dark) == 1
+    assert index.match(light, preferred=1) == 0
@@ -0,0 +1,81 @@
+import pytest
+
+from screenreader.regions import RegionHub
+from screenreader.watch import Watcher, compile_pattern
+
+
+@pytest.fixture
+def watcher():
+    # Subscriptions are driven by hand, so the hub never captures
+    return Watcher(RegionHub(reader=None))
+
+
+def deliver(watcher, watch, text, **extra):
+    subscription = watcher.hub.get(watch.subscription_id)
+    subscription.callback(subscription.id, dict({"text": text, "timestamp": 1.0}, **extra))
+
+
+def test_watch_fires_once_per_rising_edge(watcher):
+    events = []
+    watch = watcher.add(0, 0, 100, 20, pattern=r"error \d+", callback=events.append)
+
+    deliver(watcher, watch, "all good")
+    deliver(watcher, watch, "Error 42 occurred")
+    deliver(watcher, watch, "error 42 still there")
+    assert [event["matches"] for event in events] == [["Error 42"]]
+    assert watch.matching and watch.fired == 1 and watch.evaluations == 3
+
+    deliver(watcher, watch, "all good again")
+    assert not watch.matching
+    deliver(watcher, watch, "error 7")
+    assert len(events) == 2 and watch.fired == 2
+    assert [event["sequence"] for event in watcher.events()] == [1, 2]
+    assert [event["sequence"] for event in watcher.events(after=1)] == [2]
+
+
+def test_failed_reads_neither_fire_nor_rearm(watcher):
+    watch = watcher.add(0, 0, 100, 20, keywords=["ready"])
+    deliver(watcher, watch, "ready")
+    deliver(watcher, watch, "", error="Region lies outside the screen")
+    assert watch.matching and watch.evaluations == 1
+    deliver(watcher, watch, "ready")
+    assert watch.fired == 1
+
+
+def test_callback_errors_do_not_stop_events(watcher):
+    def fail(event):
+        raise RuntimeError("boom")
+
+    watch = watcher.add(0, 0, 100, 20, keywords=["done"], callback=fail)
+    deliver(watcher, watch, "done")
+    assert watch.fired == 1 and len(watcher.events()) == 1
+
+
+def test_removed_watch_unsubscribes(watcher):
+    watch = watcher.add(0, 0, 100, 20, keywords=["x"])
+    assert watcher.remove(watch.id)
+    assert watcher.hub.get(watch.subscription_id) is None
+    assert not watcher.remove(watch.id)
+
+
+def test_invalid_watches_are_rejected(watcher):
+    with pytest.raises(ValueError):
+        watcher.add(0, 0, 100, 20, keywords=["x"], webhook="ftp://example.com")
+    with pytest.raises(ValueError):
+        watcher.add(0, 0, 0, 20, keywords=["x"])
+    assert watcher.list() == [] and watcher.hub.list() == []
+
+
+def test_keywords_match_whole_words_only():
+    expression = compile_pattern(keywords=["cat", " ", "a.b"])
+    assert expression.search("The CAT sat")
+    assert not expression.search("concatenate")
+    assert expression.search("a.b") and not expression.search("axb")
+
+
+def test_compile_pattern_errors():
+    with pytest.raises(ValueError, match="pattern or at least one keyword"):
+        compile_pattern()
+    with pytest.raises(ValueError, match="Invalid pattern"):
+        compile_pattern("(unclosed")
+    assert not compile_pattern("Ready", ignore_case=False).search("ready")
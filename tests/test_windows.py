@@ -0,0 +1,80 @@
+import subprocess
+
+import pytest
+
+from screenreader import windows
+from screenreader.windows import WindowLocator, parse_window_id, parse_window_tree
+
+XWININFO_TREE = """
+xwininfo: Window id: 0x1d4 (the root window) (has no name)
+
+  Root window id: 0x1d4 (the root window) (has no name)
+  Parent window id: 0x0 (none)
+     4 children:
+     0x1a00007 "Terminal": ("xterm" "XTerm")  800x600+10+20  +10+20
+        1 child:
+        0x1a00008 (has no name): ()  800x600+0+0  +10+20
+     0x2000003 "Invoice - Editor": ("editor" "Editor")  1024x768+-50+100  +-50+100
+     0x2200001 "tiny": ("helper" "Helper")  1x1+0+0  +0+0
+     0x2400005 "Invoice - Browser": ("browser" "Browser")  640x480+900+300  +900+300
+"""
+
+XWININFO_ROOT = """
+xwininfo: Window id: 0x1d4 (the root window) (has no name)
+
+  Absolute upper-left X:  0
+  Absolute upper-left Y:  0
+  Width: 1600
+  Height: 900
+"""
+
+
+def test_parse_window_tree_keeps_named_windows_in_stacking_order():
+    parsed = parse_window_tree(XWININFO_TREE)
+    assert [w["title"] for w in parsed] == ["Terminal", "Invoice - Editor", "Invoice - Browser"]
+    assert parsed[0] == {"id": 0x1a00007, "title": "Terminal", "instance": "xterm", "wm_class": "XTerm",
+                         "x": 10, "y": 20, "width": 800, "height": 600}
+    assert (parsed[1]["x"], parsed[1]["y"]) == (-50, 100)
+
+
+def test_parse_window_id():
+    assert parse_window_id("0x1a00007") == 0x1a00007
+    assert parse_window_id("27262983") == 27262983
+    assert parse_window_id(5) == 5
+
+
+@pytest.fixture
+def locator(monkeypatch):
+    def run(cmd, **kwargs):
+        stdout = XWININFO_TREE if "-tree" in cmd else XWININFO_ROOT
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(windows.subprocess, "run", run)
+    return WindowLocator()
+
+
+def test_find_prefers_the_topmost_match(locator):
+    assert locator.find(title="invoice")["wm_class"] == "Browser"
+    assert locator.find(wm_class="editor")["title"] == "Invoice - Editor"
+    assert locator.find(window_id="0x1a00007")["title"] == "Terminal"
+    assert locator.find(title="missing") is None
+    with pytest.raises(ValueError):
+        locator.find()
+
+
+def test_visible_region_is_clipped_to_the_screen(locator):
+    assert locator.screen_size() == (1600, 900)
+    editor = locator.find(title="Editor")
+    assert locator.visible_region(editor) == (0, 100, 974, 768)
+    assert locator.visible_region(dict(editor, x=2000)) is None
+
+
+@pytest.mark.parametrize("error, message", [(FileNotFoundError("xwininfo"), "requires xwininfo"),
+                                            (subprocess.TimeoutExpired("xwininfo", 5), "timed out")])
+def test_xwininfo_failures_raise_runtime_error(monkeypatch, error, message):
+    def run(cmd, **kwargs):
+        raise error
+
+    monkeypatch.setattr(windows.subprocess, "run", run)
+    with pytest.raises(RuntimeError, match=message):
+        WindowLocator().list_windows()
@@ -0,0 +1,288 @@
+"""
+Admission control for OCR requests.
+
+Every request that runs OCR passes through two gates before it touches the
+shared ScreenReader:
+
+* RateLimiter - a token bucket per client and traffic class, so one client
+  cannot monopolise the service. Over-limit requests are refused with 429.
+* AdmissionController - a fixed number of OCR slots handed out in priority
+  order. Interactive captures overtake queued uploads, slots can be reserved
+  for interactive work, requests are shed with 503 once too much work is
+  waiting ahead of them, and a request whose deadline passes while it waits
+  is dropped (504) before any OCR is done for it.
+
+The controller also provides an exclusive section used when the ScreenReader
+is replaced, so configuration reloads never run in the middle of a request.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+
+# Work at or above this priority (lower value) may use reserved slots.
+# Matches the "high" class of app.jobs.PRIORITIES.
+INTERACTIVE_PRIORITY = 0
+
+# Header carrying a client's time budget in seconds, measured from arrival
+TIMEOUT_HEADER = "x-request-timeout"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused before it starts."""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def headers(self) -> Optional[Dict[str, str]]:
+        if self.retry_after is None:
+            return None
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class RateLimited(AdmissionRejected):
+    status_code = 429
+
+
+class Overloaded(AdmissionRejected):
+    status_code = 503
+
+
+class DeadlineExceeded(AdmissionRejected):
+    status_code = 504
+
+
+class TokenBucket:
+    """Classic token bucket: refills at rate tokens per second up to burst."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """
+        Try to spend tokens.
+
+        Args:
+            cost: Tokens the request costs
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until enough are available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by (client, traffic class).
+
+    Args:
+        limits: Traffic class -> (requests per second, burst size). Classes that
+            are missing or have a rate of 0 are not limited.
+        max_clients: Least recently seen buckets beyond this count are dropped
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], max_clients: int = 10000):
+        self.limits = limits
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client: str, traffic_class: str):
+        """Spend one token for the client, raising RateLimited if none are left."""
+        rate, burst = self.limits.get(traffic_class, (0, 0))
+        if rate <= 0:
+            return
+        key = (client, traffic_class)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, max(1.0, burst))
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.take()
+        if wait > 0:
+            raise RateLimited(f"Rate limit exceeded for {traffic_class} requests", retry_after=wait)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            clients = len(self._buckets)
+        return {"limits": {name: {"rate": rate, "burst": burst} for name, (rate, burst) in self.limits.items()},
+                "tracked_clients": clients}
+
+
+class AdmissionController:
+    """
+    Priority-ordered OCR slots with load shedding and deadlines.
+
+    Args:
+        slots: OCR operations allowed to run at once
+        reserved: Slots only interactive work (priority <= INTERACTIVE_PRIORITY)
+            may use, so a long upload never occupies the last free slot
+        max_waiting: A request is shed when this many requests of the same or
+            higher priority are already waiting
+    """
+
+    def __init__(self, slots: int = 1, reserved: int = 0, max_waiting: int = 16):
+        self.slots = max(1, slots)
+        self.reserved = min(max(0, reserved), self.slots - 1)
+        self.max_waiting = max(0, max_waiting)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._counter = itertools.count()
+        self._running = 0
+        self._paused = 0
+        self._counts = {"admitted": 0, "shed": 0, "expired": 0}
+
+    def _capacity(self, priority: int) -> int:
+        return self.slots if priority <= INTERACTIVE_PRIORITY else self.slots - self.reserved
+
+    def _ahead(self, priority: int) -> int:
+        return sum(1 for p, _ in self._waiting if p <= priority)
+
+    def check(self, priority: int):
+        """Raise Overloaded if a request at this priority would be shed right now."""
+        with self._cond:
+            if self._ahead(priority) >= self.max_waiting:
+                self._counts["shed"] += 1
+                raise Overloaded("Server is busy, try again later", retry_after=1)
+
+    def acquire(self, priority: int, deadline: Optional[float] = None):
+        """
+        Wait for an OCR slot.
+
+        Args:
+            priority: Lower values are admitted first
+            deadline: time.time() after which the request is no longer wanted
+
+        Raises:
+            Overloaded: Too many requests are already waiting ahead
+            DeadlineExceeded: The deadline passed before a slot became free
+        """
+        with self._cond:
+            if deadline is not None and time.time() >= deadline:
+                self._counts["expired"] += 1
+                raise DeadlineExceeded("Request deadline passed before processing started")
+            if not self._paused and not self._waiting and self._running < self._capacity(priority):
+                self._running += 1
+                self._counts["admitted"] += 1
+                return
+            if self._ahead(priority) >= self.max_waiting:
+                self._counts["shed"] += 1
+                raise Overloaded("Server is busy, try again later", retry_after=1)
+
+            entry = (priority, next(self._counter))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if (not self._paused and self._waiting[0] == entry
+                            and self._running < self._capacity(priority)):
+                        heapq.heappop(self._waiting)
+                        self._running += 1
+                        self._counts["admitted"] += 1
+                        # The next waiter may fit in a remaining slot
+                        self._cond.notify_all()
+                        return
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        self._waiting.remove(entry)
+                        heapq.heapify(self._waiting)
+                        self._counts["expired"] += 1
+                        self._cond.notify_all()
+                        raise DeadlineExceeded("Request deadline passed before processing started")
+                    self._cond.wait(remaining)
+            except BaseException:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def release(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def run(self, priority: int, deadline: Optional[float], fn: Callable, *args, **kwargs):
+        """Run fn in an OCR slot, blocking the calling thread until one is free."""
+        self.acquire(priority, deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release()
+
+    @contextmanager
+    def exclusive(self):
+        """Stop admitting work and wait for running work to finish, e.g. to swap the reader."""
+        with self._cond:
+            self._paused += 1
+            while self._running:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._paused -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {"slots": self.slots, "reserved": self.reserved, "max_waiting": self.max_waiting,
+                    "running": self._running, "waiting": len(self._waiting), **self._counts}
+
+
+def client_key(request: Request, trust_forwarded: bool = False) -> str:
+    """Identify the client a request counts against."""
+    if trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def request_deadline(request: Request, default_timeout: Optional[float]) -> Optional[float]:
+    """
+    Absolute deadline for a request from its X-Request-Timeout header.
+
+    Args:
+        request: Incoming request
+        default_timeout: Seconds allowed when the header is absent (None for no deadline)
+
+    Returns:
+        time.time() deadline, or None
+    """
+    timeout = default_timeout
+    header = request.headers.get(TIMEOUT_HEADER)
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = 0
+        if requested > 0:
+            # Clients may tighten but not extend the server's budget
+            timeout = requested if default_timeout is None else min(requested, default_timeout)
+    if timeout is None or timeout <= 0:
+        return None
+    return time.time() + timeout
@@ -0,0 +1,343 @@
+"""
+Job queue for long-running OCR requests.
+
+Submitting work returns a job ID immediately; worker threads process jobs in
+priority order and clients poll or subscribe for the result. Job state lives
+in a pluggable JobBackend - InMemoryJobBackend is the in-process default and
+the reference for alternative backends.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Named priority classes; lower values run first. Non-negative integers are accepted as well.
+PRIORITIES = {"high": 0, "normal": 5, "low": 10}
+
+# Queued jobs hold their payload (uploads keep the decoded image), so the queue is bounded by default
+DEFAULT_MAX_QUEUED = 100
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when max_queued jobs are already waiting."""
+
+
+def resolve_priority(priority) -> int:
+    """
+    Convert a priority class name or integer into a queue priority.
+
+    Args:
+        priority: "high", "normal", "low" or a non-negative integer (lower runs first)
+
+    Returns:
+        Integer priority
+    """
+    if isinstance(priority, str) and not priority.lstrip("-").isdigit():
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Use one of {', '.join(PRIORITIES)} or an integer")
+        return PRIORITIES[priority]
+    if int(priority) < 0:
+        raise ValueError("Priority can't be negative")
+    return int(priority)
+
+
+class Job:
+    """A unit of OCR work and its lifecycle state."""
+
+    def __init__(self, kind: str, payload: Dict[str, Any], priority: int = PRIORITIES["normal"],
+                 deadline: Optional[float] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.priority = priority
+        # time.time() after which the handler should not start the work
+        self.deadline = deadline
+        self.status = QUEUED
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+        # Bumped on every state change so subscribers can wait for updates
+        self.version = 0
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "deadline": self.deadline,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.status == SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+
+class JobBackend(ABC):
+    """
+    Storage and ordering for jobs. A backend must provide priority-ordered
+    dispatch, blocking waits for state changes, and removal of expired jobs.
+    """
+
+    @abstractmethod
+    def put(self, job: Job, max_queued: Optional[int] = None):
+        """
+        Store a new job.
+
+        The limit check and the insert must be atomic, so concurrent submissions
+        can't overshoot max_queued.
+
+        Raises:
+            QueueFull: max_queued jobs are already queued
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID."""
+
+    @abstractmethod
+    def next(self, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Claim the highest-priority queued job, waiting up to timeout seconds.
+
+        The job must be marked RUNNING (with started_at set) atomically with
+        taking it, so a concurrent cancel() either sees it still QUEUED and it
+        is never returned, or sees it RUNNING and leaves its payload alone.
+        """
+
+    @abstractmethod
+    def update(self, job: Job, expect: Optional[str] = None, **changes) -> bool:
+        """
+        Apply attribute changes to a job and notify subscribers.
+
+        Args:
+            job: Job to change
+            expect: Only apply the changes if the job is still in this state
+            **changes: Attribute values to set
+
+        Returns:
+            Whether the changes were applied
+        """
+
+    @abstractmethod
+    def wait_for_update(self, job_id: str, version: int, timeout: float) -> Optional[Job]:
+        """Block until the job's version differs from version or timeout expires."""
+
+    @abstractmethod
+    def remove_expired(self, ttl: float) -> int:
+        """Drop finished jobs older than ttl seconds. Returns the number removed."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+
+
+class InMemoryJobBackend(JobBackend):
+    """Process-local backend using a heap for ordering and a condition variable for wakeups."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        # Jobs still in the QUEUED state, kept so the limit check doesn't scan every job
+        self._queued = 0
+
+    def put(self, job: Job, max_queued: Optional[int] = None):
+        with self._cond:
+            if max_queued is not None and self._queued >= max_queued:
+                raise QueueFull(f"{max_queued} jobs are already queued")
+            self._jobs[job.id] = job
+            self._queued += job.status == QUEUED
+            # The counter keeps FIFO order within a priority class
+            heapq.heappush(self._heap, (job.priority, next(self._counter), job.id))
+            self._cond.notify_all()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def next(self, timeout: Optional[float] = None) -> Optional[Job]:
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, job_id = heapq.heappop(self._heap)
+                    job = self._jobs.get(job_id)
+                    # Cancelled or expired jobs are skipped lazily instead of being
+                    # removed from the middle of the heap
+                    if job is not None and job.status == QUEUED:
+                        self._queued -= 1
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        job.version += 1
+                        self._cond.notify_all()
+                        return job
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def update(self, job: Job, expect: Optional[str] = None, **changes) -> bool:
+        with self._cond:
+            if expect is not None and job.status != expect:
+                return False
+            if job.status == QUEUED and changes.get("status", QUEUED) != QUEUED:
+                self._queued -= 1
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.version += 1
+            self._cond.notify_all()
+            return True
+
+    def wait_for_update(self, job_id: str, version: int, timeout: float) -> Optional[Job]:
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job.version != version:
+                    return job
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return job
+                self._cond.wait(remaining)
+
+    def remove_expired(self, ttl: float) -> int:
+        cutoff = time.time() - ttl
+        with self._cond:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.status in FINISHED_STATES and (job.finished_at or 0) < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            if expired:
+                self._cond.notify_all()
+            return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            counts = {state: 0 for state in (QUEUED, RUNNING) + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a pool of worker threads.
+
+    The handler receives the Job and returns its result dictionary; it is looked
+    up per job, so workers always use the application's current ScreenReader.
+    """
+
+    def __init__(self, handler: Callable[[Job], Dict], backend: Optional[JobBackend] = None,
+                 workers: int = 1, result_ttl: float = 3600.0, max_queued: Optional[int] = DEFAULT_MAX_QUEUED):
+        self.handler = handler
+        self.backend = backend or InMemoryJobBackend()
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ocr-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority="normal",
+               deadline: Optional[float] = None) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job type understood by the handler
+            payload: Handler arguments
+            priority: Priority class name or integer
+            deadline: time.time() after which the handler should not start the work
+
+        Raises:
+            QueueFull: max_queued jobs are already waiting
+        """
+        job = Job(kind, payload, resolve_priority(priority), deadline)
+        self.backend.put(job, self.max_queued)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.backend.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job. Queued jobs never start; running jobs are flagged and their
+        result is discarded when the handler returns.
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        job = self.backend.get(job_id)
+        if job is None:
+            return None
+        # Conditional updates, so a worker claiming the job in between can't be overridden
+        if not self.backend.update(job, expect=QUEUED, status=CANCELLED, cancel_requested=True,
+                                   finished_at=time.time(), payload={}):
+            self.backend.update(job, expect=RUNNING, cancel_requested=True)
+        return job
+
+    def wait_for_update(self, job_id: str, version: int, timeout: float = 15.0) -> Optional[Job]:
+        return self.backend.wait_for_update(job_id, version, timeout)
+
+    def stats(self) -> Dict:
+        return {"workers": self.workers, "result_ttl": self.result_ttl, "max_queued": self.max_queued,
+                "jobs": self.backend.stats()}
+
+    def _worker(self):
+        last_purge = time.time()
+        while not self._stop.is_set():
+            if time.time() - last_purge > min(60.0, self.result_ttl):
+                self.backend.remove_expired(self.result_ttl)
+                last_purge = time.time()
+
+            # next() has already marked the job RUNNING
+            job = self.backend.next(timeout=1.0)
+            if job is None:
+                continue
+
+            try:
+                result = self.handler(job)
+            except Exception as e:
+                traceback.print_exc()
+                self.backend.update(job, status=FAILED, error=str(e), finished_at=time.time(), payload={})
+                continue
+
+            if job.cancel_requested:
+                self.backend.update(job, status=CANCELLED, finished_at=time.time(), payload={})
+            else:
+                self.backend.update(job, status=SUCCEEDED, result=result, finished_at=time.time(), payload={})
@@ -1,15 +1,29 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
-import sys
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List, Tuple
+import anyio
 import os
+import json
+from urllib.parse import urlparse
+import tempfile
+import threading
 import cv2
 import numpy as np
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
-
-from screen_reader import ScreenReader
+from screenreader import ScreenReader, PREPROCESSING_PROFILES, AUTO_PROFILE, EASYOCR_MODES, LAYOUT_LEVELS
+from screenreader.serialization import json_default
+from screenreader.documents import count_pages
+from screenreader.fields import FIELD_TYPES, check_field_options
+from screenreader.regions import RegionHub
+from screenreader.watch import Watcher
+from app.storage import create_history_store, DEFAULT_PAGE_SIZE
+from app.jobs import JobQueue, QueueFull, FINISHED_STATES, PRIORITIES, CANCELLED, DEFAULT_MAX_QUEUED
+from app.admission import (AdmissionController, AdmissionRejected, RateLimiter, client_key,
+                           request_deadline, INTERACTIVE_PRIORITY)
+from app.responses import ResponseOptions, response_options, render, trim_result
 
 app = FastAPI(title="Screen Reader API", version="1.0.0")
 
@@ -22,37 +36,339 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Capture backend and EasyOCR CPU inference settings for the deployment (see ScreenReader.__init__)
+reader_options = {
+    "capture_backend": os.environ.get("CAPTURE_BACKEND", "scrot"),
+    "capture_options": json.loads(os.environ.get("CAPTURE_OPTIONS") or "{}"),
+    "easyocr_mode": os.environ.get("EASYOCR_MODE", "default"),
+    "easyocr_threads": int(os.environ["EASYOCR_THREADS"]) if os.environ.get("EASYOCR_THREADS") else None,
+    "easyocr_interop_threads": int(os.environ["EASYOCR_INTEROP_THREADS"]) if os.environ.get("EASYOCR_INTEROP_THREADS") else None,
+}
+
 try:
-    screen_reader = ScreenReader(use_easyocr=True, use_tesseract=True)
+    screen_reader = ScreenReader(use_easyocr=True, use_tesseract=True, **reader_options)
     print("Initialized with both EasyOCR and Tesseract")
 except Exception as e:
     print(f"Failed to initialize with Tesseract, falling back to EasyOCR only: {e}")
-    screen_reader = ScreenReader(use_easyocr=True, use_tesseract=False)
+    screen_reader = ScreenReader(use_easyocr=True, use_tesseract=False, **reader_options)
+
+history_store = create_history_store()
+
+def env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+# Token buckets per client: interactive captures vs uploads and job submissions.
+# A rate of 0 disables the limit for that class.
+rate_limiter = RateLimiter({
+    "interactive": (env_float("RATE_LIMIT_INTERACTIVE_RPS", 5.0), env_float("RATE_LIMIT_INTERACTIVE_BURST", 10.0)),
+    "bulk": (env_float("RATE_LIMIT_BULK_RPS", 1.0), env_float("RATE_LIMIT_BULK_BURST", 5.0)),
+})
+trust_forwarded_for = os.environ.get("TRUST_FORWARDED_FOR", "").lower() in ("1", "true", "yes")
+
+# OCR slots shared by request handlers and job workers. With more than one slot,
+# OCR_RESERVED_SLOTS of them are kept free for interactive captures.
+admission = AdmissionController(
+    slots=int(os.environ.get("OCR_CONCURRENCY", "2")),
+    reserved=int(os.environ.get("OCR_RESERVED_SLOTS", "1")),
+    max_waiting=int(os.environ.get("MAX_WAITING_REQUESTS", "16"))
+)
+
+# OCR threads a single document or video may run inside its one slot, so multi-page
+# work can't occupy every core and bypass OCR_CONCURRENCY
+SLOT_OCR_WORKERS = max(1, int(os.environ.get("SLOT_OCR_WORKERS", "1")))
+
+# Seconds a request may wait for an OCR slot before it is dropped unstarted
+REQUEST_TIMEOUTS = {
+    "interactive": env_float("INTERACTIVE_REQUEST_TIMEOUT", 10.0),
+    "bulk": env_float("BULK_REQUEST_TIMEOUT", 120.0),
+}
+
+# Region subscriptions share one capture per tick; ticks take a low-priority OCR slot
+region_hub = RegionHub(screen_reader, interval=env_float("SUBSCRIPTION_INTERVAL", 1.0),
+                       run=lambda tick: admission.run(PRIORITIES["low"], None, tick))
+
+# Text watches ride on the region subscriptions; webhooks may only target these hosts
+watcher = Watcher(region_hub)
+watch_webhook_hosts = {h.strip() for h in os.environ.get("WATCH_WEBHOOK_HOSTS", "localhost,127.0.0.1,::1").split(",")
+                       if h.strip()}
+
+# Readiness: /ready reports 503 until the startup warm-up has finished
+warmup_enabled = os.environ.get("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+readiness = {"ready": not warmup_enabled, "warmup": None, "error": None}
+
+def run_warmup():
+    """Warm up the screen reader while holding back OCR requests, then mark the instance ready."""
+    try:
+        with admission.exclusive():
+            readiness["warmup"] = screen_reader.warm_up()
+    except Exception as e:
+        # A failed warm-up only means the first request is slow; still serve traffic
+        print(f"API: Warm-up failed: {e}")
+        readiness["error"] = str(e)
+    readiness["ready"] = True
+
+@app.on_event("startup")
+def start_warmup():
+    if warmup_enabled:
+        threading.Thread(target=run_warmup, name="ocr-warmup", daemon=True).start()
+
+class Ticket:
+    """Admission details for a request that passed the rate limiter."""
+
+    def __init__(self, priority: int, deadline: Optional[float]):
+        self.priority = priority
+        self.deadline = deadline
+
+def admit(traffic_class: str, priority: str, default_timeout: Optional[float] = None):
+    """
+    Build a dependency that rate-limits a request and assigns its priority and deadline.
+
+    Args:
+        traffic_class: "interactive" or "bulk" (rate limit bucket)
+        priority: Priority class from PRIORITIES used when waiting for an OCR slot
+        default_timeout: Seconds the request may wait, overriding the class default
+            (0 means no deadline unless the client sends one)
+    """
+    timeout = REQUEST_TIMEOUTS[traffic_class] if default_timeout is None else default_timeout
+
+    def dependency(http_request: Request) -> Ticket:
+        try:
+            rate_limiter.check(client_key(http_request, trust_forwarded_for), traffic_class)
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers())
+        return Ticket(PRIORITIES[priority], request_deadline(http_request, timeout or None))
+
+    return dependency
+
+async def run_admitted(ticket: Ticket, fn):
+    """
+    Run blocking OCR work in the threadpool once an OCR slot is free.
+
+    fn should look up screen_reader when called, so work admitted after a
+    configuration reload uses the new reader.
+    """
+    try:
+        return await run_in_threadpool(admission.run, ticket.priority, ticket.deadline, fn)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers())
 
 class CaptureRequest(BaseModel):
     x: Optional[int] = None
     y: Optional[int] = None
     width: Optional[int] = None
     height: Optional[int] = None
+    profile: Optional[str] = None
+    layout: Optional[str] = None
+
+class WindowCaptureRequest(BaseModel):
+    title: Optional[str] = None
+    wm_class: Optional[str] = None
+    window_id: Optional[str] = None
+    profile: Optional[str] = None
+    layout: Optional[str] = None
+
+class FindTextRequest(BaseModel):
+    query: str
+    x: Optional[int] = None
+    y: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fuzzy: bool = False
+    min_similarity: float = 0.8
+    min_confidence: float = 60.0
+    profile: Optional[str] = None
+
+class FieldRequest(BaseModel):
+    name: Optional[str] = None
+    x: int
+    y: int
+    width: int
+    height: int
+    type: str = "line"
+    allowlist: Optional[str] = Field(None, max_length=256)
+    psm: Optional[int] = Field(None, ge=0, le=13, strict=True)
+
+    @field_validator("allowlist")
+    @classmethod
+    def check_allowlist(cls, allowlist: Optional[str]) -> Optional[str]:
+        check_field_options(allowlist=allowlist)
+        return allowlist
+
+class FieldsRequest(BaseModel):
+    fields: List[FieldRequest]
+
+class SubscriptionRequest(BaseModel):
+    x: int
+    y: int
+    width: int
+    height: int
+
+class WatchRequest(SubscriptionRequest):
+    pattern: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    ignore_case: bool = True
+    webhook: Optional[str] = None
+
+class CaptureJobRequest(CaptureRequest):
+    priority: str = "normal"
 
 class ConfigRequest(BaseModel):
     use_easyocr: bool = True
     use_tesseract: bool = True
+    preprocessing_profile: str = "default"
+    layout_cache: bool = False
+    easyocr_mode: Optional[str] = None
+
+def parse_rois(rois: Optional[str]) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    Parse a JSON list of regions of interest, given either as [x, y, width, height]
+    arrays or as objects with x, y, width and height keys.
+    """
+    if not rois:
+        return None
+    try:
+        parsed = json.loads(rois)
+        if isinstance(parsed, dict):
+            parsed = [parsed]
+        regions = []
+        for roi in parsed:
+            if isinstance(roi, dict):
+                roi = [roi["x"], roi["y"], roi["width"], roi["height"]]
+            x, y, width, height = (int(v) for v in roi)
+            if width <= 0 or height <= 0:
+                raise ValueError("width and height must be positive")
+            regions.append((x, y, width, height))
+        return regions
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rois: {e}")
+
+def validate_priority(priority: str):
+    """Reject unknown priority classes and negative priorities with a 400."""
+    if priority not in PRIORITIES and not priority.isdigit():
+        raise HTTPException(status_code=400, detail=f"Unknown priority: {priority}")
+
+def validate_layout(layout: Optional[str]):
+    """Reject unknown layout levels with a 400."""
+    if layout is not None and layout not in LAYOUT_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Unknown layout level: {layout}")
+
+def validate_profile(profile: Optional[str]):
+    """Reject unknown preprocessing profile names with a 400."""
+    if profile is not None and profile != AUTO_PROFILE and profile not in PREPROCESSING_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown preprocessing profile: {profile}")
+
+async def save_upload(file: UploadFile) -> str:
+    """Stream an uploaded file to a temporary path (video decoders need a real file)."""
+    suffix = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="upload_") as tmp:
+        while True:
+            chunk = await file.read(1024 * 1024)
+            if not chunk:
+                break
+            tmp.write(chunk)
+        return tmp.name
+
+def record_history(result: Dict[str, Any], source: str, filename: Optional[str] = None):
+    """Persist a result to the history store without failing the request on storage errors."""
+    if history_store is None:
+        return
+    try:
+        result["history_id"] = history_store.add(result, source, filename)
+    except Exception as e:
+        print(f"API: Failed to save result to history: {e}")
+
+def progressive_response(http_request: Request, ticket: Ticket, produce, source: str,
+                         filename: Optional[str] = None,
+                         options: Optional[ResponseOptions] = None) -> StreamingResponse:
+    """
+    Stream a progressive OCR run as server-sent events: a "partial" event with
+    Tesseract's result as soon as it is ready, then a "final" event with the
+    merged result. The run holds one OCR slot; only the final result is saved
+    to history. A client that disconnects stops the run after the current
+    engine, and the slot is released however the stream ends.
+    """
+    try:
+        admission.check(ticket.priority)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers())
+    
+    async def event_stream():
+        # The blocking steps run in the threadpool; events are sent as each engine finishes
+        state = {"acquired": False, "results": None}
+
+        def acquire():
+            admission.acquire(ticket.priority, ticket.deadline)
+            # Set in the worker thread, so a cancelled await can't lose track of the slot
+            state["acquired"] = True
+
+        def finish():
+            # Closing the producer waits for an engine that is still running, so
+            # the slot is only freed once its OCR has actually stopped
+            try:
+                if state["results"] is not None:
+                    state["results"].close()
+            finally:
+                if state["acquired"]:
+                    admission.release()
+
+        try:
+            try:
+                await run_in_threadpool(acquire)
+            except AdmissionRejected as e:
+                yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+                return
+            state["results"] = produce()
+            while True:
+                result = await run_in_threadpool(next, state["results"], None)
+                if result is None:
+                    break
+                if result["final"]:
+                    await run_in_threadpool(record_history, result, source, filename)
+                data = json.dumps(trim_result(result, options), default=json_default)
+                yield f"event: {result['stage']}\ndata: {data}\n\n"
+                if await http_request.is_disconnected():
+                    print("API: Client disconnected from progressive OCR stream")
+                    break
+        except Exception as e:
+            print(f"API: Error during progressive OCR: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # Shielded: this also runs when the stream is cancelled on disconnect
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(finish)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 @app.get("/")
 def read_root():
     return {"message": "Screen Reader Computer Vision API", "version": "1.0.0"}
 
 @app.post("/api/capture/screen")
-async def capture_screen():
-    """Capture and read the entire screen."""
+async def capture_screen(http_request: Request, profile: Optional[str] = None, layout: Optional[str] = None,
+                         monitor: Optional[str] = None,
+                         options: ResponseOptions = Depends(response_options),
+                         ticket: Ticket = Depends(admit("interactive", "high"))):
+    """
+    Capture and read the entire screen, one monitor (index, name or "primary"),
+    or every monitor concurrently with monitor=all.
+    """
+    validate_profile(profile)
+    validate_layout(layout)
     try:
         print("API: Starting screen capture...")
-        result = screen_reader.read_screen()
+        result = await run_admitted(ticket, lambda: screen_reader.read_screen(profile=profile, layout=layout,
+                                                                              monitor=monitor))
         print(f"API: Screen capture completed, result keys: {result.keys()}")
         print(f"API: Result text length: {len(result.get('text', ''))}")
         print(f"API: Result confidence: {result.get('confidence', 'N/A')}")
-        return result
+        await run_in_threadpool(record_history, result, "screen")
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         print(f"API: Error during screen capture: {e}")
         import traceback
@@ -60,30 +376,285 @@ async def capture_screen():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/capture/region")
-async def capture_region(request: CaptureRequest):
+async def capture_region(request: CaptureRequest, http_request: Request,
+                         options: ResponseOptions = Depends(response_options),
+                         ticket: Ticket = Depends(admit("interactive", "high"))):
     """Capture and read a specific screen region."""
+    validate_profile(request.profile)
+    validate_layout(request.layout)
     try:
         if all(v is not None for v in [request.x, request.y, request.width, request.height]):
             x = request.x or 0
             y = request.y or 0  
             width = request.width or 800
             height = request.height or 600
-            result = screen_reader.read_region(x, y, width, height)
+            result = await run_admitted(ticket, lambda: screen_reader.read_region(
+                x, y, width, height, profile=request.profile, layout=request.layout))
+            await run_in_threadpool(record_history, result, "region")
         else:
-            result = screen_reader.read_screen()
-        return result
+            result = await run_admitted(ticket, lambda: screen_reader.read_screen(
+                profile=request.profile, layout=request.layout))
+            await run_in_threadpool(record_history, result, "screen")
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/capture/screen/stream")
+async def capture_screen_stream(http_request: Request, profile: Optional[str] = None,
+                                layout: Optional[str] = None,
+                                options: ResponseOptions = Depends(response_options),
+                                ticket: Ticket = Depends(admit("interactive", "high"))):
+    """Capture the screen and stream Tesseract's result first, then the merged result."""
+    validate_profile(profile)
+    validate_layout(layout)
+    return progressive_response(http_request, ticket, lambda: screen_reader.read_screen_progressive(
+        profile=profile, layout=layout), "screen", options=options)
+
+@app.post("/api/capture/region/stream")
+async def capture_region_stream(request: CaptureRequest, http_request: Request,
+                                options: ResponseOptions = Depends(response_options),
+                                ticket: Ticket = Depends(admit("interactive", "high"))):
+    """Capture a region (or the screen) and stream Tesseract's result first, then the merged result."""
+    validate_profile(request.profile)
+    validate_layout(request.layout)
+    region = None
+    if all(v is not None for v in [request.x, request.y, request.width, request.height]):
+        region = (request.x, request.y, request.width, request.height)
+    return progressive_response(http_request, ticket, lambda: screen_reader.read_screen_progressive(
+        region=region, profile=request.profile, layout=request.layout),
+        "region" if region else "screen", options=options)
+
+@app.get("/api/fields/types")
+async def list_field_types():
+    """Field types accepted by the field endpoints, with their PSM, allowlist and pattern."""
+    return {"types": FIELD_TYPES}
+
+@app.post("/api/capture/fields")
+async def capture_fields(request: FieldsRequest, http_request: Request,
+                         options: ResponseOptions = Depends(response_options),
+                         ticket: Ticket = Depends(admit("interactive", "high"))):
+    """Read small typed fields (digits, number, time, code, ...) from one capture, without text detection."""
+    fields = [f.dict() for f in request.fields]
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.read_fields(fields))
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/monitors")
+async def list_monitors(refresh: bool = False):
+    """List monitors that /api/capture/screen?monitor= can target."""
+    return {"monitors": await run_in_threadpool(screen_reader.list_monitors, refresh)}
+
+@app.get("/api/windows")
+async def list_windows(refresh: bool = False):
+    """List X11 windows that /api/capture/window can target."""
+    try:
+        windows = await run_in_threadpool(screen_reader.list_windows, refresh)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"windows": [dict(w, id_hex=f"{w['id']:#x}") for w in windows]}
+
+@app.post("/api/capture/window")
+async def capture_window(request: WindowCaptureRequest, http_request: Request,
+                         options: ResponseOptions = Depends(response_options),
+                         ticket: Ticket = Depends(admit("interactive", "high"))):
+    """Capture and read a single window, chosen by title, WM_CLASS or window ID."""
+    validate_profile(request.profile)
+    validate_layout(request.layout)
+    if request.title is None and request.wm_class is None and request.window_id is None:
+        raise HTTPException(status_code=400, detail="Give a window title, wm_class or window_id")
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.read_window(
+            title=request.title, wm_class=request.wm_class, window_id=request.window_id,
+            profile=request.profile, layout=request.layout))
+        await run_in_threadpool(record_history, result, "window", result["window"]["title"])
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/capture/pointer")
+async def capture_pointer(http_request: Request, x: Optional[int] = None, y: Optional[int] = None,
+                          ticket: Ticket = Depends(admit("interactive", "high"))):
+    """
+    Read the text line under the pointer (the server's pointer unless x and y are given).
+    Results are not stored in the history; this is meant for frequent assistive reads.
+    """
+    if (x is None) != (y is None):
+        raise HTTPException(status_code=400, detail="Give both x and y, or neither")
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.read_at_pointer(x, y))
+        return render(http_request, result)
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/find")
+async def find_text(request: FindTextRequest, http_request: Request,
+                    ticket: Ticket = Depends(admit("interactive", "high"))):
+    """Locate a text label on screen and return its coordinates, without a full transcript."""
+    validate_profile(request.profile)
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="query must not be empty")
+    if not 0 < request.min_similarity <= 1:
+        raise HTTPException(status_code=400, detail="min_similarity must be in (0, 1]")
+    region = None
+    if all(v is not None for v in [request.x, request.y, request.width, request.height]):
+        region = (request.x, request.y, request.width, request.height)
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.find_text(
+            request.query, region=region, fuzzy=request.fuzzy, min_similarity=request.min_similarity,
+            min_confidence=request.min_confidence, profile=request.profile))
+        return render(http_request, result)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/subscriptions")
+async def create_subscription(request: SubscriptionRequest,
+                              ticket: Ticket = Depends(admit("interactive", "normal"))):
+    """Watch a region; all subscriptions are served from one shared capture per tick."""
+    try:
+        subscription = region_hub.subscribe(request.x, request.y, request.width, request.height)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    region_hub.start()
+    return subscription.to_dict(include_result=False)
+
+@app.get("/api/subscriptions")
+async def list_subscriptions():
+    """Active subscriptions and shared-capture statistics."""
+    return {"subscriptions": [s.to_dict(include_result=False) for s in region_hub.list()],
+            "stats": region_hub.stats()}
+
+@app.get("/api/subscriptions/{subscription_id}")
+async def get_subscription(subscription_id: int, http_request: Request,
+                           options: ResponseOptions = Depends(response_options)):
+    """Latest result for a subscription (null until its first tick)."""
+    subscription = region_hub.get(subscription_id)
+    if subscription is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    data = subscription.to_dict()
+    if data["result"] is not None:
+        data["result"] = trim_result(data["result"], options)
+    return render(http_request, data)
+
+@app.delete("/api/subscriptions/{subscription_id}")
+async def delete_subscription(subscription_id: int):
+    if not region_hub.unsubscribe(subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"message": "Subscription deleted", "id": subscription_id}
+
+@app.post("/api/watches")
+async def create_watch(request: WatchRequest, ticket: Ticket = Depends(admit("interactive", "normal"))):
+    """Watch a region for a regex or keywords; fires once each time the text starts matching."""
+    if request.webhook is not None and urlparse(request.webhook).hostname not in watch_webhook_hosts:
+        raise HTTPException(status_code=400,
+                            detail=f"Webhook host must be one of: {', '.join(sorted(watch_webhook_hosts))}")
+    try:
+        watch = watcher.add(request.x, request.y, request.width, request.height, pattern=request.pattern,
+                            keywords=request.keywords, ignore_case=request.ignore_case, webhook=request.webhook)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    region_hub.start()
+    return watch.to_dict()
+
+@app.get("/api/watches")
+async def list_watches():
+    """Active watches and evaluation statistics."""
+    return {"watches": [w.to_dict() for w in watcher.list()], "stats": watcher.stats()}
+
+@app.get("/api/watches/events")
+async def watch_events(after: int = 0):
+    """Recent watch events; pass the last seen sequence number as after to poll for new ones."""
+    return {"events": watcher.events(after)}
+
+@app.get("/api/watches/{watch_id}")
+async def get_watch(watch_id: int):
+    watch = watcher.get(watch_id)
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    return watch.to_dict()
+
+@app.delete("/api/watches/{watch_id}")
+async def delete_watch(watch_id: int):
+    if not watcher.remove(watch_id):
+        raise HTTPException(status_code=404, detail="Watch not found")
+    return {"message": "Watch deleted", "id": watch_id}
+
 @app.post("/api/config")
 async def update_config(request: ConfigRequest):
     """Update OCR engine configuration."""
     global screen_reader
+    validate_profile(request.preprocessing_profile)
+    if request.easyocr_mode is not None and request.easyocr_mode not in EASYOCR_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown EasyOCR mode: {request.easyocr_mode}")
     try:
-        screen_reader = ScreenReader(use_easyocr=request.use_easyocr, use_tesseract=request.use_tesseract)
-        return {"message": "Configuration updated", "config": request.dict()}
+        options = dict(reader_options)
+        if request.easyocr_mode is not None:
+            options["easyocr_mode"] = request.easyocr_mode
+        new_reader = await run_in_threadpool(
+            ScreenReader, use_easyocr=request.use_easyocr, use_tesseract=request.use_tesseract,
+            preprocessing_profile=request.preprocessing_profile, layout_cache=request.layout_cache, **options
+        )
+        if warmup_enabled:
+            # Warm the replacement before it takes traffic; the old reader keeps serving meanwhile
+            await run_in_threadpool(new_reader.warm_up)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    def swap_reader():
+        # Waits for in-flight OCR to finish and holds new requests until the swap is done
+        global screen_reader
+        with admission.exclusive():
+            screen_reader = new_reader
+            region_hub.reader = new_reader
+    
+    await run_in_threadpool(swap_reader)
+    return {"message": "Configuration updated", "config": request.dict()}
+
+@app.get("/api/layout-cache")
+async def layout_cache_stats():
+    """Layout cache entry count and hit/miss counters."""
+    if screen_reader.layout_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **screen_reader.layout_cache.stats()}
+
+@app.delete("/api/layout-cache")
+async def clear_layout_cache():
+    """Forget all memoized screen layouts."""
+    if screen_reader.layout_cache is not None:
+        screen_reader.layout_cache.clear()
+    return {"message": "Layout cache cleared"}
+
+@app.get("/api/preprocessing/profiles")
+async def list_preprocessing_profiles():
+    """List the available preprocessing profiles and their steps."""
+    return {
+        "profiles": {name: list(steps) for name, steps in PREPROCESSING_PROFILES.items()},
+        "auto": AUTO_PROFILE,
+        "default": screen_reader.preprocessing_profile
+    }
 
 @app.get("/api/health")
 async def health_check():
@@ -91,8 +662,22 @@ async def health_check():
     return {"status": "healthy", "message": "Screen Reader API is running"}
 
 @app.post("/api/upload/image")
-async def upload_image(file: UploadFile = File(...)):
-    """Upload and process an image file with OCR."""
+async def upload_image(
+    http_request: Request,
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    contrast: float = Form(1.0),
+    brightness: float = Form(1.0),
+    noise_reduction: bool = Form(False),
+    rois: Optional[str] = Form(None),
+    layout: Optional[str] = Form(None),
+    options: ResponseOptions = Depends(response_options),
+    ticket: Ticket = Depends(admit("bulk", "normal"))
+):
+    """Upload and process an image file with OCR, optionally only within the given regions."""
+    validate_profile(profile)
+    validate_layout(layout)
+    regions = parse_rois(rois)
     try:
         if not file.content_type or not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
@@ -107,20 +692,463 @@ async def upload_image(file: UploadFile = File(...)):
         if img is None:
             raise HTTPException(status_code=400, detail="Could not decode image file")
         
-        result = screen_reader.process_uploaded_image(img)
+        result = await run_admitted(ticket, lambda: screen_reader.process_uploaded_image(
+            img, profile=profile, contrast=contrast, brightness=brightness, noise_reduction=noise_reduction,
+            rois=regions, layout=layout
+        ))
         
         print(f"API: Image processing completed, result keys: {result.keys()}")
         print(f"API: Result text length: {len(result.get('text', ''))}")
         print(f"API: Result confidence: {result.get('confidence', 'N/A')}")
         
-        return result
+        await run_in_threadpool(record_history, result, "upload", file.filename)
+        return render(http_request, result, options)
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"API: Error during image upload processing: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/upload/image/stream")
+async def upload_image_stream(
+    http_request: Request,
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    contrast: float = Form(1.0),
+    brightness: float = Form(1.0),
+    noise_reduction: bool = Form(False),
+    layout: Optional[str] = Form(None),
+    options: ResponseOptions = Depends(response_options),
+    ticket: Ticket = Depends(admit("bulk", "normal"))
+):
+    """Upload an image and stream Tesseract's result first, then the merged result."""
+    validate_profile(profile)
+    validate_layout(layout)
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    contents = await file.read()
+    img = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise HTTPException(status_code=400, detail="Could not decode image file")
+    
+    return progressive_response(http_request, ticket, lambda: screen_reader.iter_progressive(
+        img, profile=profile, contrast=contrast, brightness=brightness,
+        noise_reduction=noise_reduction, layout=layout), "upload", file.filename, options)
+
+@app.post("/api/upload/fields")
+async def upload_fields(
+    http_request: Request,
+    file: UploadFile = File(...),
+    fields: str = Form(...),
+    options: ResponseOptions = Depends(response_options),
+    ticket: Ticket = Depends(admit("bulk", "normal"))
+):
+    """Read typed fields from an uploaded image; fields is a JSON list like the /api/capture/fields body."""
+    try:
+        specs = [FieldRequest(**f).dict() for f in json.loads(fields)]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {e}")
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    img = cv2.imdecode(np.frombuffer(await file.read(), np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise HTTPException(status_code=400, detail="Could not decode image file")
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.read_fields(specs, image=img))
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/upload/video")
+async def upload_video(
+    http_request: Request,
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    layout: Optional[str] = Form(None),
+    min_interval: float = Form(0.5),
+    max_interval: float = Form(4.0),
+    options: ResponseOptions = Depends(response_options),
+    ticket: Ticket = Depends(admit("bulk", "low"))
+):
+    """Upload a video or screen recording and return a timestamped text timeline."""
+    validate_profile(profile)
+    validate_layout(layout)
+    if not file.content_type or not file.content_type.startswith('video/'):
+        raise HTTPException(status_code=400, detail="File must be a video")
+    
+    print(f"API: Processing uploaded video: {file.filename}")
+    path = await save_upload(file)
+    try:
+        result = await run_admitted(ticket, lambda: screen_reader.process_video(
+            path, profile=profile, layout=layout, min_interval=min_interval, max_interval=max_interval,
+            workers=SLOT_OCR_WORKERS
+        ))
+        await run_in_threadpool(record_history, result, "video", file.filename)
+        return render(http_request, result, options)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"API: Error during video processing: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.remove(path)
+
+DOCUMENT_CONTENT_TYPES = ("application/pdf", "image/tiff")
+
+@app.post("/api/upload/document")
+async def upload_document(
+    http_request: Request,
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    contrast: float = Form(1.0),
+    brightness: float = Form(1.0),
+    noise_reduction: bool = Form(False),
+    layout: Optional[str] = Form(None),
+    dpi: int = Form(200),
+    ticket: Ticket = Depends(admit("bulk", "low"))
+):
+    """
+    Upload a multi-page PDF or TIFF and stream OCR results back as NDJSON,
+    one line per page followed by a summary line.
+    """
+    validate_profile(profile)
+    validate_layout(layout)
+    if file.content_type not in DOCUMENT_CONTENT_TYPES and not (file.content_type or "").startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be a PDF, TIFF or image")
+    if not 36 <= dpi <= 600:
+        raise HTTPException(status_code=400, detail="dpi must be between 36 and 600")
+    
+    try:
+        admission.check(ticket.priority)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers())
+    
+    print(f"API: Processing uploaded document: {file.filename}")
+    path = await save_upload(file)
+    try:
+        page_count = await run_in_threadpool(count_pages, path)
+    except RuntimeError as e:
+        # PDF support is not installed on this server
+        os.remove(path)
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=f"Could not read document: {e}")
+    if page_count == 0:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail="Could not decode document")
+    
+    async def page_stream():
+        # The blocking steps run in the threadpool; a line is sent as each page finishes
+        state = {"acquired": False, "pages": None, "count": 0}
+
+        def acquire():
+            # The whole document holds one OCR slot
+            admission.acquire(ticket.priority, ticket.deadline)
+            state["acquired"] = True
+
+        def finish():
+            # Closing the page generator cancels pages not yet started and waits
+            # for the running ones, so the slot is freed once OCR has stopped
+            try:
+                if state["pages"] is not None:
+                    state["pages"].close()
+            finally:
+                if state["acquired"]:
+                    admission.release()
+                os.remove(path)
+
+        try:
+            try:
+                await run_in_threadpool(acquire)
+            except AdmissionRejected as e:
+                yield json.dumps({"done": True, "page_count": 0, "error": str(e)}) + "\n"
+                return
+            state["pages"] = screen_reader.iter_document(
+                path, profile=profile, contrast=contrast, brightness=brightness,
+                noise_reduction=noise_reduction, layout=layout, dpi=dpi, workers=SLOT_OCR_WORKERS
+            )
+            while True:
+                result = await run_in_threadpool(next, state["pages"], None)
+                if result is None:
+                    break
+                state["count"] += 1
+                await run_in_threadpool(record_history, result, "document",
+                                        f"{file.filename} (page {result['page']})")
+                yield json.dumps(result, default=json_default) + "\n"
+                if await http_request.is_disconnected():
+                    print("API: Client disconnected from document stream")
+                    return
+            yield json.dumps({"done": True, "page_count": state["count"]}) + "\n"
+        except Exception as e:
+            print(f"API: Error during document processing: {e}")
+            yield json.dumps({"done": True, "page_count": state["count"], "error": str(e)}) + "\n"
+        finally:
+            # Shielded: this also runs when the stream is cancelled on disconnect
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(finish)
+    
+    return StreamingResponse(page_stream(), media_type="application/x-ndjson",
+                             headers={"X-Page-Count": str(page_count)})
+
+def run_job(job) -> Dict[str, Any]:
+    """Execute a queued OCR job in an OCR slot, at the job's priority."""
+    # Jobs always rank below interactive requests and never use reserved slots,
+    # whatever priority they were queued with
+    priority = max(job.priority, INTERACTIVE_PRIORITY + 1)
+    try:
+        return admission.run(priority, job.deadline, execute_job, job)
+    except AdmissionRejected:
+        if job.kind == "video" and os.path.exists(job.payload["path"]):
+            os.remove(job.payload["path"])
+        raise
+
+def execute_job(job) -> Dict[str, Any]:
+    """Execute a queued OCR job with the current screen reader."""
+    payload = job.payload
+    if job.kind == "upload":
+        result = screen_reader.process_uploaded_image(
+            payload["image"], profile=payload.get("profile"), contrast=payload.get("contrast", 1.0),
+            brightness=payload.get("brightness", 1.0), noise_reduction=payload.get("noise_reduction", False),
+            rois=payload.get("rois"), layout=payload.get("layout")
+        )
+        record_history(result, "upload", payload.get("filename"))
+    elif job.kind == "video":
+        try:
+            result = screen_reader.process_video(
+                payload["path"], profile=payload.get("profile"), layout=payload.get("layout"),
+                min_interval=payload.get("min_interval", 0.5), max_interval=payload.get("max_interval", 4.0),
+                workers=SLOT_OCR_WORKERS
+            )
+        finally:
+            os.remove(payload["path"])
+        record_history(result, "video", payload.get("filename"))
+    elif payload.get("region"):
+        result = screen_reader.read_region(*payload["region"], profile=payload.get("profile"),
+                                           layout=payload.get("layout"))
+        record_history(result, "region")
+    else:
+        result = screen_reader.read_screen(profile=payload.get("profile"), layout=payload.get("layout"))
+        record_history(result, "screen")
+    return result
+
+job_queue = JobQueue(
+    run_job,
+    workers=int(os.environ.get("JOB_WORKERS", "1")),
+    result_ttl=float(os.environ.get("JOB_RESULT_TTL", "3600")),
+    # 0 lifts the limit
+    max_queued=int(os.environ.get("MAX_QUEUED_JOBS", DEFAULT_MAX_QUEUED)) or None
+)
+job_queue.start()
+
+def submit_job(kind: str, payload: Dict[str, Any], priority: str, ticket: Ticket):
+    """Queue a job, turning a full queue into a 503."""
+    try:
+        return job_queue.submit(kind, payload, priority, deadline=ticket.deadline)
+    except QueueFull as e:
+        if kind == "video":
+            os.remove(payload["path"])
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {e}", headers={"Retry-After": "5"})
+
+def require_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.post("/api/jobs/capture", status_code=202)
+async def submit_capture_job(request: CaptureJobRequest, ticket: Ticket = Depends(admit("bulk", "normal", 0))):
+    """Queue a screen or region capture and return its job ID immediately."""
+    validate_profile(request.profile)
+    validate_layout(request.layout)
+    validate_priority(request.priority)
+    region = None
+    if all(v is not None for v in [request.x, request.y, request.width, request.height]):
+        region = (request.x, request.y, request.width, request.height)
+    job = submit_job("capture", {"region": region, "profile": request.profile, "layout": request.layout},
+                     request.priority, ticket)
+    return job.to_dict()
+
+@app.post("/api/jobs/upload", status_code=202)
+async def submit_upload_job(
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    contrast: float = Form(1.0),
+    brightness: float = Form(1.0),
+    noise_reduction: bool = Form(False),
+    rois: Optional[str] = Form(None),
+    layout: Optional[str] = Form(None),
+    priority: str = Form("normal"),
+    ticket: Ticket = Depends(admit("bulk", "normal", 0))
+):
+    """Queue an uploaded image for OCR and return its job ID immediately."""
+    validate_profile(profile)
+    validate_layout(layout)
+    validate_priority(priority)
+    regions = parse_rois(rois)
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    contents = await file.read()
+    img = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise HTTPException(status_code=400, detail="Could not decode image file")
+    
+    job = submit_job("upload", {
+        "image": img,
+        "filename": file.filename,
+        "profile": profile,
+        "contrast": contrast,
+        "brightness": brightness,
+        "noise_reduction": noise_reduction,
+        "rois": regions,
+        "layout": layout
+    }, priority, ticket)
+    return job.to_dict()
+
+@app.post("/api/jobs/video", status_code=202)
+async def submit_video_job(
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None),
+    layout: Optional[str] = Form(None),
+    min_interval: float = Form(0.5),
+    max_interval: float = Form(4.0),
+    priority: str = Form("normal"),
+    ticket: Ticket = Depends(admit("bulk", "normal", 0))
+):
+    """Queue a video or screen recording for OCR and return its job ID immediately."""
+    validate_profile(profile)
+    validate_layout(layout)
+    validate_priority(priority)
+    if not file.content_type or not file.content_type.startswith('video/'):
+        raise HTTPException(status_code=400, detail="File must be a video")
+    if min_interval <= 0 or max_interval < min_interval:
+        raise HTTPException(status_code=400, detail="Sampling intervals must satisfy 0 < min_interval <= max_interval")
+    
+    job = submit_job("video", {
+        "path": await save_upload(file),
+        "filename": file.filename,
+        "profile": profile,
+        "layout": layout,
+        "min_interval": min_interval,
+        "max_interval": max_interval
+    }, priority, ticket)
+    return job.to_dict()
+
+@app.get("/api/admission")
+async def admission_stats():
+    """OCR slot usage, shedding counters and rate limits."""
+    return {"ocr": admission.stats(), "rate_limits": rate_limiter.stats(), "timeouts": REQUEST_TIMEOUTS}
+
+@app.get("/api/jobs")
+async def job_queue_stats():
+    """Worker count and job counts by status."""
+    return job_queue.stats()
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, http_request: Request, options: ResponseOptions = Depends(response_options)):
+    """Poll a job's status; the OCR result is included once it has succeeded."""
+    data = require_job(job_id).to_dict()
+    if "result" in data:
+        data["result"] = trim_result(data["result"], options)
+    return render(http_request, data)
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Subscribe to a job's status changes as server-sent events until it finishes."""
+    job = require_job(job_id)
+    
+    async def event_stream():
+        current = job
+        version = None
+        while current is not None:
+            if current.version != version:
+                version = current.version
+                data = json.dumps(current.to_dict(), default=json_default)
+                yield f"event: {current.status}\ndata: {data}\n\n"
+                if current.status in FINISHED_STATES:
+                    return
+            else:
+                # Keep-alive comment so proxies don't drop the idle connection
+                yield ": keep-alive\n\n"
+            current = await run_in_threadpool(job_queue.wait_for_update, job_id, version, 15.0)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued job, or discard the result of a running one."""
+    job = job_queue.get(job_id)
+    upload_path = job.payload.get("path") if job is not None and job.kind == "video" else None
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    if upload_path and job.status == CANCELLED and os.path.exists(upload_path):
+        # Queued video jobs never run, so their uploaded file is removed here
+        os.remove(upload_path)
+    return job.to_dict(include_result=False)
+
+def require_history_store():
+    if history_store is None:
+        raise HTTPException(status_code=404, detail="History storage is disabled")
+    return history_store
+
+# The history handlers are plain functions: store queries block, so FastAPI
+# runs them in its threadpool instead of on the event loop
+@app.get("/api/history")
+def list_history(page: int = 1, page_size: int = DEFAULT_PAGE_SIZE):
+    """List stored OCR results, newest first, without bounding boxes."""
+    return require_history_store().list(page, page_size)
+
+@app.get("/api/history/search")
+def search_history(q: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE):
+    """Full-text search over stored OCR results."""
+    return require_history_store().search(q, page, page_size)
+
+@app.get("/api/history/{item_id}")
+def get_history_item(item_id: int, http_request: Request,
+                     options: ResponseOptions = Depends(response_options)):
+    """Fetch a single stored result, including the full OCR output."""
+    item = require_history_store().get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="History item not found")
+    item["result"] = trim_result(item["result"], options)
+    return render(http_request, item)
+
+@app.delete("/api/history/{item_id}")
+def delete_history_item(item_id: int):
+    """Delete a stored result and remove it from the daily statistics."""
+    if not require_history_store().delete(item_id):
+        raise HTTPException(status_code=404, detail="History item not found")
+    return {"message": "History item deleted", "id": item_id}
+
+@app.get("/api/analytics")
+def get_analytics(days: int = 30):
+    """Aggregated processing statistics from the pre-computed daily totals."""
+    return require_history_store().analytics(days)
+
 @app.get("/healthz")
 async def healthz():
     return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the OCR engines have been warmed up."""
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "warmup": readiness["warmup"], "error": readiness["error"]}
@@ -0,0 +1,196 @@
+"""
+Content-negotiated responses for OCR results.
+
+Results are serialized directly (bypassing FastAPI's recursive jsonable_encoder)
+as JSON or, when the client's Accept header asks for it, MessagePack. Bodies
+above a small threshold are compressed with Brotli or gzip according to
+Accept-Encoding. Clients can also drop or cap the per-word bounding boxes,
+which dominate the size of results for dense screens.
+
+orjson, msgpack and brotli are optional; without them responses fall back to
+the standard library json module, JSON and gzip respectively.
+"""
+
+import gzip
+import heapq
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Query, Request
+from fastapi.responses import Response
+
+from screenreader.serialization import json_default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# Bodies smaller than this are sent uncompressed - the framing overhead isn't worth it
+MIN_COMPRESS_SIZE = 1024
+
+# Fast settings: compression runs on every response, so favour speed over ratio
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+# Nested result lists whose entries carry their own bounding boxes
+NESTED_RESULT_KEYS = ("regions", "screens", "pages", "monitors", "fields")
+
+
+class ResponseOptions:
+    """Per-request control over the bounding boxes included in a result."""
+
+    def __init__(self, bounding_boxes: bool = True, max_boxes: Optional[int] = None):
+        self.bounding_boxes = bounding_boxes
+        self.max_boxes = max_boxes
+
+    @property
+    def trims(self) -> bool:
+        return not self.bounding_boxes or self.max_boxes is not None
+
+
+def response_options(
+    bounding_boxes: bool = Query(True, description="Include per-word bounding boxes"),
+    max_boxes: Optional[int] = Query(None, ge=0, description="Keep only the N most confident boxes")
+) -> ResponseOptions:
+    """FastAPI dependency reading the bounding box query parameters."""
+    return ResponseOptions(bounding_boxes, max_boxes)
+
+
+def _trim_box_list(boxes, options: ResponseOptions):
+    if not options.bounding_boxes:
+        return []
+    if options.max_boxes is None or len(boxes) <= options.max_boxes:
+        return boxes
+    # Keep the most confident boxes, in their original (reading) order
+    keep = heapq.nlargest(options.max_boxes, range(len(boxes)),
+                          key=lambda i: float(boxes[i].get("confidence") or 0))
+    return [boxes[i] for i in sorted(keep)]
+
+
+def trim_result(result: Dict[str, Any], options: Optional[ResponseOptions]) -> Dict[str, Any]:
+    """
+    Apply bounding box options to an OCR result without modifying it.
+
+    Args:
+        result: OCR result dictionary
+        options: Response options, or None to leave the result unchanged
+
+    Returns:
+        The result, or a trimmed shallow copy
+    """
+    if options is None or not options.trims or not isinstance(result, dict):
+        return result
+
+    trimmed = dict(result)
+    if isinstance(result.get("bounding_boxes"), list):
+        boxes = result["bounding_boxes"]
+        trimmed["bounding_boxes"] = _trim_box_list(boxes, options)
+        if len(trimmed["bounding_boxes"]) < len(boxes):
+            trimmed["bounding_boxes_total"] = len(boxes)
+            trimmed["bounding_boxes_truncated"] = True
+
+    for key in NESTED_RESULT_KEYS:
+        if isinstance(result.get(key), list):
+            trimmed[key] = [trim_result(item, options) for item in result[key]]
+
+    return trimmed
+
+
+def parse_quality_header(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept or Accept-Encoding header into value -> quality weights.
+
+    Args:
+        header: Header value, e.g. "br;q=1.0, gzip;q=0.8"
+
+    Returns:
+        Mapping of lower-cased values to their q weight (1.0 when unspecified)
+    """
+    weights = {}
+    for part in header.split(","):
+        value, *params = (p.strip() for p in part.split(";"))
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        weights[value.lower()] = quality
+    return weights
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br", "gzip" or None from an Accept-Encoding header."""
+    weights = parse_quality_header(accept_encoding or "")
+    candidates = (["br"] if BROTLI_AVAILABLE else []) + ["gzip"]
+    best = None
+    for coding in candidates:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+
+def serialize(payload: Any, media_type: str) -> bytes:
+    if media_type in MSGPACK_MEDIA_TYPES:
+        return msgpack.packb(payload, default=json_default, use_bin_type=True)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+def render(request: Request, payload: Any, options: Optional[ResponseOptions] = None,
+           status_code: int = 200) -> Response:
+    """
+    Serialize a result in the format and encoding the client asked for.
+
+    Args:
+        request: Incoming request (Accept and Accept-Encoding headers are used)
+        payload: OCR result or other JSON-compatible data
+        options: Bounding box options applied to the payload
+        status_code: HTTP status code
+
+    Returns:
+        Response with the encoded body
+    """
+    media_type = JSON_MEDIA_TYPE
+    accept = parse_quality_header(request.headers.get("accept", ""))
+    msgpack_quality = max(accept.get(t, 0.0) for t in MSGPACK_MEDIA_TYPES)
+    if MSGPACK_AVAILABLE and msgpack_quality > 0 and msgpack_quality >= accept.get(JSON_MEDIA_TYPE, 0.0):
+        media_type = MSGPACK_MEDIA_TYPES[0]
+
+    body = serialize(trim_result(payload, options), media_type)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,467 @@
+"""
+Server-side persistence for OCR results.
+
+Results are stored in SQLite by default (with an FTS5 index over the extracted
+text) or in Postgres when HISTORY_DATABASE_URL points at one (tsvector + GIN
+index). Daily statistics are aggregated on write so analytics queries never
+scan the full history. Only the most recent HISTORY_MAX_ITEMS results are
+kept; older ones are deleted as new ones arrive, but stay in the statistics.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from screenreader.serialization import json_default
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+DEFAULT_MAX_ITEMS = 10000
+
+# Columns returned by list/search endpoints - the full result (with bounding boxes)
+# is only returned when fetching a single item.
+SUMMARY_FIELDS = ["id", "timestamp", "source", "filename", "text", "confidence",
+                  "processing_time", "engine", "region"]
+
+
+def _engine_bucket(result: Dict) -> str:
+    """Classify a result as tesseract, easyocr or combined for usage statistics."""
+    if result.get("combined"):
+        return "combined"
+    engine = result.get("engine") or result.get("primary_engine")
+    return engine if engine in ("tesseract", "easyocr") else "combined"
+
+
+def _day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _clamp_page(page: int, page_size: int):
+    page = max(1, int(page))
+    page_size = min(MAX_PAGE_SIZE, max(1, int(page_size)))
+    return page, page_size
+
+
+class HistoryStore(ABC):
+    """
+    Base class for OCR history stores. Subclasses implement the storage-specific
+    queries; row preparation and pagination are shared here.
+
+    Args:
+        max_items: Most recent results to keep (0 keeps everything)
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS):
+        self.max_items = max(0, max_items)
+
+    @abstractmethod
+    def add(self, result: Dict, source: str, filename: Optional[str] = None) -> int:
+        """Store a result, dropping the oldest beyond max_items. Returns the new item's ID."""
+
+    @abstractmethod
+    def get(self, item_id: int) -> Optional[Dict]:
+        """Fetch a stored result with its full OCR output, or None."""
+
+    @abstractmethod
+    def delete(self, item_id: int) -> bool:
+        """Delete a stored result and remove it from the daily statistics."""
+
+    @abstractmethod
+    def list(self, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Page through stored results, newest first."""
+
+    @abstractmethod
+    def search(self, query: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Full-text search over stored results."""
+
+    @abstractmethod
+    def analytics(self, days: int = 30) -> Dict:
+        """Totals and the most recent days of the daily statistics."""
+
+    def close(self):
+        pass
+
+    def _prepare_row(self, result: Dict, source: str, filename: Optional[str]) -> Dict:
+        """
+        Flatten an OCR result into the column values shared by all backends.
+
+        Args:
+            result: Result dictionary returned by ScreenReader
+            source: Where the result came from (screen, region, upload)
+            filename: Optional uploaded filename
+
+        Returns:
+            Dictionary of column values
+        """
+        timestamp = float(result.get("timestamp") or time.time())
+        region = result.get("region")
+        return {
+            "timestamp": timestamp,
+            "day": _day(timestamp),
+            "source": source,
+            "filename": filename,
+            "text": result.get("text", ""),
+            "confidence": float(result.get("confidence") or 0),
+            "processing_time": float(result.get("processing_time") or 0),
+            "engine": _engine_bucket(result),
+            "region": json.dumps(region, default=json_default) if region else None,
+            "result": json.dumps(result, default=json_default),
+        }
+
+    def _summary(self, row: Dict) -> Dict:
+        item = {field: row[field] for field in SUMMARY_FIELDS}
+        if item["region"]:
+            item["region"] = json.loads(item["region"])
+        return item
+
+    def _page(self, rows: List[Dict], total: int, page: int, page_size: int) -> Dict:
+        return {
+            "items": [self._summary(row) for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": (total + page_size - 1) // page_size
+        }
+
+    def _analytics_from_days(self, day_rows: List[Dict], totals: Dict) -> Dict:
+        count = totals["count"] or 0
+        return {
+            "total_processed": count,
+            "average_processing_time": (totals["total_time"] or 0) / count if count else 0,
+            "average_confidence": (totals["total_confidence"] or 0) / count if count else 0,
+            "engine_usage": {
+                "tesseract": totals["tesseract"] or 0,
+                "easyocr": totals["easyocr"] or 0,
+                "combined": totals["combined"] or 0
+            },
+            "daily_stats": [
+                {
+                    "date": row["day"],
+                    "count": row["count"],
+                    "avg_time": row["total_time"] / row["count"] if row["count"] else 0,
+                    "avg_confidence": row["total_confidence"] / row["count"] if row["count"] else 0
+                }
+                for row in day_rows
+            ]
+        }
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """History store backed by a local SQLite database with an FTS5 text index."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp REAL NOT NULL,
+            day TEXT NOT NULL,
+            source TEXT NOT NULL,
+            filename TEXT,
+            text TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            processing_time REAL NOT NULL,
+            engine TEXT NOT NULL,
+            region TEXT,
+            result TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_timestamp_idx ON history (timestamp DESC);
+        CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+            text, content='history', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+            INSERT INTO history_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+            INSERT INTO history_fts(history_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            day TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            total_time REAL NOT NULL DEFAULT 0,
+            total_confidence REAL NOT NULL DEFAULT 0,
+            tesseract INTEGER NOT NULL DEFAULT 0,
+            easyocr INTEGER NOT NULL DEFAULT 0,
+            combined INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, path: str, max_items: int = DEFAULT_MAX_ITEMS):
+        super().__init__(max_items)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def add(self, result: Dict, source: str, filename: Optional[str] = None) -> int:
+        row = self._prepare_row(result, source, filename)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """INSERT INTO history (timestamp, day, source, filename, text, confidence,
+                                        processing_time, engine, region, result)
+                   VALUES (:timestamp, :day, :source, :filename, :text, :confidence,
+                           :processing_time, :engine, :region, :result)""",
+                row
+            )
+            self._update_daily_stats(row, 1)
+            if self.max_items:
+                # IDs only grow, so everything this far behind the new row is the oldest
+                self._conn.execute("DELETE FROM history WHERE id <= ?", (cursor.lastrowid - self.max_items,))
+            return cursor.lastrowid
+
+    def get(self, item_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM history WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return None
+        item = self._summary(dict(row))
+        item["result"] = json.loads(row["result"])
+        return item
+
+    def delete(self, item_id: int) -> bool:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT * FROM history WHERE id = ?", (item_id,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM history WHERE id = ?", (item_id,))
+            self._update_daily_stats(dict(row), -1)
+            return True
+
+    def list(self, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        page, page_size = _clamp_page(page, page_size)
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {', '.join(SUMMARY_FIELDS)} FROM history ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                (page_size, (page - 1) * page_size)
+            ).fetchall()
+        return self._page([dict(row) for row in rows], total, page, page_size)
+
+    def search(self, query: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        page, page_size = _clamp_page(page, page_size)
+        match = self._fts_query(query)
+        if not match:
+            return self._page([], 0, page, page_size)
+        columns = ", ".join(f"h.{field}" for field in SUMMARY_FIELDS)
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM history_fts WHERE history_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""SELECT {columns} FROM history_fts f JOIN history h ON h.id = f.rowid
+                    WHERE history_fts MATCH ? ORDER BY f.rank LIMIT ? OFFSET ?""",
+                (match, page_size, (page - 1) * page_size)
+            ).fetchall()
+        return self._page([dict(row) for row in rows], total, page, page_size)
+
+    def analytics(self, days: int = 30) -> Dict:
+        with self._lock:
+            totals = self._conn.execute(
+                """SELECT SUM(count) AS count, SUM(total_time) AS total_time,
+                          SUM(total_confidence) AS total_confidence, SUM(tesseract) AS tesseract,
+                          SUM(easyocr) AS easyocr, SUM(combined) AS combined
+                   FROM daily_stats"""
+            ).fetchone()
+            day_rows = self._conn.execute(
+                "SELECT * FROM daily_stats WHERE count > 0 ORDER BY day DESC LIMIT ?", (days,)
+            ).fetchall()
+        return self._analytics_from_days([dict(row) for row in day_rows], dict(totals))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _update_daily_stats(self, row: Dict, sign: int):
+        engine = row["engine"]
+        self._conn.execute(
+            f"""INSERT INTO daily_stats (day, count, total_time, total_confidence, {engine})
+                VALUES (:day, :sign, :sign * :processing_time, :sign * :confidence, :sign)
+                ON CONFLICT(day) DO UPDATE SET
+                    count = count + excluded.count,
+                    total_time = total_time + excluded.total_time,
+                    total_confidence = total_confidence + excluded.total_confidence,
+                    {engine} = {engine} + excluded.{engine}""",
+            {"day": row["day"], "sign": sign, "processing_time": row["processing_time"],
+             "confidence": row["confidence"]}
+        )
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each term so user input can't break FTS5 query syntax."""
+        terms = [term.replace('"', '""') for term in query.split()]
+        return " ".join(f'"{term}"' for term in terms if term)
+
+
+class PostgresHistoryStore(HistoryStore):
+    """History store backed by Postgres with a GIN-indexed tsvector over the text."""
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS ocr_history (
+            id BIGSERIAL PRIMARY KEY,
+            timestamp DOUBLE PRECISION NOT NULL,
+            day DATE NOT NULL,
+            source TEXT NOT NULL,
+            filename TEXT,
+            text TEXT NOT NULL,
+            confidence DOUBLE PRECISION NOT NULL,
+            processing_time DOUBLE PRECISION NOT NULL,
+            engine TEXT NOT NULL,
+            region TEXT,
+            result TEXT NOT NULL,
+            text_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED
+        )""",
+        "CREATE INDEX IF NOT EXISTS ocr_history_timestamp_idx ON ocr_history (timestamp DESC)",
+        "CREATE INDEX IF NOT EXISTS ocr_history_tsv_idx ON ocr_history USING GIN (text_tsv)",
+        """CREATE TABLE IF NOT EXISTS ocr_daily_stats (
+            day DATE PRIMARY KEY,
+            count BIGINT NOT NULL DEFAULT 0,
+            total_time DOUBLE PRECISION NOT NULL DEFAULT 0,
+            total_confidence DOUBLE PRECISION NOT NULL DEFAULT 0,
+            tesseract BIGINT NOT NULL DEFAULT 0,
+            easyocr BIGINT NOT NULL DEFAULT 0,
+            combined BIGINT NOT NULL DEFAULT 0
+        )""",
+    ]
+
+    def __init__(self, dsn: str, max_items: int = DEFAULT_MAX_ITEMS):
+        super().__init__(max_items)
+        if not PSYCOPG_AVAILABLE:
+            raise RuntimeError("Postgres history store requires psycopg. Install with: pip install psycopg[binary]")
+        self._lock = threading.Lock()
+        self._conn = psycopg.connect(dsn, autocommit=True, row_factory=dict_row)
+        with self._conn.transaction():
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+
+    def add(self, result: Dict, source: str, filename: Optional[str] = None) -> int:
+        row = self._prepare_row(result, source, filename)
+        with self._lock, self._conn.transaction():
+            item_id = self._conn.execute(
+                """INSERT INTO ocr_history (timestamp, day, source, filename, text, confidence,
+                                            processing_time, engine, region, result)
+                   VALUES (%(timestamp)s, %(day)s, %(source)s, %(filename)s, %(text)s, %(confidence)s,
+                           %(processing_time)s, %(engine)s, %(region)s, %(result)s)
+                   RETURNING id""",
+                row
+            ).fetchone()["id"]
+            self._update_daily_stats(row, 1)
+            if self.max_items:
+                # IDs only grow, so everything this far behind the new row is the oldest
+                self._conn.execute("DELETE FROM ocr_history WHERE id <= %s", (item_id - self.max_items,))
+        return item_id
+
+    def get(self, item_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ocr_history WHERE id = %s", (item_id,)).fetchone()
+        if row is None:
+            return None
+        item = self._summary(row)
+        item["result"] = json.loads(row["result"])
+        return item
+
+    def delete(self, item_id: int) -> bool:
+        with self._lock, self._conn.transaction():
+            row = self._conn.execute(
+                "DELETE FROM ocr_history WHERE id = %s RETURNING *", (item_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            row["day"] = str(row["day"])
+            self._update_daily_stats(row, -1)
+            return True
+
+    def list(self, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        page, page_size = _clamp_page(page, page_size)
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) AS n FROM ocr_history").fetchone()["n"]
+            rows = self._conn.execute(
+                f"""SELECT {', '.join(SUMMARY_FIELDS)} FROM ocr_history
+                    ORDER BY timestamp DESC LIMIT %s OFFSET %s""",
+                (page_size, (page - 1) * page_size)
+            ).fetchall()
+        return self._page(rows, total, page, page_size)
+
+    def search(self, query: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        page, page_size = _clamp_page(page, page_size)
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) AS n FROM ocr_history WHERE text_tsv @@ plainto_tsquery('simple', %s)",
+                (query,)
+            ).fetchone()["n"]
+            rows = self._conn.execute(
+                f"""SELECT {', '.join(SUMMARY_FIELDS)} FROM ocr_history
+                    WHERE text_tsv @@ plainto_tsquery('simple', %s)
+                    ORDER BY ts_rank(text_tsv, plainto_tsquery('simple', %s)) DESC, timestamp DESC
+                    LIMIT %s OFFSET %s""",
+                (query, query, page_size, (page - 1) * page_size)
+            ).fetchall()
+        return self._page(rows, total, page, page_size)
+
+    def analytics(self, days: int = 30) -> Dict:
+        with self._lock:
+            totals = self._conn.execute(
+                """SELECT SUM(count) AS count, SUM(total_time) AS total_time,
+                          SUM(total_confidence) AS total_confidence, SUM(tesseract) AS tesseract,
+                          SUM(easyocr) AS easyocr, SUM(combined) AS combined
+                   FROM ocr_daily_stats"""
+            ).fetchone()
+            day_rows = self._conn.execute(
+                "SELECT * FROM ocr_daily_stats WHERE count > 0 ORDER BY day DESC LIMIT %s", (days,)
+            ).fetchall()
+        for row in day_rows:
+            row["day"] = str(row["day"])
+        return self._analytics_from_days(day_rows, totals)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _update_daily_stats(self, row: Dict, sign: int):
+        engine = row["engine"]
+        self._conn.execute(
+            f"""INSERT INTO ocr_daily_stats AS s (day, count, total_time, total_confidence, {engine})
+                VALUES (%(day)s, %(sign)s, %(sign)s * %(processing_time)s, %(sign)s * %(confidence)s, %(sign)s)
+                ON CONFLICT (day) DO UPDATE SET
+                    count = s.count + excluded.count,
+                    total_time = s.total_time + excluded.total_time,
+                    total_confidence = s.total_confidence + excluded.total_confidence,
+                    {engine} = s.{engine} + excluded.{engine}""",
+            {"day": row["day"], "sign": sign, "processing_time": row["processing_time"],
+             "confidence": row["confidence"]}
+        )
+
+
+def create_history_store() -> Optional[HistoryStore]:
+    """
+    Create the history store configured by the environment.
+
+    HISTORY_ENABLED=false disables persistence, HISTORY_DATABASE_URL selects Postgres,
+    otherwise results go to the SQLite file at HISTORY_DB_PATH. HISTORY_MAX_ITEMS
+    caps the number of stored results (0 for no limit).
+
+    Returns:
+        A HistoryStore, or None when history is disabled
+    """
+    if os.environ.get("HISTORY_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+
+    max_items = int(os.environ.get("HISTORY_MAX_ITEMS", DEFAULT_MAX_ITEMS))
+    database_url = os.environ.get("HISTORY_DATABASE_URL", "")
+    if database_url.startswith(("postgres://", "postgresql://")):
+        return PostgresHistoryStore(database_url, max_items)
+
+    return SQLiteHistoryStore(os.environ.get("HISTORY_DB_PATH", "ocr_history.db"), max_items)
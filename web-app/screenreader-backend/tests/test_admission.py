@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from app.admission import AdmissionController, DeadlineExceeded, INTERACTIVE_PRIORITY, Overloaded
+from app.jobs import PRIORITIES, resolve_priority
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, "condition not reached"
+        time.sleep(0.005)
+
+
+def start_waiter(controller, priority, admitted):
+    def run():
+        controller.acquire(priority)
+        admitted.append(priority)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_reserved_slots_are_kept_for_interactive_work():
+    controller = AdmissionController(slots=2, reserved=1)
+    controller.acquire(PRIORITIES["normal"])
+
+    # The only free slot is reserved: a job-priority request has to wait...
+    admitted = []
+    waiter = start_waiter(controller, PRIORITIES["normal"], admitted)
+    wait_for(lambda: controller.stats()["waiting"] == 1)
+    assert admitted == []
+
+    # ...but an interactive request that arrives later takes the slot at once
+    # (it is admitted ahead of the waiter, which ranks below it)
+    controller.acquire(INTERACTIVE_PRIORITY)
+    assert controller.stats()["running"] == 2
+
+    controller.release()
+    controller.release()
+    waiter.join(5)
+    assert admitted == [PRIORITIES["normal"]]
+
+
+def test_waiters_are_admitted_in_priority_order():
+    controller = AdmissionController(slots=1)
+    controller.acquire(INTERACTIVE_PRIORITY)
+
+    admitted = []
+    threads = []
+    for priority in (PRIORITIES["low"], PRIORITIES["normal"], PRIORITIES["high"]):
+        threads.append(start_waiter(controller, priority, admitted))
+        wait_for(lambda: controller.stats()["waiting"] == len(threads))
+
+    # One slot at a time, so each release admits exactly one waiter
+    for count in (1, 2, 3):
+        controller.release()
+        wait_for(lambda: len(admitted) == count)
+    for thread in threads:
+        thread.join(5)
+    assert admitted == [PRIORITIES["high"], PRIORITIES["normal"], PRIORITIES["low"]]
+
+
+def test_requests_are_shed_when_too_many_wait_ahead():
+    controller = AdmissionController(slots=1, max_waiting=1)
+    controller.acquire(PRIORITIES["normal"])
+
+    admitted = []
+    waiter = start_waiter(controller, PRIORITIES["normal"], admitted)
+    wait_for(lambda: controller.stats()["waiting"] == 1)
+
+    with pytest.raises(Overloaded):
+        controller.acquire(PRIORITIES["low"])
+    with pytest.raises(Overloaded):
+        controller.check(PRIORITIES["normal"])
+    # Nothing of higher priority is waiting, so interactive work is not shed
+    controller.check(INTERACTIVE_PRIORITY)
+    assert controller.stats()["shed"] == 2
+
+    controller.release()
+    waiter.join(5)
+    assert admitted == [PRIORITIES["normal"]]
+
+
+def test_expired_deadline_is_not_admitted():
+    controller = AdmissionController(slots=1)
+    with pytest.raises(DeadlineExceeded):
+        controller.acquire(PRIORITIES["normal"], deadline=time.time() - 1)
+
+    controller.acquire(PRIORITIES["normal"])
+    with pytest.raises(DeadlineExceeded):
+        controller.acquire(PRIORITIES["normal"], deadline=time.time() + 0.05)
+    assert controller.stats()["waiting"] == 0
+
+
+def test_job_priorities_cannot_be_negative():
+    assert resolve_priority("high") == PRIORITIES["high"]
+    assert resolve_priority("7") == 7
+    with pytest.raises(ValueError):
+        resolve_priority("-1")
+    with pytest.raises(ValueError):
+        resolve_priority(-5)
+
+
+def test_exclusive_section_holds_back_requests_until_it_ends():
+    # The startup warm-up runs in this section, so no request competes with it for the engines
+    controller = AdmissionController(slots=2)
+    controller.acquire(PRIORITIES["normal"])
+
+    entered = threading.Event()
+    finish = threading.Event()
+
+    def warm_up():
+        with controller.exclusive():
+            entered.set()
+            finish.wait(5)
+
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    # Work already running is allowed to finish first
+    time.sleep(0.05)
+    assert not entered.is_set()
+    controller.release()
+    assert entered.wait(5)
+
+    admitted = []
+    waiter = start_waiter(controller, INTERACTIVE_PRIORITY, admitted)
+    time.sleep(0.05)
+    assert admitted == []
+    finish.set()
+    waiter.join(5)
+    thread.join(5)
+    assert admitted == [INTERACTIVE_PRIORITY]
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from app.jobs import (CANCELLED, FINISHED_STATES, InMemoryJobBackend, Job, JobBackend, JobQueue, QUEUED,
+                      QueueFull, RUNNING, SUCCEEDED, PRIORITIES)
+
+
+def test_job_backend_is_abstract():
+    with pytest.raises(TypeError):
+        JobBackend()
+
+
+def test_submit_respects_max_queued():
+    queue = JobQueue(lambda job: {}, max_queued=2)
+    first = queue.submit("screen", {})
+    queue.submit("screen", {})
+    with pytest.raises(QueueFull):
+        queue.submit("screen", {})
+
+    # Jobs that leave the queue free their place
+    queue.cancel(first.id)
+    queue.submit("screen", {})
+    assert queue.backend.stats()[QUEUED] == 2
+
+
+def test_concurrent_submissions_never_overshoot_the_limit():
+    queue = JobQueue(lambda job: {}, max_queued=10)
+    barrier = threading.Barrier(8)
+    accepted = []
+
+    def submit():
+        barrier.wait()
+        for _ in range(5):
+            try:
+                accepted.append(queue.submit("screen", {}))
+            except QueueFull:
+                pass
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(accepted) == 10
+    assert queue.backend.stats()[QUEUED] == 10
+
+
+def test_backend_dispatches_by_priority_then_fifo():
+    backend = InMemoryJobBackend()
+    low = Job("screen", {}, PRIORITIES["low"])
+    normal = [Job("screen", {}, PRIORITIES["normal"]) for _ in range(2)]
+    high = Job("screen", {}, PRIORITIES["high"])
+    for job in (low, *normal, high):
+        backend.put(job)
+
+    backend.update(normal[0], status=CANCELLED)
+    assert [backend.next(timeout=0).id for _ in range(3)] == [high.id, normal[1].id, low.id]
+    assert backend.next(timeout=0) is None
+
+
+def test_worker_runs_jobs():
+    queue = JobQueue(lambda job: {"kind": job.kind})
+    queue.start()
+    try:
+        job = queue.submit("screen", {})
+        for _ in range(3):
+            if job.status == SUCCEEDED:
+                break
+            job = queue.wait_for_update(job.id, job.version, timeout=5)
+        assert job.status == SUCCEEDED
+        assert job.result == {"kind": "screen"}
+    finally:
+        queue.stop()
+
+
+def test_claimed_job_is_running_before_a_cancel_can_see_it():
+    queue = JobQueue(lambda job: {})
+    job = queue.submit("video", {"path": "/tmp/upload.mp4"})
+
+    # The worker's claim and a DELETE land back to back
+    claimed = queue.backend.next(timeout=0)
+    queue.cancel(job.id)
+
+    assert claimed is job
+    assert job.status == RUNNING and job.started_at is not None
+    assert job.cancel_requested and job.payload == {"path": "/tmp/upload.mp4"}
+    assert queue.backend.stats()[QUEUED] == 0
+
+
+def test_cancelled_job_is_never_claimed():
+    queue = JobQueue(lambda job: {})
+    job = queue.submit("upload", {"image": object()})
+    queue.cancel(job.id)
+    assert job.status == CANCELLED and job.payload == {}
+    assert queue.backend.next(timeout=0) is None
+
+
+def test_cancelling_a_running_job_discards_its_result():
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def handler(job):
+        started.set()
+        release.wait(5)
+        seen.append(job.payload)
+        return {"text": "late"}
+
+    queue = JobQueue(handler)
+    queue.start()
+    try:
+        job = queue.submit("video", {"path": "clip.mp4"})
+        assert started.wait(5)
+        queue.cancel(job.id)
+        release.set()
+        for _ in range(3):
+            if job.status in FINISHED_STATES:
+                break
+            job = queue.wait_for_update(job.id, job.version, timeout=5)
+        assert job.status == CANCELLED and job.result is None
+        assert seen == [{"path": "clip.mp4"}]
+    finally:
+        queue.stop()
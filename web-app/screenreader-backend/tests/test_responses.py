@@ -0,0 +1,56 @@
+import pytest
+
+from app import responses
+from app.responses import ResponseOptions, choose_encoding, parse_quality_header, trim_result
+
+
+def box(text, confidence):
+    return {"text": text, "confidence": confidence, "x": 0, "y": 0, "width": 1, "height": 1}
+
+
+@pytest.fixture
+def result():
+    return {"text": "a b c", "bounding_boxes": [box("a", 50), box("b", 90), box("c", 70)],
+            "regions": [{"text": "d", "bounding_boxes": [box("d", 10), box("e", 30), box("f", 20)]}]}
+
+
+def test_default_options_return_the_result_itself(result):
+    assert trim_result(result, None) is result
+    assert trim_result(result, ResponseOptions()) is result
+
+
+def test_max_boxes_keeps_the_most_confident_in_reading_order(result):
+    trimmed = trim_result(result, ResponseOptions(max_boxes=2))
+    assert [b["text"] for b in trimmed["bounding_boxes"]] == ["b", "c"]
+    assert trimmed["bounding_boxes_total"] == 3 and trimmed["bounding_boxes_truncated"]
+    assert [b["text"] for b in trimmed["regions"][0]["bounding_boxes"]] == ["e", "f"]
+    assert len(result["bounding_boxes"]) == 3 and len(result["regions"][0]["bounding_boxes"]) == 3
+
+
+def test_results_under_the_cap_are_not_marked_truncated(result):
+    trimmed = trim_result(result, ResponseOptions(max_boxes=5))
+    assert len(trimmed["bounding_boxes"]) == 3 and "bounding_boxes_truncated" not in trimmed
+
+
+def test_bounding_boxes_can_be_dropped(result):
+    trimmed = trim_result(result, ResponseOptions(bounding_boxes=False))
+    assert trimmed["bounding_boxes"] == [] and trimmed["regions"][0]["bounding_boxes"] == []
+    assert trimmed["text"] == "a b c"
+
+
+def test_parse_quality_header():
+    assert parse_quality_header("br;q=0.5, GZIP, deflate;q=oops") == {"br": 0.5, "gzip": 1.0, "deflate": 0.0}
+
+
+@pytest.mark.parametrize("header, brotli, expected", [
+    ("gzip, br", True, "br"),
+    ("gzip, br", False, "gzip"),
+    ("br;q=0.5, gzip;q=0.8", True, "gzip"),
+    ("*", True, "br"),
+    ("gzip;q=0, identity", True, None),
+    ("", True, None),
+    (None, True, None),
+])
+def test_choose_encoding(monkeypatch, header, brotli, expected):
+    monkeypatch.setattr(responses, "BROTLI_AVAILABLE", brotli)
+    assert choose_encoding(header) == expected
@@ -0,0 +1,56 @@
+import pytest
+
+from app.storage import HistoryStore, SQLiteHistoryStore
+
+
+def result(text, confidence=90.0, engine="tesseract", timestamp=1700000000.0):
+    return {"text": text, "confidence": confidence, "engine": engine, "processing_time": 0.5,
+            "timestamp": timestamp, "bounding_boxes": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"), max_items=3)
+    yield store
+    store.close()
+
+
+def test_history_store_is_abstract():
+    with pytest.raises(TypeError):
+        HistoryStore()
+
+
+def test_add_list_search_and_delete(store):
+    first = store.add(result("invoice total 42"), "upload", "a.png")
+    store.add(result("hello world", timestamp=1700000100.0), "screen")
+
+    page = store.list()
+    assert page["total"] == 2
+    assert [item["text"] for item in page["items"]] == ["hello world", "invoice total 42"]
+    assert [item["id"] for item in store.search("invoice")["items"]] == [first]
+    assert store.get(first)["result"]["text"] == "invoice total 42"
+
+    assert store.delete(first)
+    assert not store.delete(first)
+    assert store.analytics()["total_processed"] == 1
+
+
+def test_oldest_items_are_dropped_beyond_max_items(store):
+    ids = [store.add(result(f"item {i}", timestamp=1700000000.0 + i), "screen") for i in range(5)]
+
+    page = store.list()
+    assert page["total"] == 3
+    assert [item["id"] for item in page["items"]] == ids[:1:-1]
+    assert store.get(ids[0]) is None
+    assert store.search("item")["total"] == 3
+    # Statistics still count the dropped results
+    assert store.analytics()["total_processed"] == 5
+
+
+def test_analytics_average_confidence(store):
+    store.add(result("a", confidence=70.0, engine="easyocr"), "screen")
+    store.add(dict(result("b", confidence=90.0), combined=True), "screen")
+
+    analytics = store.analytics()
+    assert analytics["average_confidence"] == pytest.approx(80.0)
+    assert analytics["engine_usage"] == {"tesseract": 0, "easyocr": 1, "combined": 1}
@@ -11,9 +11,10 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { HistoryDashboard } from '@/components/HistoryDashboard';
 import { AnalyticsPanel } from '@/components/AnalyticsPanel';
 import { EnhancedSettings } from '@/components/EnhancedSettings';
-import { useOCRHistory } from '@/hooks/use-ocr-history';
 import { useKeyboardShortcuts } from '@/hooks/use-keyboard-shortcuts';
 import { useToast } from '@/hooks/use-toast';
+import { loadAppData } from '@/lib/storage';
+import { fetchProgressive } from '@/lib/progressive';
 import { OCRResult } from '@/types';
 
 function App() {
@@ -28,7 +29,6 @@ function App() {
   const [isUploading, setIsUploading] = useState(false);
   const [activeTab, setActiveTab] = useState('capture');
   
-  const { addToHistory } = useOCRHistory();
   const { toast } = useToast();
 
   useEffect(() => {
@@ -60,23 +60,21 @@ function App() {
     setIsCapturing(true);
     try {
       await updateConfig();
-      const endpoint = regionMode ? '/api/capture/region' : '/api/capture/screen';
+      const endpoint = regionMode ? '/api/capture/region/stream' : '/api/capture/screen/stream';
       const body = regionMode ? region : undefined;
       
-      const response = await fetch(`${import.meta.env.VITE_API_URL}${endpoint}`, {
+      // Tesseract's text is shown as soon as it arrives and replaced by the merged result
+      const data = await fetchProgressive(`${import.meta.env.VITE_API_URL}${endpoint}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: body ? JSON.stringify(body) : undefined
-      });
-      
-      const data = await response.json();
-      setResult(data);
+      }, setResult);
       
+      // The server saves the final result to its history
       if (data && data.text) {
-        addToHistory(data, regionMode ? 'region' : 'screen', undefined, regionMode ? region : undefined);
         toast({
           title: "OCR Complete",
-          description: `Extracted ${data.text.length} characters with ${(data.confidence * 100).toFixed(1)}% confidence`,
+          description: `Extracted ${data.text.length} characters with ${data.confidence.toFixed(1)}% confidence`,
         });
       }
     } catch (error) {
@@ -94,23 +92,20 @@ function App() {
     try {
       await updateConfig();
       
+      const { preprocessing } = loadAppData().settings;
       const formData = new FormData();
       formData.append('file', file);
+      formData.append('profile', 'auto');
+      formData.append('contrast', String(preprocessing.contrast));
+      formData.append('brightness', String(preprocessing.brightness));
+      formData.append('noise_reduction', String(preprocessing.noiseReduction));
       
-      const response = await fetch(`${import.meta.env.VITE_API_URL}/api/upload/image`, {
+      const data = await fetchProgressive(`${import.meta.env.VITE_API_URL}/api/upload/image/stream`, {
         method: 'POST',
         body: formData
-      });
-      
-      if (!response.ok) {
-        throw new Error(`Upload failed: ${response.statusText}`);
-      }
-      
-      const data = await response.json();
-      setResult(data);
+      }, setResult);
       
       if (data && data.text) {
-        addToHistory(data, 'upload', file.name);
         toast({
           title: "OCR Complete",
           description: `Extracted ${data.text.length} characters from ${file.name}`,
@@ -320,7 +315,7 @@ function App() {
                           <div className="text-sm text-gray-600 dark:text-gray-400">Processing Time</div>
                         </div>
                         <div className="text-center">
-                          <div className="text-2xl font-bold text-green-500">{(result.confidence * 100).toFixed(1)}%</div>
+                          <div className="text-2xl font-bold text-green-500">{result.confidence.toFixed(1)}%</div>
                           <div className="text-sm text-gray-600 dark:text-gray-400">Confidence</div>
                         </div>
                         <div className="text-center">
@@ -332,16 +327,24 @@ function App() {
                           <div className="text-sm text-gray-600 dark:text-gray-400">Text Regions</div>
                         </div>
                       </div>
-                      {result.primary_engine && (
+                      {(result.primary_engine || result.stage === 'partial') && (
                         <div className="mt-4 flex items-center space-x-2">
-                          <Badge variant="secondary" className="dark:bg-gray-700 dark:text-gray-300">
-                            Primary: {result.primary_engine}
-                          </Badge>
+                          {result.primary_engine && (
+                            <Badge variant="secondary" className="dark:bg-gray-700 dark:text-gray-300">
+                              Primary: {result.primary_engine}
+                            </Badge>
+                          )}
                           {result.combined && (
                             <Badge variant="outline" className="dark:border-gray-600 dark:text-gray-300">
                               Combined Results
                             </Badge>
                           )}
+                          {result.stage === 'partial' && (
+                            <Badge variant="outline" className="dark:border-gray-600 dark:text-gray-300">
+                              <Loader2 className="mr-1 h-3 w-3 animate-spin" />
+                              Refining
+                            </Badge>
+                          )}
                         </div>
                       )}
                     </CardContent>
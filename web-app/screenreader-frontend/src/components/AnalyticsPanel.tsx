@@ -29,7 +29,7 @@ export function AnalyticsPanel() {
     date: new Date(stat.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
     count: stat.count,
     avgTime: stat.avgTime,
-    avgConfidence: stat.avgConfidence * 100,
+    avgConfidence: stat.avgConfidence,
   }));
 
   return (
@@ -76,7 +76,7 @@ export function AnalyticsPanel() {
             <div className="flex items-center justify-between">
               <div>
                 <p className="text-sm font-medium text-gray-600 dark:text-gray-400">Avg Confidence</p>
-                <p className="text-2xl font-bold dark:text-white">{(analytics.averageConfidence * 100).toFixed(1)}%</p>
+                <p className="text-2xl font-bold dark:text-white">{analytics.averageConfidence.toFixed(1)}%</p>
               </div>
               <Target className="h-8 w-8 text-purple-500" />
             </div>
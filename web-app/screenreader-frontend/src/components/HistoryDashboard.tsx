@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { Search, Download, Trash2, Tag, Calendar, Clock, Eye } from 'lucide-react';
+import { Search, Download, Trash2, Calendar, Clock, Eye, ChevronLeft, ChevronRight } from 'lucide-react';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
@@ -7,25 +7,111 @@ import { Badge } from '@/components/ui/badge';
 import { Textarea } from '@/components/ui/textarea';
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 import { useOCRHistory } from '@/hooks/use-ocr-history';
-import { BoundingBox } from '@/types';
-
-export function HistoryDashboard() {
-  const { history, isLoading, clearAllHistory, deleteHistoryItem, searchHistory } = useOCRHistory();
-  const [searchQuery, setSearchQuery] = useState('');
+import { fetchHistoryItem } from '@/lib/history';
+import { BoundingBox, HistoryDetail, HistorySummary } from '@/types';
 
+const formatDate = (timestamp: number) => {
+  // The server stores Unix timestamps in seconds
+  return new Date(timestamp * 1000).toLocaleDateString('en-US', {
+    year: 'numeric',
+    month: 'short',
+    day: 'numeric',
+    hour: '2-digit',
+    minute: '2-digit',
+  });
+};
 
-  const filteredHistory = searchHistory(searchQuery);
+function HistoryItemDialog({ item }: { item: HistorySummary }) {
+  const [detail, setDetail] = useState<HistoryDetail | null>(null);
+  const [error, setError] = useState<string | null>(null);
 
-  const formatDate = (timestamp: number) => {
-    return new Date(timestamp).toLocaleDateString('en-US', {
-      year: 'numeric',
-      month: 'short',
-      day: 'numeric',
-      hour: '2-digit',
-      minute: '2-digit',
-    });
+  // List pages carry no bounding boxes; the full result is fetched when the dialog opens
+  const loadDetail = async (open: boolean) => {
+    if (!open || detail) return;
+    try {
+      setDetail(await fetchHistoryItem(item.id));
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load result');
+    }
   };
 
+  const boxes = detail?.result.bounding_boxes ?? [];
+
+  return (
+    <Dialog onOpenChange={loadDetail}>
+      <DialogTrigger asChild>
+        <Button
+          variant="outline"
+          size="sm"
+          className="dark:border-gray-600 dark:text-gray-300"
+        >
+          <Eye className="h-4 w-4" />
+        </Button>
+      </DialogTrigger>
+      <DialogContent className="max-w-2xl dark:bg-gray-800 dark:border-gray-700">
+        <DialogHeader>
+          <DialogTitle className="dark:text-white">OCR Result Details</DialogTitle>
+          <DialogDescription className="dark:text-gray-400">
+            {formatDate(item.timestamp)} • {item.source}
+          </DialogDescription>
+        </DialogHeader>
+        <div className="space-y-4">
+          <div>
+            <label className="text-sm font-medium dark:text-gray-300">Extracted Text</label>
+            <Textarea
+              value={item.text}
+              readOnly
+              className="mt-1 dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+              rows={6}
+            />
+          </div>
+          <div className="grid grid-cols-2 gap-4">
+            <div>
+              <label className="text-sm font-medium dark:text-gray-300">Confidence</label>
+              <div className="text-lg font-bold dark:text-white">
+                {item.confidence.toFixed(1)}%
+              </div>
+            </div>
+            <div>
+              <label className="text-sm font-medium dark:text-gray-300">Processing Time</label>
+              <div className="text-lg font-bold dark:text-white">
+                {item.processing_time.toFixed(2)}s
+              </div>
+            </div>
+          </div>
+          {error && <div className="text-sm text-red-500">{error}</div>}
+          {!detail && !error && (
+            <div className="text-sm text-gray-500 dark:text-gray-400">Loading text regions...</div>
+          )}
+          {boxes.length > 0 && (
+            <div>
+              <label className="text-sm font-medium dark:text-gray-300">
+                Text Regions ({boxes.length})
+              </label>
+              <div className="mt-2 max-h-32 overflow-y-auto space-y-1">
+                {boxes.map((box: BoundingBox, index: number) => (
+                  <div key={index} className="text-xs p-2 bg-gray-50 dark:bg-gray-700 rounded">
+                    <div className="font-medium dark:text-white">"{box.text}"</div>
+                    <div className="text-gray-500 dark:text-gray-400">
+                      Position: ({box.x}, {box.y}) • Size: {box.width}×{box.height} •
+                      Confidence: {box.confidence.toFixed(1)}%
+                    </div>
+                  </div>
+                ))}
+              </div>
+            </div>
+          )}
+        </div>
+      </DialogContent>
+    </Dialog>
+  );
+}
+
+export function HistoryDashboard() {
+  const {
+    items, total, page, pages, setPage, query, setQuery, isLoading, error, deleteHistoryItem,
+  } = useOCRHistory();
+
   const getSourceIcon = (source: string) => {
     switch (source) {
       case 'screen': return '🖥️';
@@ -36,24 +122,16 @@ export function HistoryDashboard() {
   };
 
   const exportHistory = () => {
-    const dataStr = JSON.stringify(history, null, 2);
+    const dataStr = JSON.stringify(items, null, 2);
     const dataBlob = new Blob([dataStr], { type: 'application/json' });
     const url = URL.createObjectURL(dataBlob);
     const link = document.createElement('a');
     link.href = url;
-    link.download = `ocr-history-${new Date().toISOString().split('T')[0]}.json`;
+    link.download = `ocr-history-${new Date().toISOString().split('T')[0]}-page-${page}.json`;
     link.click();
     URL.revokeObjectURL(url);
   };
 
-  if (isLoading) {
-    return (
-      <div className="flex items-center justify-center h-64">
-        <div className="text-gray-500 dark:text-gray-400">Loading history...</div>
-      </div>
-    );
-  }
-
   return (
     <div className="space-y-6">
       <Card className="dark:bg-gray-800 dark:border-gray-700">
@@ -63,7 +141,7 @@ export function HistoryDashboard() {
             <span>OCR History</span>
           </CardTitle>
           <CardDescription className="dark:text-gray-400">
-            View and manage your OCR processing history
+            Every OCR result processed by the server, newest first
           </CardDescription>
         </CardHeader>
         <CardContent className="space-y-4">
@@ -72,8 +150,8 @@ export function HistoryDashboard() {
               <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 h-4 w-4 text-gray-400" />
               <Input
                 placeholder="Search history..."
-                value={searchQuery}
-                onChange={(e) => setSearchQuery(e.target.value)}
+                value={query}
+                onChange={(e) => setQuery(e.target.value)}
                 className="pl-10 dark:bg-gray-700 dark:border-gray-600 dark:text-white"
               />
             </div>
@@ -81,38 +159,64 @@ export function HistoryDashboard() {
               onClick={exportHistory}
               variant="outline"
               size="sm"
+              disabled={items.length === 0}
               className="dark:border-gray-600 dark:text-gray-300"
             >
               <Download className="h-4 w-4 mr-2" />
-              Export
-            </Button>
-            <Button
-              onClick={clearAllHistory}
-              variant="destructive"
-              size="sm"
-            >
-              <Trash2 className="h-4 w-4 mr-2" />
-              Clear All
+              Export Page
             </Button>
           </div>
 
-          <div className="text-sm text-gray-600 dark:text-gray-400">
-            {filteredHistory.length} of {history.length} items
+          <div className="flex items-center justify-between text-sm text-gray-600 dark:text-gray-400">
+            <span>
+              {total} {query.trim() ? 'matching' : ''} items
+            </span>
+            <div className="flex items-center space-x-2">
+              <Button
+                variant="outline"
+                size="sm"
+                onClick={() => setPage(page - 1)}
+                disabled={isLoading || page <= 1}
+                className="dark:border-gray-600 dark:text-gray-300"
+              >
+                <ChevronLeft className="h-4 w-4" />
+              </Button>
+              <span>Page {pages === 0 ? 0 : page} of {pages}</span>
+              <Button
+                variant="outline"
+                size="sm"
+                onClick={() => setPage(page + 1)}
+                disabled={isLoading || page >= pages}
+                className="dark:border-gray-600 dark:text-gray-300"
+              >
+                <ChevronRight className="h-4 w-4" />
+              </Button>
+            </div>
           </div>
         </CardContent>
       </Card>
 
       <div className="space-y-4">
-        {filteredHistory.length === 0 ? (
+        {error ? (
+          <Card className="dark:bg-gray-800 dark:border-gray-700">
+            <CardContent className="pt-6">
+              <div className="text-center text-red-500">{error}</div>
+            </CardContent>
+          </Card>
+        ) : isLoading && items.length === 0 ? (
+          <div className="flex items-center justify-center h-64">
+            <div className="text-gray-500 dark:text-gray-400">Loading history...</div>
+          </div>
+        ) : items.length === 0 ? (
           <Card className="dark:bg-gray-800 dark:border-gray-700">
             <CardContent className="pt-6">
               <div className="text-center text-gray-500 dark:text-gray-400">
-                {history.length === 0 ? 'No OCR history yet' : 'No results found'}
+                {query.trim() ? 'No results found' : 'No OCR history yet'}
               </div>
             </CardContent>
           </Card>
         ) : (
-          filteredHistory.map((item) => (
+          items.map((item) => (
             <Card key={item.id} className="dark:bg-gray-800 dark:border-gray-700">
               <CardContent className="pt-6">
                 <div className="flex items-start justify-between">
@@ -137,7 +241,7 @@ export function HistoryDashboard() {
                       <div>
                         <span className="text-gray-500 dark:text-gray-400">Confidence:</span>
                         <span className="ml-2 font-medium dark:text-white">
-                          {(item.confidence * 100).toFixed(1)}%
+                          {item.confidence.toFixed(1)}%
                         </span>
                       </div>
                       <div>
@@ -149,7 +253,7 @@ export function HistoryDashboard() {
                       <div>
                         <span className="text-gray-500 dark:text-gray-400">Engine:</span>
                         <span className="ml-2 font-medium dark:text-white">
-                          {item.primary_engine || 'Unknown'}
+                          {item.engine}
                         </span>
                       </div>
                     </div>
@@ -160,137 +264,10 @@ export function HistoryDashboard() {
                         {item.text || 'No text extracted'}
                       </div>
                     </div>
-
-                    {item.tags.length > 0 && (
-                      <div className="flex items-center space-x-1">
-                        <Tag className="h-3 w-3 text-gray-400" />
-                        {item.tags.map((tag: string, index: number) => (
-                          <Badge key={index} variant="outline" className="text-xs dark:border-gray-600 dark:text-gray-300">
-                            {tag}
-                          </Badge>
-                        ))}
-                      </div>
-                    )}
                   </div>
 
                   <div className="flex items-center space-x-2">
-                    <Dialog>
-                      <DialogTrigger asChild>
-                        <Dialog>
-                          <DialogTrigger asChild>
-                            <Button
-                              variant="outline"
-                              size="sm"
-                              className="dark:border-gray-600 dark:text-gray-300"
-                            >
-                              <Eye className="h-4 w-4" />
-                            </Button>
-                          </DialogTrigger>
-                          <DialogContent className="max-w-2xl dark:bg-gray-800 dark:border-gray-700">
-                            <DialogHeader>
-                              <DialogTitle className="dark:text-white">OCR Result Details</DialogTitle>
-                              <DialogDescription className="dark:text-gray-400">
-                                {formatDate(item.timestamp)} • {item.source}
-                              </DialogDescription>
-                            </DialogHeader>
-                            <div className="space-y-4">
-                              <div>
-                                <label className="text-sm font-medium dark:text-gray-300">Extracted Text</label>
-                                <Textarea
-                                  value={item.text}
-                                  readOnly
-                                  className="mt-1 dark:bg-gray-700 dark:border-gray-600 dark:text-white"
-                                  rows={6}
-                                />
-                              </div>
-                              <div className="grid grid-cols-2 gap-4">
-                                <div>
-                                  <label className="text-sm font-medium dark:text-gray-300">Confidence</label>
-                                  <div className="text-lg font-bold dark:text-white">
-                                    {(item.confidence * 100).toFixed(1)}%
-                                  </div>
-                                </div>
-                                <div>
-                                  <label className="text-sm font-medium dark:text-gray-300">Processing Time</label>
-                                  <div className="text-lg font-bold dark:text-white">
-                                    {item.processing_time.toFixed(2)}s
-                                  </div>
-                                </div>
-                              </div>
-                              {item.bounding_boxes.length > 0 && (
-                                <div>
-                                  <label className="text-sm font-medium dark:text-gray-300">
-                                    Text Regions ({item.bounding_boxes.length})
-                                  </label>
-                                  <div className="mt-2 max-h-32 overflow-y-auto space-y-1">
-                                    {item.bounding_boxes.map((box: BoundingBox, index: number) => (
-                                      <div key={index} className="text-xs p-2 bg-gray-50 dark:bg-gray-700 rounded">
-                                        <div className="font-medium dark:text-white">"{box.text}"</div>
-                                        <div className="text-gray-500 dark:text-gray-400">
-                                          Position: ({box.x}, {box.y}) • Size: {box.width}×{box.height} • 
-                                          Confidence: {box.confidence.toFixed(1)}%
-                                        </div>
-                                      </div>
-                                    ))}
-                                  </div>
-                                </div>
-                              )}
-                            </div>
-                          </DialogContent>
-                        </Dialog>
-                      </DialogTrigger>
-                      <DialogContent className="max-w-2xl dark:bg-gray-800 dark:border-gray-700">
-                        <DialogHeader>
-                          <DialogTitle className="dark:text-white">OCR Result Details</DialogTitle>
-                          <DialogDescription className="dark:text-gray-400">
-                            {formatDate(item.timestamp)} • {item.source}
-                          </DialogDescription>
-                        </DialogHeader>
-                        <div className="space-y-4">
-                          <div>
-                            <label className="text-sm font-medium dark:text-gray-300">Extracted Text</label>
-                            <Textarea
-                              value={item.text}
-                              readOnly
-                              className="mt-1 dark:bg-gray-700 dark:border-gray-600 dark:text-white"
-                              rows={6}
-                            />
-                          </div>
-                          <div className="grid grid-cols-2 gap-4">
-                            <div>
-                              <label className="text-sm font-medium dark:text-gray-300">Confidence</label>
-                              <div className="text-lg font-bold dark:text-white">
-                                {(item.confidence * 100).toFixed(1)}%
-                              </div>
-                            </div>
-                            <div>
-                              <label className="text-sm font-medium dark:text-gray-300">Processing Time</label>
-                              <div className="text-lg font-bold dark:text-white">
-                                {item.processing_time.toFixed(2)}s
-                              </div>
-                            </div>
-                          </div>
-                          {item.bounding_boxes.length > 0 && (
-                            <div>
-                              <label className="text-sm font-medium dark:text-gray-300">
-                                Text Regions ({item.bounding_boxes.length})
-                              </label>
-                              <div className="mt-2 max-h-32 overflow-y-auto space-y-1">
-                                {item.bounding_boxes.map((box: BoundingBox, index: number) => (
-                                  <div key={index} className="text-xs p-2 bg-gray-50 dark:bg-gray-700 rounded">
-                                    <div className="font-medium dark:text-white">"{box.text}"</div>
-                                    <div className="text-gray-500 dark:text-gray-400">
-                                      Position: ({box.x}, {box.y}) • Size: {box.width}×{box.height} • 
-                                      Confidence: {box.confidence.toFixed(1)}%
-                                    </div>
-                                  </div>
-                                ))}
-                              </div>
-                            </div>
-                          )}
-                        </div>
-                      </DialogContent>
-                    </Dialog>
+                    <HistoryItemDialog item={item} />
                     <Button
                       variant="destructive"
                       size="sm"
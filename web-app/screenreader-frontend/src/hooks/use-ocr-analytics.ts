@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { OCRAnalytics } from '@/types';
-import { loadAppData } from '@/lib/storage';
+import { fetchAnalytics } from '@/lib/history';
 
 export function useOCRAnalytics() {
   const [analytics, setAnalytics] = useState<OCRAnalytics>({
@@ -12,17 +12,20 @@ export function useOCRAnalytics() {
   });
   const [isLoading, setIsLoading] = useState(true);
 
+  const refreshAnalytics = async () => {
+    try {
+      setAnalytics(await fetchAnalytics(30));
+    } catch (error) {
+      console.error('Failed to load analytics:', error);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   useEffect(() => {
-    const data = loadAppData();
-    setAnalytics(data.analytics);
-    setIsLoading(false);
+    refreshAnalytics();
   }, []);
 
-  const refreshAnalytics = () => {
-    const data = loadAppData();
-    setAnalytics(data.analytics);
-  };
-
   const getWeeklyStats = () => {
     const weeklyData = analytics.dailyStats.slice(0, 7);
     return weeklyData.reduce((acc, day) => ({
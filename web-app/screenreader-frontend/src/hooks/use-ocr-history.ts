@@ -1,71 +1,82 @@
-import { useState, useEffect } from 'react';
-import { OCRHistoryItem, OCRResult } from '@/types';
-import { loadAppData, addHistoryItem, clearHistory } from '@/lib/storage';
+import { useState, useEffect, useCallback } from 'react';
+import { HistorySummary } from '@/types';
+import { fetchHistory, deleteHistoryItem as deleteStoredItem } from '@/lib/history';
 
+const PAGE_SIZE = 20;
+
+/**
+ * Server-side OCR history: the backend records every result, and this hook
+ * pages through it or through full-text search results for `query`.
+ */
 export function useOCRHistory() {
-  const [history, setHistory] = useState<OCRHistoryItem[]>([]);
+  const [items, setItems] = useState<HistorySummary[]>([]);
+  const [total, setTotal] = useState(0);
+  const [page, setPage] = useState(1);
+  const [pages, setPages] = useState(0);
+  const [query, setQueryState] = useState('');
   const [isLoading, setIsLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
 
-  useEffect(() => {
-    const data = loadAppData();
-    setHistory(data.history);
-    setIsLoading(false);
-  }, []);
+  const load = useCallback(async (signal?: { cancelled: boolean }) => {
+    setIsLoading(true);
+    try {
+      const data = await fetchHistory(page, PAGE_SIZE, query);
+      if (signal?.cancelled) return;
+      setItems(data.items);
+      setTotal(data.total);
+      setPages(data.pages);
+      setError(null);
+    } catch (err) {
+      if (signal?.cancelled) return;
+      console.error('Failed to load history:', err);
+      setError(err instanceof Error ? err.message : 'Failed to load history');
+    } finally {
+      if (!signal?.cancelled) setIsLoading(false);
+    }
+  }, [page, query]);
 
-  const addToHistory = (result: OCRResult, source: 'screen' | 'region' | 'upload', filename?: string, region?: { x: number; y: number; width: number; height: number }) => {
-    const historyItem: OCRHistoryItem = {
-      ...result,
-      id: `${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
-      timestamp: Date.now(),
-      source,
-      filename,
-      region,
-      tags: [],
-      notes: '',
+  useEffect(() => {
+    // Typing in the search box fires a request only once the user pauses
+    const signal = { cancelled: false };
+    const timer = setTimeout(() => load(signal), query ? 300 : 0);
+    return () => {
+      signal.cancelled = true;
+      clearTimeout(timer);
     };
+  }, [load, query]);
 
-    addHistoryItem(historyItem);
-    setHistory(prev => [historyItem, ...prev.slice(0, 99)]);
-  };
-
-  const clearAllHistory = () => {
-    clearHistory();
-    setHistory([]);
+  const setQuery = (value: string) => {
+    setQueryState(value);
+    setPage(1);
   };
 
-  const updateHistoryItem = (id: string, updates: Partial<OCRHistoryItem>) => {
-    const data = loadAppData();
-    const index = data.history.findIndex(item => item.id === id);
-    if (index !== -1) {
-      data.history[index] = { ...data.history[index], ...updates };
-      setHistory([...data.history]);
+  const deleteHistoryItem = async (id: number) => {
+    try {
+      await deleteStoredItem(id);
+      // Reload so the page is filled up from the next one
+      if (items.length === 1 && page > 1) {
+        setPage(page - 1);
+      } else {
+        await load();
+      }
+    } catch (err) {
+      console.error('Failed to delete history item:', err);
+      setError(err instanceof Error ? err.message : 'Failed to delete history item');
     }
   };
 
-  const deleteHistoryItem = (id: string) => {
-    const data = loadAppData();
-    data.history = data.history.filter(item => item.id !== id);
-    setHistory(data.history);
-  };
-
-  const searchHistory = (query: string) => {
-    if (!query.trim()) return history;
-    
-    const lowercaseQuery = query.toLowerCase();
-    return history.filter(item => 
-      item.text.toLowerCase().includes(lowercaseQuery) ||
-      item.tags.some(tag => tag.toLowerCase().includes(lowercaseQuery)) ||
-      (item.notes && item.notes.toLowerCase().includes(lowercaseQuery))
-    );
-  };
-
   return {
-    history,
+    items,
+    total,
+    page,
+    pages,
+    pageSize: PAGE_SIZE,
+    setPage,
+    query,
+    setQuery,
     isLoading,
-    addToHistory,
-    clearAllHistory,
-    updateHistoryItem,
+    error,
+    refresh: () => load(),
     deleteHistoryItem,
-    searchHistory,
   };
 }
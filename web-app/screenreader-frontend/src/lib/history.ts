@@ -0,0 +1,59 @@
+import { HistoryDetail, HistoryPage, OCRAnalytics } from '@/types';
+
+const API_URL = import.meta.env.VITE_API_URL;
+
+async function request<T>(path: string, init?: RequestInit): Promise<T> {
+  const response = await fetch(`${API_URL}${path}`, init);
+  if (!response.ok) {
+    throw new Error(`Request failed: ${response.statusText}`);
+  }
+  return response.json() as Promise<T>;
+}
+
+/**
+ * Fetch one page of the server-side history, newest first, or of the
+ * full-text search results when `query` is given. Items are summaries
+ * without bounding boxes.
+ */
+export function fetchHistory(page: number, pageSize: number, query = ''): Promise<HistoryPage> {
+  const params = new URLSearchParams({ page: String(page), page_size: String(pageSize) });
+  if (query.trim()) {
+    params.set('q', query.trim());
+    return request<HistoryPage>(`/api/history/search?${params}`);
+  }
+  return request<HistoryPage>(`/api/history?${params}`);
+}
+
+/** Fetch a stored result with its full OCR output. */
+export function fetchHistoryItem(id: number): Promise<HistoryDetail> {
+  return request<HistoryDetail>(`/api/history/${id}`, { headers: { Accept: 'application/json' } });
+}
+
+export async function deleteHistoryItem(id: number): Promise<void> {
+  await request(`/api/history/${id}`, { method: 'DELETE' });
+}
+
+interface AnalyticsResponse {
+  total_processed: number;
+  average_processing_time: number;
+  average_confidence: number;
+  engine_usage: { tesseract: number; easyocr: number; combined: number };
+  daily_stats: { date: string; count: number; avg_time: number; avg_confidence: number }[];
+}
+
+/** Fetch the aggregated statistics for the most recent `days` days. */
+export async function fetchAnalytics(days = 30): Promise<OCRAnalytics> {
+  const data = await request<AnalyticsResponse>(`/api/analytics?days=${days}`);
+  return {
+    totalProcessed: data.total_processed,
+    averageProcessingTime: data.average_processing_time,
+    averageConfidence: data.average_confidence,
+    engineUsage: data.engine_usage,
+    dailyStats: data.daily_stats.map(day => ({
+      date: day.date,
+      count: day.count,
+      avgTime: day.avg_time,
+      avgConfidence: day.avg_confidence,
+    })),
+  };
+}
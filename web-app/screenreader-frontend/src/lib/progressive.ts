@@ -0,0 +1,49 @@
+import { OCRResult } from '@/types';
+
+export interface ProgressiveResult extends OCRResult {
+  stage: 'partial' | 'final';
+  final: boolean;
+}
+
+/**
+ * POST to one of the `/stream` OCR endpoints and call `onResult` for every
+ * server-sent event: Tesseract's result first, then the merged result.
+ * Resolves with the final result.
+ */
+export async function fetchProgressive(
+  url: string,
+  init: RequestInit,
+  onResult: (result: ProgressiveResult) => void
+): Promise<ProgressiveResult | null> {
+  const response = await fetch(url, init);
+  if (!response.ok || !response.body) {
+    throw new Error(`Request failed: ${response.statusText}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let last: ProgressiveResult | null = null;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      const event = message.match(/^event: (.*)$/m)?.[1];
+      const data = message.match(/^data: (.*)$/m)?.[1];
+      if (!data) continue;
+      if (event === 'error') {
+        throw new Error(JSON.parse(data).detail);
+      }
+      last = JSON.parse(data) as ProgressiveResult;
+      onResult(last);
+    }
+  }
+  return last;
+}
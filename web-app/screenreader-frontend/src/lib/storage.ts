@@ -1,4 +1,4 @@
-import { AppStorage, OCRHistoryItem, OCRAnalytics, AppSettings } from '@/types';
+import { AppStorage, OCRAnalytics, AppSettings } from '@/types';
 
 const STORAGE_KEY = 'screenreader-cv-data';
 const STORAGE_VERSION = '1.0.0';
@@ -66,68 +66,12 @@ export function saveAppData(data: AppStorage): void {
   }
 }
 
-export function addHistoryItem(item: OCRHistoryItem): void {
-  const data = loadAppData();
-  data.history.unshift(item);
-  
-  if (data.history.length > data.settings.maxHistoryItems) {
-    data.history = data.history.slice(0, data.settings.maxHistoryItems);
-  }
-  
-  updateAnalytics(data, item);
-  saveAppData(data);
-}
-
-export function updateAnalytics(data: AppStorage, item: OCRHistoryItem): void {
-  const analytics = data.analytics;
-  
-  analytics.totalProcessed += 1;
-  analytics.averageProcessingTime = 
-    (analytics.averageProcessingTime * (analytics.totalProcessed - 1) + item.processing_time) / analytics.totalProcessed;
-  analytics.averageConfidence = 
-    (analytics.averageConfidence * (analytics.totalProcessed - 1) + item.confidence) / analytics.totalProcessed;
-
-  if (item.primary_engine === 'tesseract') {
-    analytics.engineUsage.tesseract += 1;
-  } else if (item.primary_engine === 'easyocr') {
-    analytics.engineUsage.easyocr += 1;
-  } else {
-    analytics.engineUsage.combined += 1;
-  }
-
-  const today = new Date().toISOString().split('T')[0];
-  const todayStats = analytics.dailyStats.find(stat => stat.date === today);
-  
-  if (todayStats) {
-    todayStats.count += 1;
-    todayStats.avgTime = (todayStats.avgTime * (todayStats.count - 1) + item.processing_time) / todayStats.count;
-    todayStats.avgConfidence = (todayStats.avgConfidence * (todayStats.count - 1) + item.confidence) / todayStats.count;
-  } else {
-    analytics.dailyStats.push({
-      date: today,
-      count: 1,
-      avgTime: item.processing_time,
-      avgConfidence: item.confidence,
-    });
-  }
-
-  analytics.dailyStats = analytics.dailyStats
-    .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
-    .slice(0, 30);
-}
-
 export function updateSettings(newSettings: Partial<AppSettings>): void {
   const data = loadAppData();
   data.settings = { ...data.settings, ...newSettings };
   saveAppData(data);
 }
 
-export function clearHistory(): void {
-  const data = loadAppData();
-  data.history = [];
-  saveAppData(data);
-}
-
 export function exportData(): string {
   const data = loadAppData();
   return JSON.stringify(data, null, 2);
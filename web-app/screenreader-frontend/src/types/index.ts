@@ -15,6 +15,7 @@ export interface OCRResult {
   engine?: string;
   primary_engine?: string;
   combined?: boolean;
+  stage?: 'partial' | 'final';
 }
 
 export interface OCRHistoryItem extends OCRResult {
@@ -54,3 +55,29 @@ export interface AppStorage {
   settings: AppSettings;
   version: string;
 }
+
+/** Summary of a result stored on the server, as returned by /api/history. */
+export interface HistorySummary {
+  id: number;
+  timestamp: number;
+  source: string;
+  filename?: string | null;
+  text: string;
+  confidence: number;
+  processing_time: number;
+  engine: 'tesseract' | 'easyocr' | 'combined';
+  region?: { x: number; y: number; width: number; height: number } | null;
+}
+
+export interface HistoryPage {
+  items: HistorySummary[];
+  total: number;
+  page: number;
+  page_size: number;
+  pages: number;
+}
+
+/** A stored result with its full OCR output, as returned by /api/history/{id}. */
+export interface HistoryDetail extends HistorySummary {
+  result: OCRResult;
+}